@@ -0,0 +1 @@
+from Cython.Distutils.build_ext import build_ext
@@ -0,0 +1,8 @@
+# for backwards compatibility
+
+
+from .. import __version__ as version
+
+# For 'generated by' header line in C files.
+
+watermark = str(version)
@@ -0,0 +1,4 @@
+cdef extern from "<sys/ioctl.h>" nogil:
+    enum: FIONBIO
+
+    int ioctl(int fd, int request, ...)
@@ -0,0 +1,2 @@
+@cname('__pyx_format_from_typeinfo')
+cdef bytes format_from_typeinfo(const __Pyx_TypeInfo *type)
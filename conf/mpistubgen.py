@@ -439,6 +439,25 @@ OVERRIDE = {
         ) -> None: ...
         """,
     },
+    'BufferPool': {
+        '__new__': None,
+        '__init__': """
+        def __init__(self,
+            capacity: int | None = None,
+            threshold: int | None = None,
+        ) -> None: ...
+        """,
+    },
+    'RequestSet': {
+        '__new__': None,
+        '__init__': """
+        def __init__(self,
+            requests: Iterable[Request] | None = None,
+        ) -> None: ...
+        """,
+        '__getitem__':
+        "def __getitem__(self, item: int) -> Request: ...",
+    },
     '__pyx_capi__': "__pyx_capi__: Final[dict[str, Any]] = ...",
     '_typedict': "_typedict: Final[dict[str, Datatype]] = ...",
     '_typedict_c': "_typedict_c: Final[dict[str, Datatype]] = ...",
@@ -275,6 +275,40 @@ class ProcessPoolInitTest(ProcessPoolMixin,
             if save is not None:
                 os.environ['MPI4PY_FUTURES_USE_PKL5'] = save
 
+    @unittest.skipIf(SHARED_POOL, 'shared-pool')
+    def test_dispatch_kwarg(self):
+        for dispatch in ('poll', 'event'):
+            executor = self.executor_type(dispatch=dispatch)
+            fs = [executor.submit(abs, -i) for i in range(16)]
+            self.assertEqual([f.result() for f in fs], list(range(16)))
+            executor.shutdown()
+        with self.assertRaises(ValueError):
+            self.executor_type(dispatch='foobar')
+
+    @unittest.skipIf(SHARED_POOL, 'shared-pool')
+    def test_dispatch_environ(self):
+        save = os.environ.get('MPI4PY_FUTURES_DISPATCH')
+        try:
+            for value in ('poll', 'event', 'EVENT'):
+                os.environ['MPI4PY_FUTURES_DISPATCH'] = value
+                executor = self.executor_type()
+                executor.submit(time.sleep, 0).result()
+                executor.shutdown()
+            with warnings.catch_warnings(record=True) as wlist:
+                warnings.simplefilter('always')
+                os.environ['MPI4PY_FUTURES_DISPATCH'] = 'foobar'
+                executor = self.executor_type()
+                executor.submit(time.sleep, 0).result()
+                executor.shutdown()
+            self.assertTrue(wlist)
+            msg = wlist[0].message
+            self.assertIsInstance(msg, RuntimeWarning)
+            self.assertIn('foobar', msg.args[0])
+        finally:
+            del os.environ['MPI4PY_FUTURES_DISPATCH']
+            if save is not None:
+                os.environ['MPI4PY_FUTURES_DISPATCH'] = save
+
     @unittest.skipIf(SHARED_POOL, 'shared-pool')
     def test_initializer(self):
         executor = self.executor_type(
@@ -846,6 +880,368 @@ class ProcessPoolExecutorTest(ProcessPoolMixin,
         with self.assertRaises(ValueError):
             set(map_unordered(pow, range(40), range(40), chunksize=-1))
 
+    def test_map_max_pending(self):
+        ref = list(map(pow, range(40), range(40)))
+        submitted = []
+
+        def generator():
+            for i in range(40):
+                submitted.append(i)
+                yield i
+        iterator = self.executor.map(
+            pow, generator(), range(40), max_pending=4)
+        self.assertEqual(len(submitted), 4)
+        self.assertEqual(next(iterator), ref[0])
+        self.assertLessEqual(len(submitted), 5)
+        self.assertEqual(list(iterator), ref[1:])
+        self.assertEqual(
+            list(self.executor.map(
+                pow, range(40), range(40), chunksize=6, max_pending=2)),
+            ref)
+        self.assertEqual(
+            list(self.executor.map(
+                pow, range(40), range(40), max_pending=100)),
+            ref)
+        with self.assertRaises(ValueError):
+            list(self.executor.map(pow, range(40), range(40), max_pending=0))
+
+    def test_map_unordered_max_pending(self):
+        map_unordered = functools.partial(self.executor.map, unordered=True)
+        ref = set(map(pow, range(40), range(40)))
+        self.assertEqual(
+            set(map_unordered(pow, range(40), range(40), max_pending=4)),
+            ref)
+        self.assertEqual(
+            set(map_unordered(
+                pow, range(40), range(40), chunksize=6, max_pending=2)),
+            ref)
+
+    def test_map_max_pending_timeout(self):
+        for unordered in (False, True):
+            with self.assertRaises(futures.TimeoutError):
+                for _ in self.executor.map(
+                    time.sleep, [0, 0, 1], timeout=0.25,
+                    unordered=unordered, max_pending=2,
+                ):
+                    pass
+
+    def test_map_auto_chunksize(self):
+        ref = list(map(pow, range(100), range(100)))
+        self.assertEqual(
+            list(self.executor.map(
+                pow, range(100), range(100), chunksize='auto')),
+            ref)
+        self.assertEqual(
+            list(self.executor.map(
+                pow, iter(range(100)), range(100), chunksize='auto')),
+            ref)
+        self.assertEqual(
+            list(self.executor.map(
+                pow, range(100), range(100), chunksize='auto',
+                max_pending=1)),
+            ref)
+        self.assertEqual(
+            set(self.executor.map(
+                pow, range(100), range(100), chunksize='auto',
+                unordered=True)),
+            set(ref))
+        self.assertEqual(
+            list(self.executor.starmap(
+                pow, zip(range(100), range(100)), chunksize='auto')),
+            ref)
+        self.assertEqual(
+            list(self.executor.map(pow, [], chunksize='auto')),
+            [])
+        i = self.executor.map(divmod, [1, 1, 1, 1], [2, 3, 0, 5],
+                              chunksize='auto')
+        self.assertEqual(next(i), (0, 1))
+        self.assertEqual(next(i), (0, 1))
+        with self.assertRaises(ZeroDivisionError):
+            next(i)
+
+    def test_map_max_pending_exception(self):
+        i = self.executor.map(divmod, [1, 1, 1, 1], [2, 3, 0, 5],
+                              max_pending=2)
+        self.assertEqual(next(i), (0, 1))
+        self.assertEqual(next(i), (0, 1))
+        with self.assertRaises(ZeroDivisionError):
+            next(i)
+
+
+class ProcessPoolEventDispatchTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        dispatch='event',
+    )
+
+
+class ProcessPoolBatchTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        batch_size=4,
+        batch_linger=0.01,
+    )
+
+    def test_batch_submit(self):
+        fs = [self.executor.submit(abs, -i) for i in range(100)]
+        self.assertEqual([f.result() for f in fs], list(range(100)))
+
+    def test_batch_pickle(self):
+        for task in ((inout, BadPickle()), (BadPickle,)):
+            fs = [self.executor.submit(abs, -i) for i in range(3)]
+            fs.append(self.executor.submit(*task))
+            fs.extend(self.executor.submit(abs, -i) for i in range(4, 8))
+            with self.assertRaises(ZeroDivisionError):
+                fs[3].result()
+            del fs[3]
+            self.assertEqual(
+                [f.result() for f in fs],
+                [0, 1, 2, 4, 5, 6, 7],
+            )
+
+    def test_batch_bad(self):
+        for kwargs in ({'batch_size': 0}, {'batch_linger': -1}):
+            with self.assertRaises(ValueError):
+                futures.MPIPoolExecutor(**kwargs)
+
+
+class ProcessPoolPrefetchTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        prefetch=2,
+    )
+
+    def test_prefetch_submit(self):
+        fs = [self.executor.submit(abs, -i) for i in range(100)]
+        self.assertEqual([f.result() for f in fs], list(range(100)))
+
+    def test_prefetch_event(self):
+        executor = self.executor_type(dispatch='event', batch_size=2)
+        try:
+            fs = [executor.submit(abs, -i) for i in range(100)]
+            self.assertEqual([f.result() for f in fs], list(range(100)))
+        finally:
+            executor.shutdown()
+
+    def test_prefetch_cache(self):
+        executor = self.executor_type(cache_size=1)
+        try:
+            funcs = [functools.partial(pow, i) for i in range(3)]
+            fs = [executor.submit(funcs[i % 3], i) for i in range(30)]
+            self.assertEqual(
+                [f.result() for f in fs],
+                [funcs[i % 3](i) for i in range(30)],
+            )
+        finally:
+            executor.shutdown()
+
+    def test_prefetch_bad(self):
+        with self.assertRaises(ValueError):
+            futures.MPIPoolExecutor(prefetch=-1)
+
+
+class ProcessPoolCacheTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        cache_size=2,
+    )
+
+    def test_cache_submit(self):
+        funcs = [abs, functools.partial(pow, 2), functools.partial(pow, 3)]
+        fs = [self.executor.submit(funcs[i % 3], i) for i in range(30)]
+        self.assertEqual(
+            [f.result() for f in fs],
+            [funcs[i % 3](i) for i in range(30)],
+        )
+        funcs = [functools.partial(divmod, i) for i in range(10)]
+        fs = [self.executor.submit(func, 3) for func in funcs * 2]
+        self.assertEqual(
+            [f.result() for f in fs],
+            [func(3) for func in funcs * 2],
+        )
+
+    def test_cache_batch(self):
+        executor = self.executor_type(batch_size=8)
+        try:
+            funcs = [functools.partial(pow, i) for i in range(5)]
+            fs = [executor.submit(funcs[i % 5], i) for i in range(50)]
+            self.assertEqual(
+                [f.result() for f in fs],
+                [funcs[i % 5](i) for i in range(50)],
+            )
+        finally:
+            executor.shutdown()
+
+    def test_cache_pickle(self):
+        future = self.executor.submit(BadPickle)
+        with self.assertRaises(ZeroDivisionError):
+            future.result()
+        future = self.executor.submit(inout, BadPickle())
+        with self.assertRaises(ZeroDivisionError):
+            future.result()
+        future = self.executor.submit(functools.partial(inout, BadPickle()))
+        with self.assertRaises(ZeroDivisionError):
+            future.result()
+        func = functools.partial(pow, 2)
+        fs = [self.executor.submit(func, i) for i in range(4)]
+        self.assertEqual([f.result() for f in fs], [1, 2, 4, 8])
+
+    def test_cache_mutate(self):
+        data = [1]
+        func = functools.partial(sum, data)
+        self.assertEqual(self.executor.submit(func).result(), 1)
+        data.append(2)
+        self.assertEqual(self.executor.submit(func).result(), 3)
+        data.append(3)
+        fs = [self.executor.submit(func) for _ in range(4)]
+        self.assertEqual([f.result() for f in fs], [6] * 4)
+
+    def test_cache_bad(self):
+        with self.assertRaises(ValueError):
+            futures.MPIPoolExecutor(cache_size=-1)
+
+
+class ProcessPoolSchedulerTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        scheduler='locality',
+    )
+
+    def test_scheduler_affinity(self):
+        fs = [self.executor.submit(abs, -i, affinity=i % 3)
+              for i in range(100)]
+        self.assertEqual([f.result() for f in fs], list(range(100)))
+
+    def test_scheduler_prefetch(self):
+        executor = self.executor_type(prefetch=1, batch_size=2)
+        try:
+            fs = [executor.submit(abs, -i, affinity=str(i % 5))
+                  for i in range(100)]
+            self.assertEqual([f.result() for f in fs], list(range(100)))
+        finally:
+            executor.shutdown()
+
+    def test_scheduler_workers(self):
+        workers = futures._lib.LocalityWorkerSet(range(4))
+        workers.locate(['a', 'b', 'a', 'b'])
+        self.assertEqual(len(workers), 4)
+        self.assertEqual(sorted(workers), [0, 1, 2, 3])
+        self.assertEqual(workers.pop('x'), 0)
+        self.assertEqual(workers.pop('x'), 2)
+        self.assertEqual(workers.pop('x'), 1)
+        workers.add(0)
+        self.assertEqual(workers.pop('x'), 0)
+        self.assertEqual(workers.pop('y'), 3)
+        self.assertEqual(len(workers), 0)
+        with self.assertRaises(LookupError):
+            workers.pop()
+
+    def test_scheduler_bad(self):
+        with self.assertRaises(ValueError):
+            futures.MPIPoolExecutor(scheduler='lifo')
+
+
+class ProcessPoolGroupTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        group_size=2,
+    )
+
+    def test_group_submit(self):
+        fs = [self.executor.submit(abs, -i) for i in range(100)]
+        self.assertEqual([f.result() for f in fs], list(range(100)))
+
+    def test_group_batch(self):
+        executor = self.executor_type(batch_size=3, prefetch=1, cache_size=1)
+        try:
+            funcs = [functools.partial(pow, i) for i in range(3)]
+            fs = [executor.submit(funcs[i % 3], i) for i in range(30)]
+            self.assertEqual(
+                [f.result() for f in fs],
+                [funcs[i % 3](i) for i in range(30)],
+            )
+        finally:
+            executor.shutdown()
+
+    def test_group_node(self):
+        executor = self.executor_type(group_size='node')
+        try:
+            result = executor.map(abs, range(-50, 0), chunksize=3)
+            self.assertEqual(list(result), list(range(50, 0, -1)))
+        finally:
+            executor.shutdown()
+
+    def test_group_bad(self):
+        with self.assertRaises(ValueError):
+            futures.MPIPoolExecutor(group_size=0)
+
+
+class ProcessPoolGroupEventDispatchTest(ProcessPoolGroupTest):
+    executor_type = functools.partial(
+        ProcessPoolGroupTest.executor_type,
+        dispatch='event',
+    )
+
+
+class ProcessPoolStatsTest(ProcessPoolExecutorTest):
+    executor_type = functools.partial(
+        ProcessPoolMixin.executor_type,
+        stats=True,
+    )
+
+    def test_stats_submit(self):
+        self.executor.stats(reset=True)
+        fs = [self.executor.submit(abs, -i) for i in range(100)]
+        self.assertEqual([f.result() for f in fs], list(range(100)))
+        stats = self.executor.stats()
+        self.assertEqual(stats['tasks'], 100)
+        self.assertGreater(stats['throughput'], 0)
+        self.assertEqual(stats['queue']['count'], 100)
+        self.assertEqual(stats['send']['count'], 100)
+        self.assertEqual(stats['recv']['count'], 100)
+        self.assertIn(stats['exec']['count'], (0, 100))
+        self.assertEqual(sum(stats['queue']['histogram']), 100)
+        for key in ('queue', 'send', 'recv', 'load', 'exec', 'dump'):
+            metric = stats[key]
+            self.assertGreaterEqual(metric['total'], 0)
+            self.assertGreaterEqual(metric['max'], metric['mean'])
+        workers = stats['workers']
+        self.assertEqual(sum(w['tasks'] for w in workers.values()), 100)
+        for worker in workers.values():
+            self.assertLessEqual(worker['utilization'], 1)
+        stats = self.executor.stats()
+        self.assertEqual(stats['tasks'], 100)
+
+    def test_stats_reset(self):
+        list(self.executor.map(abs, range(10)))
+        stats = self.executor.stats(reset=True)
+        self.assertGreaterEqual(stats['tasks'], 10)
+        stats = self.executor.stats()
+        self.assertEqual(stats['tasks'], 0)
+        self.assertEqual(stats['workers'], {})
+
+    def test_stats_batch(self):
+        executor = self.executor_type(batch_size=4, prefetch=1)
+        try:
+            result = executor.map(abs, range(-40, 0))
+            self.assertEqual(list(result), list(range(40, 0, -1)))
+            stats = executor.stats()
+            self.assertEqual(stats['tasks'], 40)
+            self.assertEqual(stats['queue']['count'], 40)
+            self.assertLessEqual(stats['send']['count'], 40)
+            self.assertEqual(stats['send']['count'], stats['recv']['count'])
+        finally:
+            executor.shutdown()
+
+    def test_stats_disabled(self):
+        executor = ProcessPoolMixin.executor_type()
+        try:
+            self.assertIsNone(executor.stats())
+            executor.submit(abs, 0).result()
+            self.assertIsNone(executor.stats())
+        finally:
+            executor.shutdown()
+
 
 class ProcessPoolSubmitTest(unittest.TestCase):
 
@@ -1517,6 +1913,8 @@ if SHARED_POOL:
     del ProcessPoolInitTest.test_init_globals
     del ProcessPoolInitTest.test_use_pkl5_kwarg
     del ProcessPoolInitTest.test_use_pkl5_environ
+    del ProcessPoolInitTest.test_dispatch_kwarg
+    del ProcessPoolInitTest.test_dispatch_environ
     del ProcessPoolInitTest.test_initializer
     del ProcessPoolInitTest.test_initializer_bad
     del ProcessPoolInitTest.test_initializer_error
@@ -1536,6 +1934,10 @@ elif WORLD_SIZE > 1 or SKIP_POOL_TEST:
     del ProcessPoolWaitTest
     del ProcessPoolAsCompletedTest
     del ProcessPoolExecutorTest
+    del ProcessPoolEventDispatchTest
+    del ProcessPoolBatchTest
+    del ProcessPoolPrefetchTest
+    del ProcessPoolCacheTest
     del ProcessPoolSubmitTest
     del ProcessPoolPickleTest
 if not SHARED_POOL:
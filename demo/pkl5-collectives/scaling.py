@@ -0,0 +1,96 @@
+# Scaling of pickle-based collectives with large buffers.
+#
+# Compare the lowercase collectives of MPI.Comm (pickle-based,
+# in-band) with those of mpi4py.util.pkl5 (pickle protocol 5,
+# out-of-band buffers, tree and ring algorithms).
+#
+# $ mpiexec -n <np> python scaling.py [-n MAXSIZE] [-l LOOP]
+
+import argparse
+from mpi4py import MPI
+from mpi4py.util import pkl5
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def allocate(nbytes, value=0):
+    if numpy is not None:
+        buf = numpy.empty(nbytes, 'B')
+        buf.fill(value % 256)
+        return buf
+    return bytearray([value % 256]) * nbytes
+
+
+def collectives(comm, rank, size):
+    def bcast(obj):
+        return comm.bcast(obj, root=0)
+    def gather(obj):
+        return comm.gather(obj, root=0)
+    def scatter(obj):
+        return comm.scatter([obj] * size if rank == 0 else None, root=0)
+    def allgather(obj):
+        return comm.allgather(obj)
+    def alltoall(obj):
+        return comm.alltoall([obj] * size)
+    return [
+        ('bcast', bcast),
+        ('gather', gather),
+        ('scatter', scatter),
+        ('allgather', allgather),
+        ('alltoall', alltoall),
+    ]
+
+
+def measure(comm, func, obj, loop):
+    comm.Barrier()
+    t_start = MPI.Wtime()
+    for _ in range(loop):
+        func(obj)
+    t_end = MPI.Wtime()
+    elapsed = comm.allreduce(t_end - t_start, op=MPI.MAX)
+    return elapsed * 1e6 / loop
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--max-size", type=int, default=1 << 24)
+    parser.add_argument("-m", "--min-size", type=int, default=1 << 10)
+    parser.add_argument("-l", "--loop", type=int, default=10)
+    options = parser.parse_args()
+
+    world = MPI.COMM_WORLD
+    rank = world.Get_rank()
+    size = world.Get_size()
+    basecomm = world.Dup()
+    pkl5comm = pkl5.Intracomm(world.Dup())
+    sizes = [1 << i for i in range(40)]
+    sizes = [n for n in sizes if options.min_size <= n <= options.max_size]
+
+    if rank == 0:
+        print(f"# Pickle-based collectives [np={size}]")
+        print(f"# {'Collective':<10} {'Size [B]':>12} "
+              f"{'MPI [us]':>14} {'pkl5 [us]':>14} {'Speedup':>8}")
+    base = collectives(basecomm, rank, size)
+    tree = collectives(pkl5comm, rank, size)
+    for (name, func1), (_, func2) in zip(base, tree):
+        for nbytes in sizes:
+            obj = allocate(nbytes, rank)
+            loop = max(1, min(options.loop, (1 << 26) // nbytes))
+            func1(obj)
+            func2(obj)
+            t_base = measure(world, func1, obj, loop)
+            t_pkl5 = measure(world, func2, obj, loop)
+            if rank == 0:
+                print(f"  {name:<10} {nbytes:>12d} "
+                      f"{t_base:>14.2f} {t_pkl5:>14.2f} "
+                      f"{t_base / t_pkl5:>8.2f}", flush=True)
+
+    pkl5comm.Free()
+    basecomm.Free()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# Latency/bandwidth crossover of object allreduce algorithms.
+#
+# The algorithm is selected at import time with mpi4py.rc or the
+# MPI4PY_RC_ALLREDUCE_ALGORITHM environment variable:
+#
+# $ export MPI4PY_RC_ALLREDUCE_ALGORITHM=reduce_bcast
+# $ mpiexec -n <np> python crossover.py [-n MAXSIZE] [-l LOOP]
+#
+# $ export MPI4PY_RC_ALLREDUCE_ALGORITHM=recursive_doubling
+# $ mpiexec -n <np> python crossover.py [-n MAXSIZE] [-l LOOP]
+
+import argparse
+import mpi4py
+from mpi4py import MPI
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def allocate(nbytes, value):
+    if numpy is not None:
+        return {'data': numpy.full(nbytes // 8, value, 'd')}
+    return {'data': [float(value)] * (nbytes // 8)}
+
+
+def add(x, y):
+    if numpy is not None:
+        return {key: x[key] + y[key] for key in x}
+    return {key: list(map(sum, zip(x[key], y[key]))) for key in x}
+
+
+def measure(comm, obj, loop):
+    comm.allreduce(obj, add)
+    comm.Barrier()
+    t_start = MPI.Wtime()
+    for _ in range(loop):
+        comm.allreduce(obj, add)
+    t_end = MPI.Wtime()
+    elapsed = comm.allreduce(t_end - t_start, op=MPI.MAX)
+    return elapsed * 1e6 / loop
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--max-size", type=int, default=1 << 24)
+    parser.add_argument("-m", "--min-size", type=int, default=1 << 3)
+    parser.add_argument("-l", "--loop", type=int, default=100)
+    options = parser.parse_args()
+
+    comm = MPI.COMM_WORLD.Dup()
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    sizes = [1 << i for i in range(3, 40)]
+    sizes = [n for n in sizes if options.min_size <= n <= options.max_size]
+
+    algorithm = mpi4py.rc.allreduce_algorithm
+    if rank == 0:
+        print(f"# Object allreduce [np={size}, algorithm={algorithm}]")
+        print(f"# {'Size [B]':>12} {'Latency [us]':>14} "
+              f"{'Bandwidth [MB/s]':>18}")
+    for nbytes in sizes:
+        obj = allocate(nbytes, rank)
+        loop = max(1, min(options.loop, (1 << 28) // nbytes))
+        t_usec = measure(comm, obj, loop)
+        if rank == 0:
+            print(f"  {nbytes:>12d} {t_usec:>14.2f} {nbytes / t_usec:>18.2f}",
+                  flush=True)
+
+    comm.Free()
+
+
+if __name__ == '__main__':
+    main()
@@ -452,6 +452,9 @@ class Prequest(Request):
     def Start(self) -> None: ...
     @classmethod
     def Startall(cls, requests: list[Prequest]) -> None: ...
+    def start(self) -> None: ...
+    @classmethod
+    def startall(cls, requests: list[Prequest]) -> None: ...
     def Pready(self, partition: int) -> None: ...
     def Pready_range(self, partition_low: int, partition_high: int) -> None: ...
     def Pready_list(self, partitions: Sequence[int]) -> None: ...
@@ -497,6 +500,8 @@ class Op:
     def __reduce__(self) -> str | tuple[Any, ...]: ...
     @classmethod
     def Create(cls, function: Callable[[Buffer, Buffer, Datatype], None], commute: bool = False) -> Self: ...
+    @classmethod
+    def Create_from_ufunc(cls, ufunc: Callable[..., Any], commute: bool = False) -> Self: ...
     def Free(self) -> None: ...
     def Is_commutative(self) -> bool: ...
     def Reduce_local(self, inbuf: BufSpec, inoutbuf: BufSpec) -> None: ...
@@ -765,6 +770,8 @@ class Comm:
     def ibsend(self, obj: Any, dest: int, tag: int = 0) -> Request: ...
     def issend(self, obj: Any, dest: int, tag: int = 0) -> Request: ...
     def irecv(self, buf: Buffer | None = None, source: int = ANY_SOURCE, tag: int = ANY_TAG) -> Request: ...
+    def send_init(self, obj: Any, dest: int, tag: int = 0) -> Prequest: ...
+    def recv_init(self, buf: Buffer | None = None, source: int = ANY_SOURCE, tag: int = ANY_TAG) -> Prequest: ...
     def probe(self, source: int = ANY_SOURCE, tag: int = ANY_TAG, status: Status | None = None) -> Literal[True]: ...
     def iprobe(self, source: int = ANY_SOURCE, tag: int = ANY_TAG, status: Status | None = None) -> bool: ...
     def mprobe(self, source: int = ANY_SOURCE, tag: int = ANY_TAG, status: Status | None = None) -> Message: ...
@@ -777,6 +784,12 @@ class Comm:
     def alltoall(self, sendobj: Sequence[Any]) -> list[Any]: ...
     def reduce(self, sendobj: Any, op: Op | Callable[[Any, Any], Any] = SUM, root: int = 0) -> Any | None: ...
     def allreduce(self, sendobj: Any, op: Op | Callable[[Any, Any], Any] = SUM) -> Any: ...
+    def ibcast(self, obj: Any, root: int = 0) -> Request: ...
+    def igather(self, sendobj: Any, root: int = 0) -> Request: ...
+    def iscatter(self, sendobj: Sequence[Any] | None, root: int = 0) -> Request: ...
+    def iallgather(self, sendobj: Any) -> Request: ...
+    def ialltoall(self, sendobj: Sequence[Any]) -> Request: ...
+    def iallreduce(self, sendobj: Any, op: Op | Callable[[Any, Any], Any] = SUM) -> Request: ...
     group: Group
     size: int
     rank: int
@@ -1103,6 +1116,21 @@ class Pickle:
 
 pickle: Final[Pickle] = ...
 
+class BufferPool:
+    def __init__(self,
+        capacity: int | None = None,
+        threshold: int | None = None,
+    ) -> None: ...
+    def attach(self, comm: Comm | None = None) -> None: ...
+    def detach(self, comm: Comm | None = None) -> None: ...
+    @staticmethod
+    def lookup(comm: Comm | None = None) -> BufferPool | None: ...
+    def clear(self) -> None: ...
+    def stats(self) -> dict[str, int | float]: ...
+    capacity: int
+    threshold: int
+    nbytes: int
+
 class Exception(RuntimeError):
     def __new__(cls, ierr: int = SUCCESS) -> Exception: ...
     def __repr__(self) -> str: ...
@@ -1119,6 +1147,19 @@ class Exception(RuntimeError):
     error_class: int
     error_string: str
 
+class RequestSet:
+    def __init__(self,
+        requests: Iterable[Request] | None = None,
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, item: int) -> Request: ...
+    def add(self, request: Request) -> int: ...
+    def remove(self, index: int) -> Request: ...
+    def Waitsome(self, statuses: list[Status] | None = None) -> memoryview | None: ...
+    def Testsome(self, statuses: list[Status] | None = None) -> memoryview | None: ...
+    def waitsome(self, statuses: list[Status] | None = None) -> tuple[memoryview | None, list[Any] | None]: ...
+    def testsome(self, statuses: list[Status] | None = None) -> tuple[memoryview | None, list[Any] | None]: ...
+
 def Get_error_class(errorcode: int) -> int: ...
 def Get_error_string(errorcode: int) -> str: ...
 def Add_error_class() -> int: ...
@@ -1153,8 +1194,10 @@ def Wtick() -> float: ...
 def Pcontrol(level: int) -> None: ...
 def get_vendor() -> tuple[str, tuple[int, int, int]]: ...
 def _set_abort_status(status: Any) -> None: ...
+def _set_rc_option(name: str, value: Any) -> Any: ...
 def _comm_lock(comm: Comm, key: Hashable = None) -> Lock: ...
 def _comm_lock_table(comm: Comm) -> dict[Hashable, Lock]: ...
+def _comm_lock_stats(comm: Comm) -> dict[Hashable, dict[str, Any]]: ...
 _lock_table = _comm_lock_table
 def _commctx_intra(comm: Intracomm) -> tuple[Intracomm, int]: ...
 def _commctx_inter(comm: Intercomm) -> tuple[Intercomm, int, Intracomm, bool]: ...
@@ -766,6 +766,9 @@ cdef class Comm:
         """
         Barrier synchronization
         """
+        if options.irecv_mprobe:
+            PyMPI_irecv_barrier(self.ob_mpi)
+            return
         with nogil: CHKERR( MPI_Barrier(self.ob_mpi) )
 
     # Global Communication Functions
@@ -953,6 +956,7 @@ cdef class Comm:
         """
         cdef _p_msg_cco m = message_cco()
         m.for_reduce(sendbuf, recvbuf, root, self.ob_mpi)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Reduce_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, root, self.ob_mpi) )
@@ -968,6 +972,7 @@ cdef class Comm:
         """
         cdef _p_msg_cco m = message_cco()
         m.for_allreduce(sendbuf, recvbuf, self.ob_mpi)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Allreduce_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi) )
@@ -983,6 +988,7 @@ cdef class Comm:
         """
         cdef _p_msg_cco m = message_cco()
         m.for_reduce_scatter_block(sendbuf, recvbuf, self.ob_mpi)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Reduce_scatter_block_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi) )
@@ -1000,6 +1006,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_reduce_scatter(sendbuf, recvbuf,
                              recvcounts, self.ob_mpi)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Reduce_scatter_c(
             m.sbuf, m.rbuf, m.rcounts, m.rtype,
             op.ob_mpi, self.ob_mpi) )
@@ -1210,6 +1217,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_reduce(sendbuf, recvbuf, root, self.ob_mpi)
         cdef Request request = <Request>New(Request)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Ireduce_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, root, self.ob_mpi, &request.ob_mpi) )
@@ -1227,6 +1235,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_allreduce(sendbuf, recvbuf, self.ob_mpi)
         cdef Request request = <Request>New(Request)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Iallreduce_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, &request.ob_mpi) )
@@ -1244,6 +1253,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_reduce_scatter_block(sendbuf, recvbuf, self.ob_mpi)
         cdef Request request = <Request>New(Request)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Ireduce_scatter_block_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, &request.ob_mpi) )
@@ -1263,6 +1273,7 @@ cdef class Comm:
         m.for_reduce_scatter(sendbuf, recvbuf,
                              recvcounts, self.ob_mpi)
         cdef Request request = <Request>New(Request)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Ireduce_scatter_c(
             m.sbuf, m.rbuf, m.rcounts, m.rtype,
             op.ob_mpi, self.ob_mpi, &request.ob_mpi) )
@@ -1490,6 +1501,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_reduce(sendbuf, recvbuf, root, self.ob_mpi)
         cdef Prequest request = <Prequest>New(Prequest)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Reduce_init_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, root, self.ob_mpi, info.ob_mpi, &request.ob_mpi) )
@@ -1508,6 +1520,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_allreduce(sendbuf, recvbuf, self.ob_mpi)
         cdef Prequest request = <Prequest>New(Prequest)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Allreduce_init_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, info.ob_mpi, &request.ob_mpi) )
@@ -1526,6 +1539,7 @@ cdef class Comm:
         cdef _p_msg_cco m = message_cco()
         m.for_reduce_scatter_block(sendbuf, recvbuf, self.ob_mpi)
         cdef Prequest request = <Prequest>New(Prequest)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Reduce_scatter_block_init_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, info.ob_mpi, &request.ob_mpi) )
@@ -1546,6 +1560,7 @@ cdef class Comm:
         m.for_reduce_scatter(sendbuf, recvbuf,
                              recvcounts, self.ob_mpi)
         cdef Prequest request = <Prequest>New(Prequest)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Reduce_scatter_init_c(
             m.sbuf, m.rbuf, m.rcounts, m.rtype,
             op.ob_mpi, self.ob_mpi, info.ob_mpi, &request.ob_mpi) )
@@ -1792,6 +1807,7 @@ cdef class Comm:
     ) -> None:
         """Send"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_send(obj, dest, tag, comm)
     #
     def bsend(
@@ -1802,6 +1818,7 @@ cdef class Comm:
     ) -> None:
         """Send in buffered mode"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_bsend(obj, dest, tag, comm)
     #
     def ssend(
@@ -1812,6 +1829,7 @@ cdef class Comm:
     ) -> None:
         """Send in synchronous mode"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_ssend(obj, dest, tag, comm)
     #
     def recv(
@@ -1824,6 +1842,7 @@ cdef class Comm:
         """Receive"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_recv(buf, source, tag, comm, statusp)
     #
     def sendrecv(
@@ -1839,6 +1858,7 @@ cdef class Comm:
         """Send and Receive"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_sendrecv(sendobj, dest,   sendtag,
                               recvbuf, source, recvtag,
                               comm, statusp)
@@ -1852,6 +1872,7 @@ cdef class Comm:
         """Nonblocking send"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
         request.ob_buf = PyMPI_isend(obj, dest, tag, comm, &request.ob_mpi)
         return request
     #
@@ -1864,6 +1885,7 @@ cdef class Comm:
         """Nonblocking send in buffered mode"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
         request.ob_buf = PyMPI_ibsend(obj, dest, tag, comm, &request.ob_mpi)
         return request
     #
@@ -1876,6 +1898,7 @@ cdef class Comm:
         """Nonblocking send in synchronous mode"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
         request.ob_buf = PyMPI_issend(obj, dest, tag, comm, &request.ob_mpi)
         return request
     #
@@ -1888,7 +1911,34 @@ cdef class Comm:
         """Nonblocking receive"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef Request request = <Request>New(Request)
-        request.ob_buf = PyMPI_irecv(buf, source, tag, comm, &request.ob_mpi)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_irecv(buf, source, tag, comm, request)
+        return request
+    #
+    def send_init(
+        self,
+        obj: Any,
+        int dest: int,
+        int tag: int = 0,
+    ) -> Prequest:
+        """Create a persistent request for a send"""
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Prequest request = <Prequest>New(Prequest)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_send_init(obj, dest, tag, comm, request)
+        return request
+    #
+    def recv_init(
+        self,
+        buf: Buffer | None = None,
+        int source: int = ANY_SOURCE,
+        int tag: int = ANY_TAG,
+    ) -> Prequest:
+        """Create a persistent request for a receive"""
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Prequest request = <Prequest>New(Prequest)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_recv_init(buf, source, tag, comm, request)
         return request
     #
     def probe(
@@ -1900,6 +1950,7 @@ cdef class Comm:
         """Blocking test for a message"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_probe(source, tag, comm, statusp)
     #
     def iprobe(
@@ -1911,6 +1962,7 @@ cdef class Comm:
         """Nonblocking test for a message"""
         cdef MPI_Comm comm = self.ob_mpi
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_iprobe(source, tag, comm, statusp)
     #
     def mprobe(
@@ -1923,6 +1975,7 @@ cdef class Comm:
         cdef MPI_Comm comm = self.ob_mpi
         cdef MPI_Status *statusp = arg_Status(status)
         cdef Message message = <Message>New(Message)
+        if cco_pending: PyMPI_cco_progress(comm)
         message.ob_buf = PyMPI_mprobe(source, tag, comm,
                                       &message.ob_mpi, statusp)
         return message
@@ -1938,6 +1991,7 @@ cdef class Comm:
         cdef MPI_Comm comm = self.ob_mpi
         cdef MPI_Status *statusp = arg_Status(status)
         cdef Message message = <Message>New(Message)
+        if cco_pending: PyMPI_cco_progress(comm)
         message.ob_buf = PyMPI_improbe(source, tag, comm, &flag,
                                        &message.ob_mpi, statusp)
         if flag == 0: return None
@@ -1950,6 +2004,7 @@ cdef class Comm:
         .. note:: This method is equivalent to `Comm.Barrier()`
         """
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_barrier(comm)
     #
     def bcast(
@@ -1959,6 +2014,7 @@ cdef class Comm:
     ) -> Any:
         """Broadcast"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_bcast(obj, root, comm)
     #
     def gather(
@@ -1968,6 +2024,7 @@ cdef class Comm:
     ) -> list[Any] | None:
         """Gather"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_gather(sendobj, root, comm)
     #
     def scatter(
@@ -1977,6 +2034,7 @@ cdef class Comm:
     ) -> Any:
         """Scatter"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_scatter(sendobj, root, comm)
     #
     def allgather(
@@ -1985,6 +2043,7 @@ cdef class Comm:
     ) -> list[Any]:
         """Gather to All"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_allgather(sendobj, comm)
     #
     def alltoall(
@@ -1993,6 +2052,7 @@ cdef class Comm:
     ) -> list[Any]:
         """All to All Scatter/Gather"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_alltoall(sendobj, comm)
     #
     def reduce(
@@ -2003,6 +2063,7 @@ cdef class Comm:
     ) -> Any | None:
         """Reduce to Root"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_reduce(sendobj, op, root, comm)
     #
     def allreduce(
@@ -2012,7 +2073,126 @@ cdef class Comm:
     ) -> Any:
         """Reduce to All"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_allreduce(sendobj, op, comm)
+    #
+    def ibcast(
+        self,
+        obj: Any,
+        int root: int = 0,
+    ) -> Request:
+        """
+        Nonblocking Broadcast
+
+        .. note:: The transfer of pickled data is posted once the
+           nonblocking exchange of message sizes completes. Call
+           `Request.test()` on the returned request, or any other
+           communication method with Python objects on this
+           communicator, to progress the operation.
+        """
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_ibcast(obj, root, comm, request)
+        return request
+    #
+    def igather(
+        self,
+        sendobj: Any,
+        int root: int = 0,
+    ) -> Request:
+        """
+        Nonblocking Gather
+
+        .. note:: The transfer of pickled data is posted once the
+           nonblocking exchange of message sizes completes. Call
+           `Request.test()` on the returned request, or any other
+           communication method with Python objects on this
+           communicator, to progress the operation.
+        """
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_igather(sendobj, root, comm, request)
+        return request
+    #
+    def iscatter(
+        self,
+        sendobj: Sequence[Any] | None,
+        int root: int = 0,
+    ) -> Request:
+        """
+        Nonblocking Scatter
+
+        .. note:: The transfer of pickled data is posted once the
+           nonblocking exchange of message sizes completes. Call
+           `Request.test()` on the returned request, or any other
+           communication method with Python objects on this
+           communicator, to progress the operation.
+        """
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_iscatter(sendobj, root, comm, request)
+        return request
+    #
+    def iallgather(
+        self,
+        sendobj: Any,
+    ) -> Request:
+        """
+        Nonblocking Gather to All
+
+        .. note:: The transfer of pickled data is posted once the
+           nonblocking exchange of message sizes completes. Call
+           `Request.test()` on the returned request, or any other
+           communication method with Python objects on this
+           communicator, to progress the operation.
+        """
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_iallgather(sendobj, comm, request)
+        return request
+    #
+    def ialltoall(
+        self,
+        sendobj: Sequence[Any],
+    ) -> Request:
+        """
+        Nonblocking All to All Scatter/Gather
+
+        .. note:: The transfer of pickled data is posted once the
+           nonblocking exchange of message sizes completes. Call
+           `Request.test()` on the returned request, or any other
+           communication method with Python objects on this
+           communicator, to progress the operation.
+        """
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_ialltoall(sendobj, comm, request)
+        return request
+    #
+    def iallreduce(
+        self,
+        sendobj: Any,
+        op: Op | Callable[[Any, Any], Any] = SUM,
+    ) -> Request:
+        """
+        Nonblocking Reduce to All
+
+        .. note:: The transfer of pickled data is posted once the
+           nonblocking exchange of message sizes completes. Call
+           `Request.test()` on the returned request, or any other
+           communication method with Python objects on this
+           communicator, to progress the operation.
+        """
+        cdef MPI_Comm comm = self.ob_mpi
+        cdef Request request = <Request>New(Request)
+        if cco_pending: PyMPI_cco_progress(comm)
+        request.ob_buf = PyMPI_iallreduce(sendobj, op, comm, request)
+        return request
 
 
 cdef class Intracomm(Comm):
@@ -2243,6 +2423,7 @@ cdef class Intracomm(Comm):
         """
         cdef _p_msg_cco m = message_cco()
         m.for_scan(sendbuf, recvbuf, self.ob_mpi)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Scan_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi) )
@@ -2260,6 +2441,7 @@ cdef class Intracomm(Comm):
         """
         cdef _p_msg_cco m = message_cco()
         m.for_exscan(sendbuf, recvbuf, self.ob_mpi)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Exscan_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi) )
@@ -2278,6 +2460,7 @@ cdef class Intracomm(Comm):
         cdef _p_msg_cco m = message_cco()
         m.for_scan(sendbuf, recvbuf, self.ob_mpi)
         cdef Request request = <Request>New(Request)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Iscan_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, &request.ob_mpi) )
@@ -2295,6 +2478,7 @@ cdef class Intracomm(Comm):
         cdef _p_msg_cco m = message_cco()
         m.for_exscan(sendbuf, recvbuf, self.ob_mpi)
         cdef Request request = <Request>New(Request)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Iexscan_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, &request.ob_mpi) )
@@ -2315,6 +2499,7 @@ cdef class Intracomm(Comm):
         cdef _p_msg_cco m = message_cco()
         m.for_scan(sendbuf, recvbuf, self.ob_mpi)
         cdef Prequest request = <Prequest>New(Prequest)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Scan_init_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, info.ob_mpi, &request.ob_mpi) )
@@ -2334,6 +2519,7 @@ cdef class Intracomm(Comm):
         cdef _p_msg_cco m = message_cco()
         m.for_exscan(sendbuf, recvbuf, self.ob_mpi)
         cdef Prequest request = <Prequest>New(Prequest)
+        op_user_check(op, m.rtype)
         with nogil: CHKERR( MPI_Exscan_init_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype,
             op.ob_mpi, self.ob_mpi, info.ob_mpi, &request.ob_mpi) )
@@ -2349,6 +2535,7 @@ cdef class Intracomm(Comm):
     ) -> Any:
         """Inclusive Scan"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_scan(sendobj, op, comm)
     #
     def exscan(
@@ -2358,6 +2545,7 @@ cdef class Intracomm(Comm):
     ) -> Any:
         """Exclusive Scan"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_exscan(sendobj, op, comm)
 
     # Establishing Communication
@@ -2845,11 +3033,13 @@ cdef class Topocomm(Intracomm):
     def neighbor_allgather(self, sendobj: Any) -> list[Any]:
         """Neighbor Gather to All"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_neighbor_allgather(sendobj, comm)
     #
     def neighbor_alltoall(self, sendobj: list[Any]) -> list[Any]:
         """Neighbor All to All Scatter/Gather"""
         cdef MPI_Comm comm = self.ob_mpi
+        if cco_pending: PyMPI_cco_progress(comm)
         return PyMPI_neighbor_alltoall(sendobj, comm)
 
 
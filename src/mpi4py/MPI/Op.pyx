@@ -47,6 +47,17 @@ cdef class Op:
             raise
         return self
 
+    @classmethod
+    def Create_from_ufunc(
+        cls,
+        ufunc: Callable[..., Any],
+        bint commute: bool = False,
+    ) -> Self:
+        """
+        Create a user-defined operation from a NumPy ufunc
+        """
+        return cls.Create(_p_ufunc(ufunc), commute)
+
     def Free(self) -> None:
         """
         Free the operation
@@ -98,6 +109,7 @@ cdef class Op:
             f"and inoutbuf count {m.rcount}")
         if (m.stype != m.rtype): raise ValueError(
             "mismatch in inbuf and inoutbuf MPI datatypes")
+        op_user_check(self, m.rtype)
         # do local reduction
         with nogil: CHKERR( MPI_Reduce_local_c(
             m.sbuf, m.rbuf, m.rcount, m.rtype, self.ob_mpi) )
@@ -29,6 +29,8 @@ cdef class Request:
         Wait for a send or receive to complete
         """
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending: PyMPI_cco_wait((self,))
+        if irecv_pending: PyMPI_irecv_wait((self,), 1)
         with nogil: CHKERR( MPI_Wait(
             &self.ob_mpi, statusp) )
         if self.ob_mpi == MPI_REQUEST_NULL:
@@ -41,6 +43,8 @@ cdef class Request:
         """
         cdef int flag = 0
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending and PyMPI_cco_test((self,)): return False
+        if irecv_pending: PyMPI_irecv_progress()
         with nogil: CHKERR( MPI_Test(
             &self.ob_mpi, &flag, statusp) )
         if self.ob_mpi == MPI_REQUEST_NULL:
@@ -59,6 +63,8 @@ cdef class Request:
         """
         cdef int flag = 0
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending and PyMPI_cco_test((self,)): return False
+        if irecv_pending: PyMPI_irecv_progress()
         with nogil: CHKERR( MPI_Request_get_status(
             self.ob_mpi, &flag, statusp) )
         return <bint>flag
@@ -80,12 +86,17 @@ cdef class Request:
         cdef int index = MPI_UNDEFINED
         cdef MPI_Status *statusp = arg_Status(status)
         #
-        cdef tmp = acquire_rs(requests, None, &count, &irequests, NULL)
-        try:
-            with nogil: CHKERR( MPI_Waitany(
-                count, irequests, &index, statusp) )
-        finally:
-            release_rs(requests, None, count, irequests, 0, NULL)
+        cdef tmp = None
+        while True:
+            if irecv_pending: PyMPI_irecv_wait(requests, 0)
+            tmp = acquire_rs(requests, None, &count, &irequests, NULL)
+            try:
+                with nogil: CHKERR( MPI_Waitany(
+                    count, irequests, &index, statusp) )
+            finally:
+                release_rs(requests, None, count, irequests, 0, NULL)
+            if not cco_pending: break
+            if not PyMPI_cco_post(requests): break
         return index
 
     @classmethod
@@ -103,12 +114,16 @@ cdef class Request:
         cdef int flag = 0
         cdef MPI_Status *statusp = arg_Status(status)
         #
+        cdef int masked = 0
         cdef tmp = acquire_rs(requests, None, &count, &irequests, NULL)
         try:
+            if cco_pending: masked = PyMPI_cco_mask(requests, irequests)
             with nogil: CHKERR( MPI_Testany(
                 count, irequests, &index, &flag, statusp) )
         finally:
+            if masked: PyMPI_cco_unmask(requests, irequests)
             release_rs(requests, None, count, irequests, 0, NULL)
+        if masked and index == MPI_UNDEFINED: flag = 0
         #
         return (index, <bint>flag)
 
@@ -125,6 +140,8 @@ cdef class Request:
         cdef MPI_Request *irequests = NULL
         cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
         #
+        if cco_pending: PyMPI_cco_wait(requests)
+        if irecv_pending: PyMPI_irecv_wait(requests, 1)
         cdef tmp = acquire_rs(requests, statuses,
                               &count, &irequests, &istatuses)
         try:
@@ -148,6 +165,7 @@ cdef class Request:
         cdef int flag = 0
         cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
         #
+        if cco_pending and PyMPI_cco_test(requests): return False
         cdef tmp = acquire_rs(requests, statuses,
                               &count, &irequests, &istatuses)
         try:
@@ -171,16 +189,25 @@ cdef class Request:
         cdef int outcount = MPI_UNDEFINED, *iindices = NULL
         cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
         #
-        cdef tmp1 = acquire_rs(requests, statuses,
-                               &incount, &irequests, &istatuses)
-        cdef tmp2 = newarray(incount, &iindices)
-        try:
-            with nogil: CHKERR( MPI_Waitsome(
-                incount, irequests, &outcount, iindices, istatuses) )
-        finally:
-            release_rs(requests, statuses,
-                       incount, irequests,
-                       outcount, istatuses)
+        cdef int posted = 0
+        cdef tmp1 = None, tmp2 = None
+        while True:
+            posted = 0
+            if irecv_pending: PyMPI_irecv_wait(requests, 0)
+            tmp1 = acquire_rs(requests, statuses,
+                              &incount, &irequests, &istatuses)
+            tmp2 = newarray(incount, &iindices)
+            try:
+                with nogil: CHKERR( MPI_Waitsome(
+                    incount, irequests, &outcount, iindices, istatuses) )
+                if cco_pending: posted = PyMPI_cco_filter(
+                    requests, &outcount, iindices, istatuses)
+            finally:
+                release_rs(requests, statuses,
+                           incount, irequests,
+                           outcount, istatuses)
+            if posted: PyMPI_cco_post(requests)
+            if not posted or outcount > 0: break
         #
         cdef object indices = None
         if outcount != MPI_UNDEFINED:
@@ -201,16 +228,20 @@ cdef class Request:
         cdef int outcount = MPI_UNDEFINED, *iindices = NULL
         cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
         #
+        cdef int masked = 0
         cdef tmp1 = acquire_rs(requests, statuses,
                                &incount, &irequests, &istatuses)
         cdef tmp2 = newarray(incount, &iindices)
         try:
+            if cco_pending: masked = PyMPI_cco_mask(requests, irequests)
             with nogil: CHKERR( MPI_Testsome(
                 incount, irequests, &outcount, iindices, istatuses) )
         finally:
+            if masked: PyMPI_cco_unmask(requests, irequests)
             release_rs(requests, statuses,
                        incount, irequests,
                        outcount, istatuses)
+        if masked and outcount == MPI_UNDEFINED: outcount = 0
         #
         cdef object indices = None
         if outcount != MPI_UNDEFINED:
@@ -277,6 +308,8 @@ cdef class Request:
         """
         cdef int flag = 0
         cdef MPI_Status *statusp = arg_Status(status)
+        if cco_pending and PyMPI_cco_test((self,)): return False
+        if irecv_pending: PyMPI_irecv_progress()
         with nogil: CHKERR( MPI_Request_get_status(
             self.ob_mpi, &flag, statusp) )
         return <bint>flag
@@ -392,6 +425,22 @@ cdef class Prequest(Request):
         finally:
             release_rs(requests, None, count, irequests, 0, NULL)
 
+    # Python Communication
+    # --------------------
+    #
+    def start(self) -> None:
+        """
+        Initiate a communication with a persistent request
+        """
+        PyMPI_start(self)
+    #
+    @classmethod
+    def startall(cls, requests: list[Prequest]) -> None:
+        """
+        Start a collection of persistent requests
+        """
+        PyMPI_startall(requests)
+
     # Partitioned completion
     # ----------------------
 
@@ -484,6 +533,358 @@ cdef class Grequest(Request):
 
 
 
+cdef class RequestSet:
+
+    """
+    Set of requests with persistent handle storage
+    """
+
+    cdef MPI_Request *ob_reqs
+    cdef MPI_Status  *ob_stats
+    cdef int         *ob_index
+    cdef object ob_mem_r, ob_mem_s, ob_mem_i
+    cdef int  ob_capacity
+    cdef int  ob_size
+    cdef int  ob_count
+    cdef int  ob_swap
+    cdef list ob_items
+    cdef list ob_free
+
+    def __cinit__(self, *args, **kwargs):
+        <void> args   # unused
+        <void> kwargs # unused
+        self.ob_reqs = NULL
+        self.ob_stats = NULL
+        self.ob_index = NULL
+        self.ob_mem_r = self.ob_mem_s = self.ob_mem_i = None
+        self.ob_capacity = self.ob_size = self.ob_count = 0
+        self.ob_swap = 0
+        self.ob_items = []
+        self.ob_free = []
+        reqset_grow(self, 16)
+
+    def __init__(
+        self,
+        requests: Iterable[Request] | None = None,
+    ) -> None:
+        if requests is not None:
+            for request in requests:
+                self.add(request)
+
+    def __len__(self) -> int:
+        return self.ob_count
+
+    def __getitem__(self, int index: int) -> Request:
+        return reqset_item(self, index)
+
+    def add(self, Request request: Request) -> int:
+        """
+        Add a request to the set and return its index
+        """
+        cdef int index
+        if self.ob_free:
+            index = self.ob_free.pop()
+        else:
+            if self.ob_size == self.ob_capacity:
+                reqset_grow(self, 2 * self.ob_capacity)
+            index = self.ob_size
+            self.ob_size += 1
+            self.ob_items.append(None)
+        self.ob_reqs[index] = request.ob_mpi
+        self.ob_items[index] = request
+        self.ob_count += 1
+        if type(request.ob_buf) is _p_irecv:
+            self.ob_swap += 1
+        elif cco_state(request) is not None:
+            self.ob_swap += 1
+        return index
+
+    def remove(self, int index: int) -> Request:
+        """
+        Remove the request at a given index from the set
+        """
+        cdef Request request = reqset_item(self, index)
+        self.ob_reqs[index] = MPI_REQUEST_NULL
+        self.ob_items[index] = None
+        self.ob_free.append(index)
+        self.ob_count -= 1
+        return request
+
+    def Waitsome(
+        self,
+        statuses: list[Status] | None = None,
+    ) -> memoryview | None:
+        """
+        Wait for some requests in the set to complete
+        """
+        cdef int outcount = MPI_UNDEFINED
+        cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
+        if statuses is not None:
+            istatuses = reqset_statuses(self)
+        cdef int posted = 0
+        reqset_sync(self)
+        while True:
+            if self.ob_swap: reqset_swap(self, 1)
+            try:
+                with nogil: CHKERR( MPI_Waitsome(
+                    self.ob_size, self.ob_reqs,
+                    &outcount, self.ob_index, istatuses) )
+                if self.ob_swap: posted = reqset_post(
+                    self, &outcount, istatuses)
+            finally:
+                reqset_release(self, outcount, statuses, istatuses)
+            if not posted or outcount > 0: break
+        return reqset_indices(self, outcount)
+
+    def Testsome(
+        self,
+        statuses: list[Status] | None = None,
+    ) -> memoryview | None:
+        """
+        Test for completion of some requests in the set
+        """
+        cdef int outcount = MPI_UNDEFINED
+        cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
+        if statuses is not None:
+            istatuses = reqset_statuses(self)
+        cdef int masked = 0
+        reqset_sync(self)
+        if self.ob_swap: masked = reqset_swap(self, 0)
+        try:
+            with nogil: CHKERR( MPI_Testsome(
+                self.ob_size, self.ob_reqs,
+                &outcount, self.ob_index, istatuses) )
+        finally:
+            reqset_release(self, outcount, statuses, istatuses)
+            if masked: reqset_unmask(self)
+        if masked and outcount == MPI_UNDEFINED: outcount = 0
+        return reqset_indices(self, outcount)
+
+    def waitsome(
+        self,
+        statuses: list[Status] | None = None,
+    ) -> tuple[memoryview | None, list[Any] | None]:
+        """
+        Wait for some requests in the set to complete
+        """
+        cdef int outcount = MPI_UNDEFINED
+        cdef MPI_Status *istatuses = reqset_statuses(self)
+        cdef object bufs = None, objects = None
+        cdef int posted = 0
+        reqset_sync(self)
+        while True:
+            if self.ob_swap: reqset_swap(self, 1)
+            try:
+                with nogil: CHKERR( MPI_Waitsome(
+                    self.ob_size, self.ob_reqs,
+                    &outcount, self.ob_index, istatuses) )
+                if self.ob_swap: posted = reqset_post(
+                    self, &outcount, istatuses)
+            finally:
+                bufs = reqset_release(self, outcount, statuses, istatuses)
+            if not posted or outcount > 0: break
+        if outcount != MPI_UNDEFINED:
+            objects = [
+                PyMPI_load(&istatuses[i], bufs[i])
+                for i in range(outcount)
+            ]
+        return (reqset_indices(self, outcount), objects)
+
+    def testsome(
+        self,
+        statuses: list[Status] | None = None,
+    ) -> tuple[memoryview | None, list[Any] | None]:
+        """
+        Test for completion of some requests in the set
+        """
+        cdef int outcount = MPI_UNDEFINED
+        cdef MPI_Status *istatuses = reqset_statuses(self)
+        cdef object bufs = None, objects = None
+        cdef int masked = 0
+        reqset_sync(self)
+        if self.ob_swap: masked = reqset_swap(self, 0)
+        try:
+            with nogil: CHKERR( MPI_Testsome(
+                self.ob_size, self.ob_reqs,
+                &outcount, self.ob_index, istatuses) )
+        finally:
+            bufs = reqset_release(self, outcount, statuses, istatuses)
+            if masked: reqset_unmask(self)
+        if masked and outcount == MPI_UNDEFINED:
+            outcount = 0
+            bufs = []
+        if outcount != MPI_UNDEFINED:
+            objects = [
+                PyMPI_load(&istatuses[i], bufs[i])
+                for i in range(outcount)
+            ]
+        return (reqset_indices(self, outcount), objects)
+
+
+# The handles of the requests in a set are kept in a C array passed
+# as is to MPI; only the entries completed by a call are written back
+# to their Request instances. Handles changed outside the set are
+# refreshed before every call.
+
+cdef int reqset_grow(RequestSet self, int capacity) except -1:
+    cdef MPI_Request *array_r = NULL
+    cdef int *array_i = NULL
+    cdef object ob_r = allocate(capacity, sizeof(MPI_Request), &array_r)
+    cdef object ob_i = allocate(capacity, sizeof(int), &array_i)
+    if self.ob_size > 0:
+        memcpy(array_r, self.ob_reqs,
+               <size_t>self.ob_size * sizeof(MPI_Request))
+    self.ob_reqs, self.ob_mem_r = array_r, ob_r
+    self.ob_index, self.ob_mem_i = array_i, ob_i
+    self.ob_stats, self.ob_mem_s = NULL, None
+    self.ob_capacity = capacity
+    return 0
+
+
+cdef MPI_Status *reqset_statuses(RequestSet self) except NULL:
+    cdef MPI_Status *array_s = NULL
+    if self.ob_stats == NULL:
+        self.ob_mem_s = allocate(
+            self.ob_capacity, sizeof(MPI_Status), &array_s)
+        self.ob_stats = array_s
+    return self.ob_stats
+
+
+cdef Request reqset_item(RequestSet self, int index):
+    if index < 0 or index >= self.ob_size:
+        raise IndexError("request index out of range")
+    cdef object request = self.ob_items[index]
+    if request is None:
+        raise IndexError(f"no request at index {index}")
+    return <Request>request
+
+
+cdef int reqset_sync(RequestSet self) except -1:
+    # members completed or freed outside the set have a stale
+    # handle in the array, refresh it from the Request instance
+    cdef Request request
+    for i in range(self.ob_size):
+        request = self.ob_items[i]
+        if request is None: continue
+        if self.ob_reqs[i] != request.ob_mpi:
+            self.ob_reqs[i] = request.ob_mpi
+    return 0
+
+
+cdef int reqset_swap(RequestSet self, bint blocking) except -1:
+    # receives posted without a buffer and collectives with a size
+    # exchange pending replace their handle once matched or posted,
+    # possibly while progressing other calls; pending size exchanges
+    # are hidden from test calls, return their number
+    cdef Request request
+    cdef list requests = [
+        request for request in self.ob_items
+        if request is not None
+    ]
+    cdef int masked = 0
+    if irecv_pending:
+        if blocking:
+            PyMPI_irecv_wait(requests, 0)
+        else:
+            PyMPI_irecv_progress()
+    if cco_pending and not blocking:
+        PyMPI_cco_test(requests)
+    self.ob_swap = 0
+    for i in range(self.ob_size):
+        request = self.ob_items[i]
+        if request is None: continue
+        self.ob_reqs[i] = request.ob_mpi
+        if type(request.ob_buf) is _p_irecv:
+            self.ob_swap += 1
+        elif cco_state(request) is not None:
+            self.ob_swap += 1
+            if not blocking:
+                self.ob_reqs[i] = MPI_REQUEST_NULL
+                masked += 1
+    return masked
+
+
+cdef int reqset_unmask(RequestSet self) except -1:
+    cdef Request request
+    for i in range(self.ob_size):
+        request = self.ob_items[i]
+        if request is None: continue
+        if cco_state(request) is not None:
+            self.ob_reqs[i] = request.ob_mpi
+    return 0
+
+
+cdef int reqset_post(
+    RequestSet self,
+    int *outcount,
+    MPI_Status *istatuses,
+) except -1:
+    # size exchanges completed by a wait call are not reported,
+    # the transfer of data is posted instead; return their number
+    if outcount[0] == MPI_UNDEFINED: return 0
+    cdef Request request
+    cdef int index, j = 0
+    cdef list posted = []
+    for i in range(outcount[0]):
+        index = self.ob_index[i]
+        request = <Request>self.ob_items[index]
+        if cco_state(request) is not None:
+            request.ob_mpi = self.ob_reqs[index]
+            posted.append(request)
+            continue
+        self.ob_index[j] = index
+        if istatuses != MPI_STATUSES_IGNORE:
+            istatuses[j] = istatuses[i]
+        j += 1
+    outcount[0] = j
+    PyMPI_cco_post(posted)
+    return len(posted)
+
+
+cdef object reqset_release(
+    RequestSet self,
+    int outcount,
+    object statuses,
+    MPI_Status *istatuses,
+):
+    if outcount == MPI_UNDEFINED: return None
+    cdef Request request
+    cdef int index
+    cdef list bufs = []
+    for i in range(outcount):
+        index = self.ob_index[i]
+        request = <Request>self.ob_items[index]
+        request.ob_mpi = self.ob_reqs[index]
+        bufs.append(request.ob_buf)
+        if request.ob_mpi == MPI_REQUEST_NULL:
+            if cco_state(request) is None:
+                request.ob_buf = None
+    cdef Py_ssize_t ns = 0
+    if statuses is not None:
+        ns = len(statuses)
+        if outcount > ns:
+            if isinstance(statuses, list):
+                statuses += [
+                    <Status>New(Status)
+                    for _ in range (ns, outcount)
+                ]
+                ns = outcount
+        for i in range(min(outcount, ns)):
+            (<Status?>statuses[i]).ob_mpi = istatuses[i]
+    return bufs
+
+
+cdef object reqset_indices(RequestSet self, int outcount):
+    if outcount == MPI_UNDEFINED: return None
+    cdef int *array_i = NULL
+    cdef Py_ssize_t size = <Py_ssize_t>outcount * <Py_ssize_t>sizeof(int)
+    cdef object ob = allocate(outcount, sizeof(int), &array_i)
+    memcpy(array_i, self.ob_index, <size_t>size)
+    cdef memory mem = <memory>New(memory)
+    PyBuffer_FillInfo(&mem.view, ob, array_i, size, 0, PyBUF_SIMPLE)
+    return memoryview(mem).cast('i')
+
+
 cdef Request __REQUEST_NULL__ = def_Request( MPI_REQUEST_NULL , "REQUEST_NULL" )
 
 
@@ -24,9 +24,9 @@ cdef extern from "Python.h":
         Py_ssize_t itemsize
         bint readonly
         char *format
-        #int ndim
-        #Py_ssize_t *shape
-        #Py_ssize_t *strides
+        int ndim
+        Py_ssize_t *shape
+        Py_ssize_t *strides
         #Py_ssize_t *suboffsets
     cdef enum:
         PyBUF_SIMPLE
@@ -38,6 +38,7 @@ cdef extern from "Python.h":
     int  PyObject_CheckBuffer(object)
     int  PyObject_GetBuffer(object, Py_buffer *, int) except -1
     void PyBuffer_Release(Py_buffer *)
+    int  PyBuffer_IsContiguous(Py_buffer *, char)
     int  PyBuffer_FillInfo(Py_buffer *, object,
                            void *, Py_ssize_t,
                            bint, int) except -1
@@ -62,6 +63,36 @@ cdef inline int is_little_endian() noexcept nogil:
 
 #------------------------------------------------------------------------------
 
+# Memory layout of strided buffers, strides in bytes
+cdef enum:
+    PyMPI_MAX_NDIM = 64
+
+ctypedef struct PyMPI_Layout:
+    int ndim
+    Py_ssize_t itemsize
+    Py_ssize_t shape[PyMPI_MAX_NDIM]
+    Py_ssize_t strides[PyMPI_MAX_NDIM]
+
+cdef inline int layout_set_ndim(PyMPI_Layout *layout, Py_ssize_t ndim) except -1:
+    if ndim > PyMPI_MAX_NDIM: raise BufferError(
+        f"buffer with too many dimensions "
+        f"({ndim} > {<int>PyMPI_MAX_NDIM})")
+    layout.ndim = <int> ndim
+    return 0
+
+cdef inline bint layout_is_contig(PyMPI_Layout *layout, char order):
+    cdef int i, index, ndim = layout.ndim
+    cdef Py_ssize_t dim, size = layout.itemsize
+    for i in range(ndim):
+        index = i if order == c'F' else ndim - 1 - i
+        dim = layout.shape[index]
+        if dim == 0: return 1
+        if dim > 1 and size != layout.strides[index]: return 0
+        size *= dim
+    return 1
+
+#------------------------------------------------------------------------------
+
 include "asdlpack.pxi"
 include "ascaibuf.pxi"
 
@@ -69,14 +100,44 @@ cdef int PyMPI_GetBuffer(object obj, Py_buffer *view, int flags) except -1:
     try:
         return PyObject_GetBuffer(obj, view, flags)
     except BaseException:
-        try: return Py_GetDLPackBuffer(obj, view, flags)
+        try: return Py_GetDLPackBuffer(obj, view, flags, NULL)
         except NotImplementedError: pass
         except BaseException: raise
-        try: return Py_GetCAIBuffer(obj, view, flags)
+        try: return Py_GetCAIBuffer(obj, view, flags, NULL)
         except NotImplementedError: pass
         except BaseException: raise
         raise
 
+cdef int PyMPI_GetStridedBuffer(
+    object obj,
+    Py_buffer *view,
+    int flags,
+    PyMPI_Layout *layout,
+) except -1:
+    cdef int i
+    try:
+        PyObject_GetBuffer(obj, view, flags | PyBUF_STRIDES)
+    except BaseException:
+        try: return Py_GetDLPackBuffer(obj, view, flags, layout)
+        except NotImplementedError: pass
+        except BaseException: raise
+        try: return Py_GetCAIBuffer(obj, view, flags, layout)
+        except NotImplementedError: pass
+        except BaseException: raise
+        raise
+    try:
+        layout_set_ndim(layout, view.ndim)
+    except BaseException:
+        PyBuffer_Release(view)
+        raise
+    layout.itemsize = view.itemsize
+    for i in range(view.ndim):
+        layout.shape[i] = view.shape[i]
+        layout.strides[i] = view.strides[i]
+    if view.ndim == 0 or PyBuffer_IsContiguous(view, c'A'):
+        layout.ndim = 0
+    return 0
+
 #------------------------------------------------------------------------------
 
 @cython.final
@@ -274,6 +335,19 @@ cdef inline memory getbuffer(object ob, bint readonly, bint format):
     PyMPI_GetBuffer(ob, &buf.view, flags)
     return buf
 
+cdef inline memory getbuffer_strided(
+    object ob, bint readonly, bint format,
+    PyMPI_Layout *layout,
+):
+    cdef memory buf = newbuffer()
+    cdef int flags = PyBUF_STRIDES
+    if not readonly:
+        flags |= PyBUF_WRITABLE
+    if format:
+        flags |= PyBUF_FORMAT
+    PyMPI_GetStridedBuffer(ob, &buf.view, flags, layout)
+    return buf
+
 cdef inline memory asbuffer(object ob, void **base, MPI_Aint *size, bint ro):
     cdef memory buf
     if type(ob) is memory:
@@ -61,7 +61,12 @@ cdef int Py_CheckCAIBuffer(object obj):
     try: return <bint>hasattr(obj, '__cuda_array_interface__')
     except: return 0
 
-cdef int Py_GetCAIBuffer(object obj, Py_buffer *view, int flags) except -1:
+cdef int Py_GetCAIBuffer(
+    object obj,
+    Py_buffer *view,
+    int flags,
+    PyMPI_Layout *layout,
+) except -1:
     cdef dict cuda_array_interface
     cdef tuple data
     cdef str   typestr
@@ -76,6 +81,7 @@ cdef int Py_GetCAIBuffer(object obj, Py_buffer *view, int flags) except -1:
     cdef char byteorder = c'|'
     cdef char typekind = c'u'
     cdef bint fixnull = 0
+    cdef Py_ssize_t i
 
     try:
         cuda_array_interface = obj.__cuda_array_interface__
@@ -129,14 +135,23 @@ cdef int Py_GetCAIBuffer(object obj, Py_buffer *view, int flags) except -1:
             f"buffer with negative size "
             f"(shape:{shape}, size:{size})"
         )
+    if layout != NULL:
+        layout.ndim = 0
     if (strides is not None and
         not cuda_is_contig(shape, strides, itemsize, c'C') and
         not cuda_is_contig(shape, strides, itemsize, c'F')):
-        raise BufferError(
-            f"__cuda_array_interface__: "
-            f"buffer is not contiguous "
-            f"(shape:{shape}, strides:{strides}, itemsize:{itemsize})"
-        )
+        if layout == NULL:
+            raise BufferError(
+                f"__cuda_array_interface__: "
+                f"buffer is not contiguous "
+                f"(shape:{shape}, strides:{strides}, itemsize:{itemsize})"
+            )
+        if size > 0:
+            layout_set_ndim(layout, len(shape))
+            layout.itemsize = itemsize
+            for i in range(layout.ndim):
+                layout.shape[i] = shape[i]
+                layout.strides[i] = strides[i]
     if descr is not None and (len(descr) != 1 or descr[0] != ('', typestr)):
         PyErr_WarnFormat(
             RuntimeWarning, 1,
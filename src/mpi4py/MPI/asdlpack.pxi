@@ -188,7 +188,12 @@ cdef int Py_CheckDLPackBuffer(object obj):
     try: return <bint>hasattr(obj, '__dlpack__')
     except: return 0
 
-cdef int Py_GetDLPackBuffer(object obj, Py_buffer *view, int flags) except -1:
+cdef int Py_GetDLPackBuffer(
+    object obj,
+    Py_buffer *view,
+    int flags,
+    PyMPI_Layout *layout,
+) except -1:
     cdef object dlpack
     cdef object dlpack_device
     cdef unsigned device_type
@@ -200,6 +205,8 @@ cdef int Py_GetDLPackBuffer(object obj, Py_buffer *view, int flags) except -1:
     cdef Py_ssize_t size
     cdef bint readonly
     cdef bint fixnull
+    cdef Py_ssize_t itemsize
+    cdef int i
 
     try:
         dlpack = obj.__dlpack__
@@ -221,7 +228,20 @@ cdef int Py_GetDLPackBuffer(object obj, Py_buffer *view, int flags) except -1:
 
     try:
         dlpack_check_shape(dltensor)
-        dlpack_check_contig(dltensor)
+        if layout == NULL:
+            dlpack_check_contig(dltensor)
+        elif dltensor.strides == NULL:
+            layout.ndim = 0
+        elif (dlpack_is_contig(dltensor, c'C') or
+              dlpack_is_contig(dltensor, c'F')):
+            layout.ndim = 0
+        else:
+            layout_set_ndim(layout, dltensor.ndim)
+            itemsize = (dltensor.dtype.bits * dltensor.dtype.lanes + 7) // 8
+            layout.itemsize = itemsize
+            for i in range(dltensor.ndim):
+                layout.shape[i] = <Py_ssize_t> dltensor.shape[i]
+                layout.strides[i] = <Py_ssize_t> dltensor.strides[i] * itemsize
 
         buf = dlpack_get_data(dltensor)
         size = dlpack_get_size(dltensor)
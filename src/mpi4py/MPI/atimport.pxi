@@ -10,6 +10,7 @@ cdef extern from * nogil:
     #include "pympivendor.h"
     #include "pympistatus.h"
     #include "pympicommctx.h"
+    #include "pympiopuser.h"
     """
 
 # -----------------------------------------------------------------------------
@@ -67,7 +68,13 @@ ctypedef struct Options:
     int thread_level
     int finalize
     int fast_reduce
+    int allreduce_algorithm
     int recv_mprobe
+    int irecv_mprobe
+    Py_ssize_t recv_pool
+    int lock_stats
+    int pickle_threads
+    Py_ssize_t bcast_chunk
     int errors
 
 cdef Options options
@@ -76,7 +83,13 @@ options.threads = 1
 options.thread_level = MPI_THREAD_MULTIPLE
 options.finalize = 1
 options.fast_reduce = 1
+options.allreduce_algorithm = 0
 options.recv_mprobe = 1
+options.irecv_mprobe = 0
+options.recv_pool = 0
+options.lock_stats = 0
+options.pickle_threads = 0
+options.bcast_chunk = 0
 options.errors = 1
 
 cdef object getOpt(object rc, const char name[], object value):
@@ -117,7 +130,13 @@ cdef int getOptions(Options* opts) except -1:
     opts.thread_level = MPI_THREAD_MULTIPLE
     opts.finalize = 1
     opts.fast_reduce = 1
+    opts.allreduce_algorithm = 0
     opts.recv_mprobe = USE_MATCHED_RECV
+    opts.irecv_mprobe = 0
+    opts.recv_pool = 0
+    opts.lock_stats = 0
+    opts.pickle_threads = 0
+    opts.bcast_chunk = 0
     opts.errors = 1
     try: from . import rc
     except: return 0
@@ -127,7 +146,14 @@ cdef int getOptions(Options* opts) except -1:
     cdef object thread_level = getOpt(rc, b"thread_level" , 'multiple'  )
     cdef object finalize     = getOpt(rc, b"finalize"     , None        )
     cdef object fast_reduce  = getOpt(rc, b"fast_reduce"  , True        )
+    cdef object allreduce_algorithm = getOpt(
+        rc, b"allreduce_algorithm", 'auto')
     cdef object recv_mprobe  = getOpt(rc, b"recv_mprobe"  , True        )
+    cdef object irecv_mprobe = getOpt(rc, b"irecv_mprobe" , False       )
+    cdef object recv_pool    = getOpt(rc, b"recv_pool"    , False       )
+    cdef object lock_stats   = getOpt(rc, b"lock_stats"   , False       )
+    cdef object pickle_threads = getOpt(rc, b"pickle_threads", 'auto'   )
+    cdef object bcast_chunk  = getOpt(rc, b"bcast_chunk"  , False       )
     cdef object errors       = getOpt(rc, b"errors"       , 'exception' )
     #
     if initialize in (True, 'yes'):
@@ -171,6 +197,15 @@ cdef int getOptions(Options* opts) except -1:
     else:
         warnOpt(b"fast_reduce", fast_reduce)
     #
+    if allreduce_algorithm == 'auto':
+        opts.allreduce_algorithm = 0
+    elif allreduce_algorithm == 'reduce_bcast':
+        opts.allreduce_algorithm = 1
+    elif allreduce_algorithm == 'recursive_doubling':
+        opts.allreduce_algorithm = 2
+    else:
+        warnOpt(b"allreduce_algorithm", allreduce_algorithm)
+    #
     if recv_mprobe in (True, 'yes'):
         opts.recv_mprobe = 1 and USE_MATCHED_RECV
     elif recv_mprobe in (False, 'no'):
@@ -178,6 +213,55 @@ cdef int getOptions(Options* opts) except -1:
     else:
         warnOpt(b"recv_mprobe", recv_mprobe)
     #
+    if irecv_mprobe in (True, 'yes'):
+        opts.irecv_mprobe = 1 and USE_MATCHED_RECV
+    elif irecv_mprobe in (False, 'no'):
+        opts.irecv_mprobe = 0
+    else:
+        warnOpt(b"irecv_mprobe", irecv_mprobe)
+    #
+    if recv_pool in (True, 'yes'):
+        opts.recv_pool = 1024**2 * 256
+    elif recv_pool in (False, 'no'):
+        opts.recv_pool = 0
+    else:
+        try:
+            opts.recv_pool = max(int(recv_pool), 0)
+        except (TypeError, ValueError):
+            warnOpt(b"recv_pool", recv_pool)
+    #
+    if lock_stats in (True, 'yes'):
+        opts.lock_stats = 1
+    elif lock_stats in (False, 'no'):
+        opts.lock_stats = 0
+    else:
+        warnOpt(b"lock_stats", lock_stats)
+    #
+    if pickle_threads == 'auto':
+        import sys
+        is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+        pickle_threads = not is_gil_enabled()
+    if pickle_threads is True or pickle_threads == 'yes':
+        from os import cpu_count
+        opts.pickle_threads = min(cpu_count() or 1, 8)
+    elif pickle_threads is False or pickle_threads == 'no':
+        opts.pickle_threads = 0
+    else:
+        try:
+            opts.pickle_threads = max(int(pickle_threads), 0)
+        except (TypeError, ValueError):
+            warnOpt(b"pickle_threads", pickle_threads)
+    #
+    if bcast_chunk is True or bcast_chunk == 'yes':
+        opts.bcast_chunk = 1024**2 * 4
+    elif bcast_chunk is False or bcast_chunk == 'no':
+        opts.bcast_chunk = 0
+    else:
+        try:
+            opts.bcast_chunk = max(int(bcast_chunk), 0)
+        except (TypeError, ValueError):
+            warnOpt(b"bcast_chunk", bcast_chunk)
+    #
     if errors == 'default':
         opts.errors = 0
     elif errors == 'exception':
@@ -341,6 +425,29 @@ def _set_abort_status(object status: Any) -> None:
     except:
         abort_status = 1 if status else 0
 
+def _set_rc_option(str name: str, object value: Any) -> Any:
+    "Helper for testing options read at runtime, return previous value"
+    from . import rc
+    cdef Options opts
+    cdef object previous = getattr(rc, name)
+    setattr(rc, name, value)
+    try:
+        getOptions(&opts)
+        if name == 'bcast_chunk':
+            options.bcast_chunk = opts.bcast_chunk
+        elif name == 'pickle_threads':
+            options.pickle_threads = opts.pickle_threads
+        elif name == 'irecv_mprobe':
+            options.irecv_mprobe = opts.irecv_mprobe
+        elif name == 'allreduce_algorithm':
+            options.allreduce_algorithm = opts.allreduce_algorithm
+        else:
+            raise ValueError(f"cannot set option {name!r} at runtime")
+    except:
+        setattr(rc, name, previous)
+        raise
+    return previous
+
 # -----------------------------------------------------------------------------
 
 # Vile hack for raising a exception and not contaminate the traceback
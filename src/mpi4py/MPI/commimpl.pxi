@@ -145,24 +145,93 @@ cdef inline dict commlock_table(MPI_Comm comm):
     return table
 
 
-cdef inline object PyMPI_Lock(MPI_Comm comm, object key):
-    cdef dict table
+# Communicator locks are looked up in the per-communicator table without
+# holding the global lock once both the table and the lock exist; dict
+# lookups are atomic, and tables are unregistered as their communicator
+# is freed. With rc.lock_stats, locks count their acquisitions and the
+# time spent waiting for them.
+
+@cython.final
+@cython.internal
+cdef class _p_lock:
+
     cdef object lock
+    cdef Py_ssize_t acquisitions
+    cdef Py_ssize_t contentions
+    cdef double wait_time
+
+    def __cinit__(self):
+        self.lock = Lock()
+        self.acquisitions = 0
+        self.contentions = 0
+        self.wait_time = 0.0
+
+    def acquire(self, bint blocking=True, double timeout=-1) -> bool:
+        cdef double t0 = 0.0
+        cdef bint acquired = self.lock.acquire(False)
+        if not acquired and blocking:
+            t0 = MPI_Wtime()
+            acquired = self.lock.acquire(True, timeout)
+            if acquired:
+                self.contentions += 1
+                self.wait_time += MPI_Wtime() - t0
+        if acquired:
+            self.acquisitions += 1
+        return acquired
+
+    def release(self) -> None:
+        self.lock.release()
+
+    def locked(self) -> bool:
+        return self.lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc) -> None:
+        self.lock.release()
+
+    cdef dict stats(self):
+        return {
+            'acquisitions': self.acquisitions,
+            'contentions': self.contentions,
+            'wait_time': self.wait_time,
+        }
+
+
+cdef inline object PyMPI_Lock(MPI_Comm comm, object key):
+    cdef object table = commlock_registry.get(<Py_uintptr_t>comm)
+    cdef object lock = None
+    if table is not None:
+        lock = (<dict>table).get(key)
+        if lock is not None:
+            return lock
     with commlock_lock:
         table = commlock_table(comm)
         try:
             lock = table[key]
         except KeyError:
-            lock = Lock()
+            lock = _p_lock() if options.lock_stats else Lock()
             table[key] = lock
         return lock
 
 
-cdef inline tuple PyMPI_Lock_table(MPI_Comm comm):
+cdef inline dict PyMPI_Lock_table(MPI_Comm comm):
     with commlock_lock:
         return commlock_table(comm)
 
 
+cdef inline dict PyMPI_Lock_stats(MPI_Comm comm):
+    cdef dict table
+    with commlock_lock:
+        table = commlock_table(comm)
+        return {
+            key: (<_p_lock>lock).stats()
+            for key, lock in table.items()
+            if type(lock) is _p_lock
+        }
+
+
 def _comm_lock(Comm comm: Comm, object key: Hashable = None) -> Lock:
     "Create/get communicator lock"
     return PyMPI_Lock(comm.ob_mpi, key)
@@ -171,6 +240,10 @@ def _comm_lock_table(Comm comm: Comm) -> dict[Hashable, Lock]:
     "Internal communicator lock table"
     return PyMPI_Lock_table(comm.ob_mpi)
 
+def _comm_lock_stats(Comm comm: Comm) -> dict[Hashable, dict[str, Any]]:
+    "Communicator lock contention statistics"
+    return PyMPI_Lock_stats(comm.ob_mpi)
+
 _lock_table = _comm_lock_table  # backward-compatibility
 
 # -----------------------------------------------------------------------------
@@ -115,6 +115,71 @@ cdef inline Datatype getdatatype(const char format[]):
     if format == BYTE_FMT: return __BYTE__
     return lookup_datatype(pystr(getformat(format)))
 
+cdef Py_ssize_t PyMPI_STRIDED_CACHE_SIZE = 64
+cdef dict strided_cache = {}
+
+cdef inline MPI_Count strided_entries(PyMPI_Layout *layout) noexcept nogil:
+    # slices along the first dimension if their stride is positive,
+    # otherwise the whole buffer is a single entry
+    return layout.shape[0] if layout.strides[0] > 0 else 1
+
+cdef Datatype strided_build(MPI_Datatype basetype, PyMPI_Layout *layout):
+    cdef MPI_Count lb = 0, extent = 0, nbytes = layout.itemsize
+    cdef MPI_Count count = 0, stride = 0
+    cdef MPI_Datatype dtype = MPI_DATATYPE_NULL
+    cdef MPI_Datatype ntype = MPI_DATATYPE_NULL
+    cdef Datatype datatype = <Datatype>New(Datatype)
+    cdef int i, start = 1 if strided_entries(layout) > 1 else 0
+    cdef bint dense = 1
+    CHKERR( MPI_Type_get_extent_c(basetype, &lb, &extent) )
+    if extent <= 0 or layout.itemsize % extent != 0: raise ValueError(
+        f"message: cannot handle strided buffer, "
+        f"itemsize {layout.itemsize} is not a multiple of "
+        f"datatype extent {extent} (lb:{lb}, ub:{lb+extent})")
+    CHKERR( MPI_Type_contiguous_c(layout.itemsize // extent, basetype, &dtype) )
+    try:
+        for i in range(layout.ndim - 1, start - 1, -1):
+            count = layout.shape[i]
+            stride = layout.strides[i]
+            if count == 1: continue
+            if dense and stride == nbytes:
+                CHKERR( MPI_Type_contiguous_c(count, dtype, &ntype) )
+            else:
+                CHKERR( MPI_Type_create_hvector_c(
+                    count, 1, stride, dtype, &ntype) )
+                dense = 0
+            CHKERR( MPI_Type_free(&dtype) )
+            dtype, ntype = ntype, MPI_DATATYPE_NULL
+            nbytes *= count
+        extent = layout.strides[0] if start else nbytes
+        CHKERR( MPI_Type_create_resized_c(
+            dtype, 0, extent, &datatype.ob_mpi) )
+    finally:
+        CHKERR( MPI_Type_free(&dtype) )
+    marktemp(datatype)
+    CHKERR( MPI_Type_commit(&datatype.ob_mpi) )
+    return datatype
+
+cdef Datatype strided_datatype(Datatype basetype, PyMPI_Layout *layout):
+    cdef object key = None
+    cdef Datatype datatype
+    cdef int start = 1 if strided_entries(layout) > 1 else 0
+    if named_Datatype(basetype.ob_mpi):
+        key = (
+            <Py_uintptr_t> basetype.ob_mpi, layout.itemsize,
+            tuple([layout.shape[i] for i in range(start, layout.ndim)]),
+            tuple([layout.strides[i] for i in range(layout.ndim)]),
+        )
+        datatype = strided_cache.get(key)
+        if datatype is not None:
+            return datatype
+    datatype = strided_build(basetype.ob_mpi, layout)
+    if key is not None:
+        while len(strided_cache) >= PyMPI_STRIDED_CACHE_SIZE:
+            del strided_cache[next(iter(strided_cache))]
+        strided_cache[key] = datatype
+    return datatype
+
 @cython.final
 @cython.internal
 cdef class _p_message:
@@ -122,6 +187,7 @@ cdef class _p_message:
     cdef object count
     cdef object displ
     cdef Datatype type
+    cdef int strided  # 1: strided, 2: strided with multi-item entries
 
 cdef _p_message message_basic(object o_buf,
                               object o_type,
@@ -143,7 +209,11 @@ cdef _p_message message_basic(object o_buf,
         return m
     # get message buffer
     cdef bint fmt = (o_type is None)
-    m.buf = getbuffer(o_buf, readonly, fmt)
+    cdef PyMPI_Layout layout
+    cdef MPI_Count lb = 0, extent = 0
+    cdef int i
+    layout.ndim = 0
+    m.buf = getbuffer_strided(o_buf, readonly, fmt, &layout)
     # get message datatype
     if o_type is not None:
         m.type = asdatatype(o_type)
@@ -153,8 +223,44 @@ cdef _p_message message_basic(object o_buf,
     baddr[0] = <void*> m.buf.view.buf
     bsize[0] = <MPI_Aint> m.buf.view.len
     btype[0] = m.type.ob_mpi
+    # non-contiguous buffer, entries are slices along first dimension
+    cdef MPI_Count items = 1
+    if (layout.ndim > 0 and
+        not layout_is_contig(&layout, c'C') and
+        not layout_is_contig(&layout, c'F')):
+        CHKERR( MPI_Type_get_extent_c(m.type.ob_mpi, &lb, &extent) )
+        if extent > 0: items = layout.itemsize // extent
+        for i in range(1 if strided_entries(&layout) > 1 else 0, layout.ndim):
+            items *= layout.shape[i]
+        m.strided = 2 if items > 1 else 1
+        m.type = strided_datatype(m.type, &layout)
+        CHKERR( MPI_Type_get_extent_c(m.type.ob_mpi, &lb, &extent) )
+        bsize[0] = strided_entries(&layout) * extent
+        btype[0] = m.type.ob_mpi
     return m
 
+cdef inline int message_check_strided(
+    _p_message m, object o_count, object o_displ,
+) except -1:
+    # entries of strided buffers spanning many datatype items would
+    # make explicit counts and displacements count whole slices
+    if m.strided < 2: return 0
+    if o_count is None and o_displ is None: return 0
+    raise ValueError(
+        "message: cannot handle explicit count or displacement, "
+        "entries of non-contiguous buffer span multiple datatype items")
+
+cdef inline int message_check_bounds(
+    _p_message m, MPI_Count count, MPI_Aint displ, MPI_Count entries,
+) except -1:
+    # datatype entries past the end of strided buffers
+    # would read or write memory outside the buffer
+    if not m.strided: return 0
+    if displ + count <= entries: return 0
+    raise ValueError(
+        f"message: count {count} and displacement {displ} out of bounds, "
+        f"number of datatype entries {entries}")
+
 cdef _p_message message_simple(object msg,
                                int readonly,
                                int rank,
@@ -206,6 +312,7 @@ cdef _p_message message_simple(object msg,
     cdef MPI_Datatype btype = MPI_DATATYPE_NULL
     cdef _p_message m = message_basic(o_buf, o_type, readonly,
                                       &baddr, &bsize, &btype)
+    message_check_strided(m, o_count, o_displ)
     # buffer: count and displacement
     cdef MPI_Count count = 0 # number of datatype entries
     cdef MPI_Aint  displ = 0 # from base buffer, in datatype entries
@@ -254,6 +361,10 @@ cdef _p_message message_simple(object msg,
                 f"number of entries {length//extent} is not a multiple of "
                 f"required number of blocks {blocks}")
             count = (length // extent) // blocks
+    if m.strided:
+        if extent == 0:
+            CHKERR( MPI_Type_get_extent_c(btype, &lb, &extent) )
+        message_check_bounds(m, count, displ, bsize // extent)
     # return collected message data
     m.count = o_count if o_count is not None else count
     m.displ = o_displ if o_displ is not None else displ
@@ -315,6 +426,7 @@ cdef _p_message message_vector(object msg,
     cdef MPI_Datatype btype = MPI_DATATYPE_NULL
     cdef _p_message m = message_basic(o_buf, o_type, readonly,
                                       &baddr, &bsize, &btype)
+    message_check_strided(m, o_counts, o_displs)
     # counts and displacements
     cdef MPI_Count *counts = NULL
     cdef MPI_Aint  *displs = NULL
@@ -359,6 +471,11 @@ cdef _p_message message_vector(object msg,
             displs[i] = avalue * i
     else: # general
         o_displs = chkarray(o_displs, blocks, &displs)
+    if m.strided:
+        if extent == 0:
+            CHKERR( MPI_Type_get_extent_c(btype, &lb, &extent) )
+        for i in range(blocks):
+            message_check_bounds(m, counts[i], displs[i], bsize // extent)
     # return collected message data
     m.count = o_counts
     m.displ = o_displs
@@ -126,6 +126,263 @@ pickle = PyMPI_PICKLE
 
 # -----------------------------------------------------------------------------
 
+cdef Py_ssize_t PyMPI_POOL_CAPACITY = 1024**2 * 256 # 256 MiB
+cdef Py_ssize_t PyMPI_POOL_THRESHOLD = 1024**2 // 4 # 0.25 MiB
+
+cdef class BufferPool:
+
+    """
+    Pool of reusable buffers to receive pickled objects
+    """
+
+    cdef Py_ssize_t ob_capacity
+    cdef Py_ssize_t ob_threshold
+    cdef Py_ssize_t ob_nbytes
+    cdef dict ob_blocks
+    cdef dict ob_lru
+    cdef Py_ssize_t ob_hits
+    cdef Py_ssize_t ob_misses
+    cdef Py_ssize_t ob_evictions
+
+    def __cinit__(self, *args, **kwargs):
+        <void> args   # unused
+        <void> kwargs # unused
+        self.ob_capacity = PyMPI_POOL_CAPACITY
+        self.ob_threshold = PyMPI_POOL_THRESHOLD
+        self.ob_nbytes = 0
+        self.ob_blocks = {}
+        self.ob_lru = {}
+        self.ob_hits = 0
+        self.ob_misses = 0
+        self.ob_evictions = 0
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        threshold: int | None = None,
+    ) -> None:
+        if capacity is None:
+            capacity = PyMPI_POOL_CAPACITY
+        if threshold is None:
+            threshold = PyMPI_POOL_THRESHOLD
+        self.capacity = capacity
+        self.threshold = threshold
+
+    def attach(self, Comm comm: Comm | None = None) -> None:
+        """
+        Use the pool to receive objects on a communicator
+        """
+        recvpool_set(comm, self)
+
+    def detach(self, Comm comm: Comm | None = None) -> None:
+        """
+        Stop using the pool to receive objects on a communicator
+        """
+        if recvpool_get(comm) is self:
+            recvpool_set(comm, None)
+
+    @staticmethod
+    def lookup(Comm comm: Comm | None = None) -> BufferPool | None:
+        """
+        Pool used to receive objects on a communicator
+        """
+        cdef BufferPool pool = recvpool_get(comm)
+        if pool is None and comm is not None:
+            pool = recvpool_default
+        return pool
+
+    def clear(self) -> None:
+        """
+        Release all cached buffers
+        """
+        self.evict(0)
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Usage statistics
+        """
+        cdef Py_ssize_t requests = self.ob_hits + self.ob_misses
+        return {
+            'hits': self.ob_hits,
+            'misses': self.ob_misses,
+            'evictions': self.ob_evictions,
+            'hit_rate': <double> self.ob_hits / requests if requests else 0.0,
+            'buffers': len(self.ob_lru),
+            'nbytes': self.ob_nbytes,
+            'capacity': self.ob_capacity,
+            'threshold': self.ob_threshold,
+        }
+
+    property capacity:
+        """maximum size in bytes of cached buffers"""
+        def __get__(self) -> int:
+            return self.ob_capacity
+        def __set__(self, Py_ssize_t capacity: int):
+            if capacity < 0:
+                raise ValueError("capacity must be non-negative")
+            self.ob_capacity = capacity
+            self.evict(capacity)
+
+    property threshold:
+        """minimum size in bytes of pooled buffers"""
+        def __get__(self) -> int:
+            return self.ob_threshold
+        def __set__(self, Py_ssize_t threshold: int):
+            if threshold < 0:
+                raise ValueError("threshold must be non-negative")
+            self.ob_threshold = threshold
+
+    property nbytes:
+        """size in bytes of cached buffers"""
+        def __get__(self) -> int:
+            return self.ob_nbytes
+
+    # The methods below do not release the GIL nor run Python code,
+    # thus they are atomic with respect to other Python threads.
+
+    cdef object acquire(self, void **p, Py_ssize_t n):
+        cdef Py_ssize_t size = recvpool_size(n)
+        cdef list blocks = self.ob_blocks.get(size)
+        cdef _p_pool_block block
+        if blocks:
+            block = <_p_pool_block> blocks.pop()
+            del self.ob_lru[block]
+            self.ob_nbytes -= size
+            self.ob_hits += 1
+        else:
+            block = _p_pool_block.__new__(_p_pool_block)
+            block.mem = allocate(size, 1, NULL)
+            block.size = size
+            self.ob_misses += 1
+        block.pool = self
+        p[0] = block.mem.buf
+        return block
+
+    cdef int release(self, _p_pool_block block) except -1:
+        block.pool = None
+        if block.size > self.ob_capacity: return 0
+        cdef list blocks = self.ob_blocks.get(block.size)
+        if blocks is None:
+            blocks = self.ob_blocks[block.size] = []
+        blocks.append(block)
+        self.ob_lru[block] = None
+        self.ob_nbytes += block.size
+        self.evict(self.ob_capacity)
+        return 0
+
+    cdef int evict(self, Py_ssize_t limit) except -1:
+        cdef _p_pool_block block
+        while self.ob_nbytes > limit:
+            block = <_p_pool_block> next(iter(self.ob_lru))
+            del self.ob_lru[block]
+            (<list> self.ob_blocks[block.size]).remove(block)
+            self.ob_nbytes -= block.size
+            self.ob_evictions += 1
+        return 0
+
+
+@cython.final
+@cython.internal
+cdef class _p_pool_block:
+
+    cdef BufferPool pool
+    cdef _PyMem mem
+    cdef Py_ssize_t size
+
+
+cdef inline Py_ssize_t recvpool_size(Py_ssize_t n) noexcept nogil:
+    # four size classes per power of two, at most 25% overhead
+    cdef Py_ssize_t p = 8
+    while p < n: p <<= 1
+    cdef Py_ssize_t q = p >> 3
+    return ((n + q - 1) // q) * q
+
+
+cdef BufferPool recvpool_default = None
+cdef int recvpool_active = 0
+
+if options.recv_pool > 0:
+    recvpool_default = BufferPool(options.recv_pool)
+    recvpool_active = 1
+
+
+# Pools attached to communicators are kept in a registry indexed by
+# communicator handle, looked up without locking as dict lookups are
+# atomic. A communicator attribute removes the registry entry as the
+# communicator is freed.
+
+cdef int    recvpool_keyval   = MPI_KEYVAL_INVALID
+cdef object recvpool_lock     = Lock()
+cdef dict   recvpool_registry = {}
+
+
+cdef inline int recvpool_free_cb(
+    MPI_Comm comm,
+) except MPI_ERR_UNKNOWN with gil:
+    recvpool_registry.pop(<Py_uintptr_t>comm, None)
+    return MPI_SUCCESS
+
+
+@cython.callspec("MPIAPI")
+cdef int recvpool_free_fn(
+    MPI_Comm comm,
+    int keyval,
+    void *attrval,
+    void *xstate,
+) noexcept nogil:
+    <void> keyval  # unused
+    <void> attrval # unused
+    <void> xstate  # unused
+    if comm == MPI_COMM_SELF:
+        <void>MPI_Comm_free_keyval(&recvpool_keyval)
+    if not Py_IsInitialized():
+        return MPI_SUCCESS
+    if not py_module_alive():
+        return MPI_SUCCESS
+    return recvpool_free_cb(comm)
+
+
+cdef BufferPool recvpool_get(Comm comm):
+    if comm is None:
+        return recvpool_default
+    return recvpool_registry.get(<Py_uintptr_t>comm.ob_mpi)
+
+
+cdef int recvpool_set(Comm comm, BufferPool pool) except -1:
+    global recvpool_default, recvpool_active
+    if comm is None:
+        recvpool_default = pool
+    else:
+        with recvpool_lock:
+            if recvpool_keyval == MPI_KEYVAL_INVALID:
+                CHKERR( MPI_Comm_create_keyval(
+                    MPI_COMM_NULL_COPY_FN,
+                    recvpool_free_fn,
+                    &recvpool_keyval, NULL) )
+                CHKERR( MPI_Comm_set_attr(
+                    MPI_COMM_SELF, recvpool_keyval, NULL) )
+            if pool is None:
+                recvpool_registry.pop(<Py_uintptr_t>comm.ob_mpi, None)
+            else:
+                CHKERR( MPI_Comm_set_attr(
+                    comm.ob_mpi, recvpool_keyval, NULL) )
+                recvpool_registry[<Py_uintptr_t>comm.ob_mpi] = pool
+    if pool is not None:
+        recvpool_active = 1
+    return 0
+
+
+cdef BufferPool recvpool_lookup(Pickle pkl, MPI_Comm comm):
+    if not recvpool_active: return None
+    # pooled buffers are reused once loaded, thus data must be copied
+    if pkl.ob_loads is not PyPickle_loads: return None
+    cdef BufferPool pool = recvpool_registry.get(<Py_uintptr_t>comm)
+    if pool is None:
+        pool = recvpool_default
+    return pool
+
+# -----------------------------------------------------------------------------
+
 cdef int have_pickle5 = -1
 cdef object PyPickle5_dumps = None
 cdef object PyPickle5_loads = None
@@ -206,43 +463,138 @@ cdef object pickle_load(Pickle pkl, void *p, MPI_Count n):
     return cloads(pkl, mpibuf(p, n))
 
 
-cdef object pickle_dumpv(Pickle pkl, object obj, void **p, int n, MPI_Count cnt[], MPI_Aint dsp[]):
+# With rc.pickle_threads, the items of vector collectives are pickled
+# and unpickled concurrently in a thread pool shared by all
+# communicators. Serializers holding the GIL gain nothing, but those
+# releasing it (or free-threaded builds) overlap the work of the items.
+
+cdef object pickle_executor = None
+cdef object pickle_executor_lock = Lock()
+
+
+cdef object pickle_pool():
+    global pickle_executor
+    if pickle_executor is None:
+        with pickle_executor_lock:
+            if pickle_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                pickle_executor = ThreadPoolExecutor(
+                    options.pickle_threads,
+                    thread_name_prefix='mpi4py-pickle',
+                )
+    return pickle_executor
+
+cdef list pickle_map(object fn, list items):
+    if options.pickle_threads < 2 or len(items) < 2:
+        return [fn(item) for item in items]
+    return list(pickle_pool().map(fn, items))
+
+
+cdef list pickle_items(object obj, int n):
     cdef Py_ssize_t m=n
-    cdef object items
+    cdef list items
     if obj is None: items = [None] * m
     else:           items = list(obj)
     m = len(items)
     if m != n: raise ValueError(
         f"expecting {n} items, got {m}")
+    return items
+
+cdef object pickle_dumpv(Pickle pkl, object obj, void **p, int n, MPI_Count cnt[], MPI_Aint dsp[]):
+    cdef Py_ssize_t m=n
+    cdef list items = pickle_items(obj, n)
     cdef MPI_Count c=0
     cdef MPI_Aint  d=0
+    items = pickle_map(lambda item: cdumps(pkl, item), items)
     for i in range(m):
-        items[i] = pickle_dump(pkl, items[i], p, &c)
+        c = PyBytes_Size(items[i])
         cnt[i] = c; dsp[i] = d; d = d + <MPI_Aint>c
     cdef object buf = PyBytes_Join(b'', items)
     p[0] = PyBytes_AsString(buf)
     return buf
 
-cdef object pickle_loadv(Pickle pkl, void *p, int n, MPI_Count cnt[], MPI_Aint dsp[]):
+cdef object pickle_dumpw(Pickle pkl, object obj, void **p, int n, MPI_Count cnt[], MPI_Aint dsp[], MPI_Datatype typ[], MPI_Count lng[]):
     cdef Py_ssize_t m=n
-    cdef object items = [None] * m
-    if p == NULL: return items
+    cdef list items = pickle_items(obj, n)
+    cdef list oob = [None] * m
+    cdef object data, buffers
+    items = pickle_map(lambda item: cdumps_oob(pkl, item), items)
     for i in range(m):
-        items[i] = pickle_load(pkl, <char*>p + dsp[i], cnt[i])
-    return items
+        data, buffers = items[i]
+        if buffers: oob[i] = (data, buffers); data = b''
+        items[i] = data
+    cdef object buf = PyBytes_Join(b'', items)
+    p[0] = PyBytes_AsString(buf)
+    cdef MPI_Aint base = 0
+    CHKERR( MPI_Get_address(p[0], &base) )
+    cdef MPI_Count c=0
+    cdef MPI_Aint  d=0
+    for i in range(m):
+        typ[i] = MPI_BYTE
+        if oob[i] is None:
+            c = PyBytes_Size(items[i])
+            cnt[i] = lng[i] = c; dsp[i] = d; d = d + <MPI_Aint>c
+        else:
+            data, buffers = oob[i]
+            oob[i] = pickle_oob_type(data, buffers, base, &typ[i], &lng[i])
+            cnt[i] = 1; dsp[i] = 0
+    return (buf, oob)
+
+cdef object pickle_loadv(Pickle pkl, object ob, void *p, int n, MPI_Count cnt[], MPI_Aint dsp[]):
+    cdef Py_ssize_t m=n
+    if p == NULL: return [None] * m
+    cdef unsigned char *flags = NULL
+    if type(ob) is _PyMem: flags = <unsigned char*>(<_PyMem>ob).buf
+    def load(Py_ssize_t i):
+        if flags != NULL and flags[i]:
+            return pickle_load_oob(pkl, ob, <char*>p + dsp[i], cnt[i])
+        else:
+            return pickle_load(pkl, <char*>p + dsp[i], cnt[i])
+    return pickle_map(load, list(range(m)))
 
 
 cdef object pickle_alloc(void **p, MPI_Count n):
+    if n < 0: return allocate(<Py_ssize_t>(-n), 1, p)
     cdef object buf = PyBytes_FromStringAndSize(NULL, <MPI_Aint>n)
     p[0] = PyBytes_AsString(buf)
     return buf
 
-cdef object pickle_allocv(void **p, int n, MPI_Count cnt[], MPI_Aint dsp[]):
+cdef object pickle_alloc_pool(BufferPool pool, void **p, MPI_Count n):
+    if pool is None or n < pool.ob_threshold: return pickle_alloc(p, n)
+    return pool.acquire(p, <Py_ssize_t>n)
+
+cdef int pickle_free(object buf) except -1:
+    cdef _p_pool_block block
+    if type(buf) is _p_pool_block:
+        block = <_p_pool_block> buf
+        block.pool.release(block)
+    return 0
+
+cdef object pickle_allocv(void **p, int n, MPI_Count cnt[], MPI_Aint dsp[],
+                          BufferPool pool=None):
     cdef MPI_Count d=0
+    cdef bint oob=0
+    for i in range(n):
+        if cnt[i] < 0: oob = 1
+    if not oob:
+        for i in range(n):
+            dsp[i] = <MPI_Aint> d
+            d += cnt[i]
+        return pickle_alloc_pool(pool, p, d)
+    cdef unsigned char *flags = NULL
+    cdef MPI_Count h = pickle_oob_align(n)
+    for i in range(n):
+        if cnt[i] < 0: d = pickle_oob_align(d) - cnt[i]
+        else:          d = d + cnt[i]
+    cdef object buf = pickle_alloc(<void**>&flags, -(h + d))
+    d = 0
     for i in range(n):
+        flags[i] = cnt[i] < 0
+        if flags[i]: d = pickle_oob_align(d); cnt[i] = -cnt[i]
         dsp[i] = <MPI_Aint> d
         d += cnt[i]
-    return pickle_alloc(p, d)
+    p[0] = flags + h
+    return buf
 
 
 cdef inline object allocate_count_displ(int n, MPI_Count **p, MPI_Aint **q):
@@ -252,6 +604,155 @@ cdef inline object allocate_count_displ(int n, MPI_Count **p, MPI_Aint **q):
 
 # -----------------------------------------------------------------------------
 
+# Out-of-band pickle messages are announced with a negative byte count.
+# The message layout is a header with the number of buffers and their
+# lengths, followed by the buffers and the pickle data stream. Every
+# part but the last starts at a PyMPI_OOB_ALIGN boundary. Senders
+# describe the message with a derived datatype relative to MPI_BOTTOM,
+# thus buffers are never copied into the pickle data stream.
+
+cdef enum:
+    PyMPI_OOB_ALIGN = 16
+
+cdef char pickle_oob_padding[<int>PyMPI_OOB_ALIGN]
+
+cdef inline MPI_Count pickle_oob_align(MPI_Count n) noexcept nogil:
+    return (n + (PyMPI_OOB_ALIGN - 1)) & ~(<MPI_Count>PyMPI_OOB_ALIGN - 1)
+
+cdef inline bint pickle_oob(Pickle pkl) except -1:
+    if pkl.ob_dumps is not PyPickle_dumps: return 0
+    if pkl.ob_loads is not PyPickle_loads: return 0
+    if pkl.ob_PROTO is not None and pkl.ob_PROTO < 5: return 0
+    if PY_VERSION_HEX < 0x03080000: return import_pickle5()
+    return 1
+
+cdef inline MPI_Count pickle_oob_block(
+    void *buf, MPI_Count length, MPI_Count offset, bint pad,
+    MPI_Aint base, MPI_Count *k, MPI_Count blens[], MPI_Count bdisp[],
+) except -1:
+    cdef MPI_Aint address = 0
+    if length > 0:
+        CHKERR( MPI_Get_address(buf, &address) )
+        blens[k[0]] = length
+        bdisp[k[0]] = <MPI_Count>(address - base)
+        k[0] += 1
+    offset += length
+    if pad and pickle_oob_align(offset) > offset:
+        CHKERR( MPI_Get_address(pickle_oob_padding, &address) )
+        blens[k[0]] = pickle_oob_align(offset) - offset
+        bdisp[k[0]] = <MPI_Count>(address - base)
+        k[0] += 1
+        offset = pickle_oob_align(offset)
+    return offset
+
+cdef object pickle_oob_type(
+    object data, list buffers, MPI_Aint base,
+    MPI_Datatype *t, MPI_Count *m,
+):
+    cdef Py_ssize_t nbufs = len(buffers)
+    cdef MPI_Count *header = NULL
+    cdef MPI_Count *blens = NULL, *bdisp = NULL
+    cdef object tmp1 = allocate(nbufs + 1, sizeof(MPI_Count), &header)
+    cdef object tmp2 = allocate(2*(2*nbufs+3), sizeof(MPI_Count), &blens)
+    bdisp = blens + (2*nbufs+3)
+    cdef MPI_Count k = 0, offset = 0
+    cdef memory buf
+    header[0] = nbufs
+    for i in range(nbufs):
+        buf = <memory> buffers[i]
+        header[i+1] = buf.view.len
+    offset = pickle_oob_block(
+        header, (nbufs + 1) * <MPI_Count>sizeof(MPI_Count),
+        offset, 1, base, &k, blens, bdisp)
+    for i in range(nbufs):
+        buf = <memory> buffers[i]
+        offset = pickle_oob_block(
+            buf.view.buf, buf.view.len,
+            offset, 1, base, &k, blens, bdisp)
+    offset = pickle_oob_block(
+        PyBytes_AsString(data), PyBytes_Size(data),
+        offset, 0, base, &k, blens, bdisp)
+    cdef Datatype datatype = <Datatype>New(Datatype)
+    CHKERR( MPI_Type_create_hindexed_c(
+        k, blens, bdisp, MPI_BYTE, &datatype.ob_mpi) )
+    marktemp(datatype)
+    CHKERR( MPI_Type_commit(&datatype.ob_mpi) )
+    t[0] = datatype.ob_mpi
+    m[0] = -offset
+    return (data, buffers, tmp1, datatype)
+
+cdef object pickle_dump_oob(
+    Pickle pkl, object obj,
+    void **p, MPI_Count *n, MPI_Datatype *t,
+    MPI_Count *m,
+):
+    t[0] = MPI_BYTE
+    if not pickle_oob(pkl):
+        obj = pickle_dump(pkl, obj, p, n)
+        m[0] = n[0]
+        return obj
+    cdef object data, buffers
+    data, buffers = cdumps_oob(pkl, obj)
+    if not buffers:
+        p[0] = PyBytes_AsString(data)
+        n[0] = m[0] = PyBytes_Size(data)
+        return data
+    p[0] = MPI_BOTTOM
+    n[0] = 1
+    return pickle_oob_type(data, buffers, 0, t, m)
+
+cdef object pickle_load_oob(Pickle pkl, object ob, void *p, MPI_Count n):
+    cdef MPI_Count *header = <MPI_Count*> p
+    cdef MPI_Count nbufs = header[0], length = 0
+    cdef MPI_Count offset = pickle_oob_align(
+        (nbufs + 1) * <MPI_Count>sizeof(MPI_Count))
+    cdef list buffers = []
+    for i in range(nbufs):
+        length = header[i+1]
+        buffers.append(tobuffer(
+            ob, <char*>p + offset, <MPI_Aint>length, 0))
+        offset = pickle_oob_align(offset + length)
+    cdef object data = tobuffer(
+        ob, <char*>p + offset, <MPI_Aint>(n - offset), 1)
+    return cloads_oob(pkl, data, buffers)
+
+cdef object pickle_copy_oob(
+    Pickle pkl,
+    void *p, MPI_Count n, MPI_Datatype t,
+    MPI_Count m,
+):
+    cdef void *buf = NULL
+    cdef object tmp = pickle_alloc(&buf, m)
+    with nogil: CHKERR( MPI_Sendrecv_c(
+        p,   n,  t,        0, 0,
+        buf, -m, MPI_BYTE, 0, 0,
+        MPI_COMM_SELF, MPI_STATUS_IGNORE) )
+    return pickle_load_oob(pkl, tmp, buf, -m)
+
+cdef object pickle_pipe_dump(
+    Pickle pkl, object future,
+    void **p, MPI_Count *n, MPI_Datatype *t,
+):
+    cdef object data, buffers
+    cdef MPI_Count m = 0
+    t[0] = MPI_BYTE
+    if not pickle_oob(pkl):
+        data = future.result()
+        p[0] = PyBytes_AsString(data)
+        n[0] = PyBytes_Size(data)
+        return data
+    data, buffers = future.result()
+    p[0] = MPI_BOTTOM
+    n[0] = 1
+    return pickle_oob_type(data, buffers, 0, t, &m)
+
+cdef object pickle_pipe_load(Pickle pkl, object ob):
+    if type(ob) is _PyMem:
+        return pickle_load_oob(pkl, ob, (<_PyMem>ob).buf, (<_PyMem>ob).len)
+    return pickle_load(pkl, PyBytes_AsString(ob), PyBytes_Size(ob))
+
+# -----------------------------------------------------------------------------
+
 cdef object PyMPI_send(object obj, int dest, int tag,
                        MPI_Comm comm):
     cdef Pickle pickle = PyMPI_PICKLE
@@ -263,6 +764,16 @@ cdef object PyMPI_send(object obj, int dest, int tag,
     cdef object tmps = None
     if dest != MPI_PROC_NULL:
         tmps = pickle_dump(pickle, obj, &sbuf, &scount)
+    cdef Request request
+    if dest != MPI_PROC_NULL and irecv_lookup(comm) is not None:
+        request = <Request>New(Request)
+        with nogil: CHKERR( MPI_Isend_c(
+            sbuf, scount, stype,
+            dest, tag, comm, &request.ob_mpi) )
+        PyMPI_irecv_wait((request,), 0)
+        with nogil: CHKERR( MPI_Wait(
+            &request.ob_mpi, MPI_STATUS_IGNORE) )
+        return None
     with nogil: CHKERR( MPI_Send_c(
         sbuf, scount, stype,
         dest, tag, comm) )
@@ -297,6 +808,16 @@ cdef object PyMPI_ssend(object obj, int dest, int tag,
     cdef object tmps = None
     if dest != MPI_PROC_NULL:
         tmps = pickle_dump(pickle, obj, &sbuf, &scount)
+    cdef Request request
+    if dest != MPI_PROC_NULL and irecv_lookup(comm) is not None:
+        request = <Request>New(Request)
+        with nogil: CHKERR( MPI_Issend_c(
+            sbuf, scount, stype,
+            dest, tag, comm, &request.ob_mpi) )
+        PyMPI_irecv_wait((request,), 0)
+        with nogil: CHKERR( MPI_Wait(
+            &request.ob_mpi, MPI_STATUS_IGNORE) )
+        return None
     with nogil: CHKERR( MPI_Ssend_c(
         sbuf, scount, stype,
             dest, tag, comm) )
@@ -330,12 +851,20 @@ cdef object PyMPI_recv_obarg(object obj, int source, int tag,
         if status == MPI_STATUS_IGNORE:
             status = &rsts
         <void> rmsg
-    with nogil:
-        CHKERR( MPI_Recv_c(
-            rbuf, rcount, rtype,
-            source, tag, comm, status) )
-        if source != MPI_PROC_NULL:
+    cdef MPI_Message match = MPI_MESSAGE_NULL
+    if source != MPI_PROC_NULL and irecv_lookup(comm) is not None:
+        irecv_mprobe(source, tag, comm, NULL, &match, status)
+        with nogil:
+            CHKERR( MPI_Mrecv_c(
+                rbuf, rcount, rtype, &match, status) )
             CHKERR( MPI_Get_count_c(status, rtype, &rcount) )
+    else:
+        with nogil:
+            CHKERR( MPI_Recv_c(
+                rbuf, rcount, rtype,
+                source, tag, comm, status) )
+            if source != MPI_PROC_NULL:
+                CHKERR( MPI_Get_count_c(status, rtype, &rcount) )
     #
     if rcount <= 0: return None
     return pickle_load(pickle, rbuf, rcount)
@@ -353,16 +882,18 @@ cdef object PyMPI_recv_match(object obj, int source, int tag,
     cdef MPI_Status rsts
     <void> obj # unused
     #
-    with nogil:
-        CHKERR( MPI_Mprobe(source, tag, comm, &match, &rsts) )
-        CHKERR( MPI_Get_count_c(&rsts, rtype, &rcount) )
-    cdef object tmpr = pickle_alloc(&rbuf, rcount)
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
+    irecv_mprobe(source, tag, comm, NULL, &match, &rsts)
+    CHKERR( MPI_Get_count_c(&rsts, rtype, &rcount) )
+    cdef object tmpr = pickle_alloc_pool(pool, &rbuf, rcount)
     with nogil:
         CHKERR( MPI_Mrecv_c(
             rbuf, rcount, rtype, &match, status) )
     #
     if rcount <= 0: return None
-    return pickle_load(pickle, rbuf, rcount)
+    obj = pickle_load(pickle, rbuf, rcount)
+    pickle_free(tmpr)
+    return obj
 
 
 cdef object PyMPI_recv_probe(object obj, int source, int tag,
@@ -377,27 +908,30 @@ cdef object PyMPI_recv_probe(object obj, int source, int tag,
     cdef object tmpr
     <void> obj # unused
     #
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
     with PyMPI_Lock(comm, "recv"):
         with nogil:
             CHKERR( MPI_Probe(source, tag, comm, &rsts) )
             CHKERR( MPI_Get_count_c(&rsts, rtype, &rcount) )
             CHKERR( PyMPI_Status_get_source(&rsts, &source) )
             CHKERR( PyMPI_Status_get_tag(&rsts, &tag) )
-        tmpr = pickle_alloc(&rbuf, rcount)
+        tmpr = pickle_alloc_pool(pool, &rbuf, rcount)
         with nogil:
             CHKERR( MPI_Recv_c(
                 rbuf, rcount, rtype,
                 source, tag, comm, status) )
     #
     if rcount <= 0: return None
-    return pickle_load(pickle, rbuf, rcount)
+    obj = pickle_load(pickle, rbuf, rcount)
+    pickle_free(tmpr)
+    return obj
 
 
 cdef object PyMPI_recv(object obj, int source, int tag,
                        MPI_Comm comm, MPI_Status *status):
     if obj is not None:
         return PyMPI_recv_obarg(obj, source, tag, comm, status)
-    elif options.recv_mprobe:
+    elif options.recv_mprobe or irecv_lookup(comm) is not None:
         return PyMPI_recv_match(obj, source, tag, comm, status)
     else:
         return PyMPI_recv_probe(obj, source, tag, comm, status)
@@ -456,7 +990,7 @@ cdef object PyMPI_issend(object obj, int dest, int tag,
 
 
 cdef object PyMPI_irecv(object obj, int source, int tag,
-                        MPI_Comm comm, MPI_Request *request):
+                        MPI_Comm comm, Request request):
     #
     cdef void *rbuf = NULL
     cdef MPI_Aint rlen = 0
@@ -465,7 +999,9 @@ cdef object PyMPI_irecv(object obj, int source, int tag,
     #
     cdef object rmsg = None
     if source != MPI_PROC_NULL:
-        if obj is None:
+        if obj is None and options.irecv_mprobe:
+            return PyMPI_irecv_match(source, tag, comm, request)
+        elif obj is None:
             rcount = <MPI_Count> (1<<15)
             obj = pickle_alloc(&rbuf, rcount)
             rmsg = asbuffer_r(obj, NULL, NULL)
@@ -478,9 +1014,468 @@ cdef object PyMPI_irecv(object obj, int source, int tag,
             rcount = <MPI_Count> rlen
     with nogil: CHKERR( MPI_Irecv_c(
         rbuf, rcount, rtype,
-        source, tag, comm, request) )
+        source, tag, comm, &request.ob_mpi) )
     return rmsg
 
+# Persistent sends pickle the object again at every start() into a
+# growable buffer, the persistent request is initialized again only
+# if the pickled data no longer fits the buffer or changes its size.
+
+@cython.final
+@cython.internal
+cdef class _p_psend:
+
+    cdef object obj
+    cdef int dest
+    cdef int tag
+    cdef MPI_Comm comm
+    cdef object buf
+    cdef void *sbuf
+    cdef MPI_Count capacity
+    cdef MPI_Count count
+
+    def __cinit__(self):
+        self.sbuf = NULL
+        self.capacity = 0
+        self.count = -1
+
+    cdef int dump(self, Prequest request) except -1:
+        cdef Pickle pickle = PyMPI_PICKLE
+        cdef void *p = NULL
+        cdef MPI_Count n = 0
+        cdef object data = None
+        if self.dest != MPI_PROC_NULL:
+            data = pickle_dump(pickle, self.obj, &p, &n)
+        if n > self.capacity:
+            self.capacity = max(n, 2 * self.capacity)
+            self.buf = allocate(<Py_ssize_t>self.capacity, 1, &self.sbuf)
+            self.count = -1
+        if n > 0:
+            <void>memcpy(self.sbuf, p, <size_t>n)
+        if n != self.count:
+            if request.ob_mpi != MPI_REQUEST_NULL:
+                CHKERR( MPI_Request_free(&request.ob_mpi) )
+            with nogil: CHKERR( MPI_Send_init_c(
+                self.sbuf, n, MPI_BYTE,
+                self.dest, self.tag, self.comm, &request.ob_mpi) )
+            self.count = n
+        return 0
+
+
+cdef object PyMPI_send_init(object obj, int dest, int tag,
+                            MPI_Comm comm, Prequest request):
+    cdef _p_psend state = _p_psend.__new__(_p_psend)
+    state.obj = obj
+    state.dest = dest
+    state.tag = tag
+    state.comm = comm
+    state.dump(request)
+    return state
+
+
+cdef object PyMPI_recv_init(object obj, int source, int tag,
+                            MPI_Comm comm, Prequest request):
+    #
+    cdef void *rbuf = NULL
+    cdef MPI_Aint rlen = 0
+    cdef MPI_Count rcount = 0
+    cdef MPI_Datatype rtype = MPI_BYTE
+    #
+    cdef object rmsg = None
+    if source != MPI_PROC_NULL:
+        if obj is None:
+            rcount = <MPI_Count> (1<<15)
+            obj = pickle_alloc(&rbuf, rcount)
+            rmsg = asbuffer_r(obj, NULL, NULL)
+        elif is_integral(obj):
+            rcount = <MPI_Count> obj
+            obj = pickle_alloc(&rbuf, rcount)
+            rmsg = asbuffer_r(obj, NULL, NULL)
+        else:
+            rmsg = asbuffer_w(obj, &rbuf, &rlen)
+            rcount = <MPI_Count> rlen
+    with nogil: CHKERR( MPI_Recv_init_c(
+        rbuf, rcount, rtype,
+        source, tag, comm, &request.ob_mpi) )
+    return rmsg
+
+
+cdef object PyMPI_start(Prequest request):
+    if type(request.ob_buf) is _p_psend:
+        (<_p_psend>request.ob_buf).dump(request)
+    with nogil: CHKERR( MPI_Start(&request.ob_mpi) )
+    return None
+
+
+cdef object PyMPI_startall(requests):
+    cdef object state
+    for request in requests:
+        state = (<Prequest?>request).ob_buf
+        if type(state) is _p_psend:
+            (<_p_psend>state).dump(<Prequest>request)
+    cdef int count = 0
+    cdef MPI_Request *irequests = NULL
+    cdef tmp = acquire_rs(requests, None, &count, &irequests, NULL)
+    try:
+        with nogil: CHKERR( MPI_Startall(count, irequests) )
+    finally:
+        release_rs(requests, None, count, irequests, 0, NULL)
+    return None
+
+# -----------------------------------------------------------------------------
+
+# If enabled with mpi4py.rc.irecv_mprobe, nonblocking receives posted
+# without a buffer are matched with MPI_Improbe() and received with
+# MPI_Imrecv() into a buffer sized from the incoming message. Until a
+# message is matched, the request handle is a generalized request
+# acting as a placeholder. Completion routines progress pending
+# receives in posting order, hand every matched message to the
+# earliest pending receive it is eligible for, and replace the
+# placeholder with the actual receive request. Blocking receives and
+# probes hand the messages eligible for pending receives to these
+# receives first, thus messages are received in order. Pending
+# receives are also registered per communicator; blocking sends and
+# barriers on a communicator with pending receives keep progressing
+# them while waiting, backing off with the GIL released. Barriers are
+# nonblocking on all processes if the option is enabled.
+
+cdef list irecv_pending = []
+cdef dict irecv_registry = {}
+
+cdef double irecv_backoff_min = 1e-6
+cdef double irecv_backoff_max = 1e-3
+
+from time import sleep as PyTime_sleep
+
+
+cdef inline list irecv_lookup(MPI_Comm comm):
+    # pending receives on a communicator in posting order
+    if not irecv_pending: return None
+    return irecv_registry.get(<Py_uintptr_t>comm)
+
+
+cdef int irecv_insert(_p_irecv state) except -1:
+    cdef Py_uintptr_t key = <Py_uintptr_t>state.comm
+    cdef list pending = irecv_registry.get(key)
+    if pending is None:
+        pending = irecv_registry[key] = []
+    pending.append(state)
+    irecv_pending.append(state)
+    return 0
+
+
+cdef int irecv_remove(_p_irecv state) except -1:
+    cdef Py_uintptr_t key = <Py_uintptr_t>state.comm
+    cdef list pending = irecv_registry[key]
+    pending.remove(state)
+    if not pending:
+        del irecv_registry[key]
+    irecv_pending.remove(state)
+    return 0
+
+
+@cython.final
+@cython.internal
+cdef class _p_irecv:
+
+    cdef Request     request
+    cdef MPI_Request greq
+    cdef MPI_Comm    comm
+    cdef int         source
+    cdef int         tag
+    cdef int         cancelled
+
+    def __cinit__(self):
+        self.request = None
+        self.greq = MPI_REQUEST_NULL
+        self.comm = MPI_COMM_NULL
+        self.source = MPI_ANY_SOURCE
+        self.tag = MPI_ANY_TAG
+        self.cancelled = 0
+
+    cdef bint accepts(self, MPI_Comm comm, MPI_Status *status) noexcept:
+        cdef int source = MPI_ANY_SOURCE, tag = MPI_ANY_TAG
+        <void>PyMPI_Status_get_source(status, &source)
+        <void>PyMPI_Status_get_tag(status, &tag)
+        return (
+            self.comm == comm and
+            (self.source == MPI_ANY_SOURCE or self.source == source) and
+            (self.tag == MPI_ANY_TAG or self.tag == tag)
+        )
+
+    cdef int match(self, MPI_Message *message, MPI_Status *status) except -1:
+        cdef void *rbuf = NULL
+        cdef MPI_Count rcount = 0
+        cdef MPI_Datatype rtype = MPI_BYTE
+        cdef Request request = self.request
+        irecv_remove(self)
+        self.request = None
+        CHKERR( MPI_Get_count_c(status, rtype, &rcount) )
+        cdef object rmsg = pickle_alloc(&rbuf, rcount)
+        if request.ob_mpi == self.greq:
+            with nogil: CHKERR( MPI_Imrecv_c(
+                rbuf, rcount, rtype, message, &request.ob_mpi) )
+            request.ob_buf = asbuffer_r(rmsg, NULL, NULL)
+            CHKERR( MPI_Grequest_complete(self.greq) )
+            CHKERR( MPI_Request_free(&self.greq) )
+        else: # the request was freed, discard the message
+            with nogil: CHKERR( MPI_Mrecv_c(
+                rbuf, rcount, rtype, message, MPI_STATUS_IGNORE) )
+            CHKERR( MPI_Grequest_complete(self.greq) )
+            self.greq = MPI_REQUEST_NULL
+        return 1
+
+    cdef int query(self, MPI_Status *status) except -1:
+        <void>PyMPI_Status_set_source(status, MPI_ANY_SOURCE)
+        <void>PyMPI_Status_set_tag(status, MPI_ANY_TAG)
+        <void>PyMPI_Status_set_error(status, MPI_SUCCESS)
+        <void>MPI_Status_set_elements_c(status, MPI_BYTE, 0)
+        <void>MPI_Status_set_cancelled(status, self.cancelled)
+        return MPI_SUCCESS
+
+    cdef int cancel(self) except -1:
+        if self.request is None: return MPI_SUCCESS
+        irecv_remove(self)
+        self.request = None
+        self.cancelled = 1
+        CHKERR( MPI_Grequest_complete(self.greq) )
+        return MPI_SUCCESS
+
+
+cdef int irecv_query(
+    void *extra_state,
+    MPI_Status *status,
+) except MPI_ERR_UNKNOWN with gil:
+    cdef _p_irecv state = <_p_irecv>extra_state
+    cdef int ierr = MPI_SUCCESS
+    cdef object exc
+    try:
+        state.query(status)
+    except MPIException as exc:
+        print_traceback()
+        ierr = exc.Get_error_code()
+    except:
+        print_traceback()
+        ierr = MPI_ERR_OTHER
+    return ierr
+
+
+cdef int irecv_free(
+    void *extra_state,
+) except MPI_ERR_UNKNOWN with gil:
+    Py_DECREF(<object>extra_state)
+    return MPI_SUCCESS
+
+
+cdef int irecv_cancel(
+    void *extra_state,
+    int completed,
+) except MPI_ERR_UNKNOWN with gil:
+    cdef _p_irecv state = <_p_irecv>extra_state
+    cdef int ierr = MPI_SUCCESS
+    cdef object exc
+    <void> completed # unused
+    try:
+        state.cancel()
+    except MPIException as exc:
+        print_traceback()
+        ierr = exc.Get_error_code()
+    except:
+        print_traceback()
+        ierr = MPI_ERR_OTHER
+    return ierr
+
+
+@cython.callspec("MPIAPI")
+cdef int irecv_query_fn(
+    void *extra_state,
+    MPI_Status *status,
+) noexcept nogil:
+    if extra_state == NULL:
+        return MPI_ERR_INTERN
+    if status == NULL:
+        return MPI_ERR_INTERN
+    if not Py_IsInitialized():
+        return MPI_ERR_INTERN
+    if not py_module_alive():
+        return MPI_ERR_INTERN
+    return irecv_query(extra_state, status)
+
+
+@cython.callspec("MPIAPI")
+cdef int irecv_free_fn(
+    void *extra_state,
+) noexcept nogil:
+    if extra_state == NULL:
+        return MPI_ERR_INTERN
+    if not Py_IsInitialized():
+        return MPI_ERR_INTERN
+    if not py_module_alive():
+        return MPI_ERR_INTERN
+    return irecv_free(extra_state)
+
+
+@cython.callspec("MPIAPI")
+cdef int irecv_cancel_fn(
+    void *extra_state,
+    int completed,
+) noexcept nogil:
+    if extra_state == NULL:
+        return MPI_ERR_INTERN
+    if not Py_IsInitialized():
+        return MPI_ERR_INTERN
+    if not py_module_alive():
+        return MPI_ERR_INTERN
+    return irecv_cancel(extra_state, completed)
+
+
+cdef int irecv_dispatch(MPI_Comm comm,
+                        MPI_Message *message,
+                        MPI_Status *status) except -1:
+    cdef _p_irecv state
+    cdef list pending = irecv_lookup(comm)
+    if pending is None: return 0
+    for state in pending:
+        if state.accepts(comm, status):
+            return state.match(message, status)
+    return 0
+
+
+cdef int irecv_poll(_p_irecv state) except -1:
+    cdef int flag = 0
+    cdef MPI_Message message = MPI_MESSAGE_NULL
+    cdef MPI_Status status
+    with nogil: CHKERR( MPI_Improbe(
+        state.source, state.tag, state.comm,
+        &flag, &message, &status) )
+    if flag:
+        irecv_dispatch(state.comm, &message, &status)
+    return flag
+
+
+cdef int irecv_probe(int source, int tag, MPI_Comm comm,
+                     int *flag, MPI_Status *status) except -1:
+    # probe (blocking if flag is NULL) for a message
+    # not eligible for any pending receive
+    cdef int msource = MPI_ANY_SOURCE, mtag = MPI_ANY_TAG
+    cdef MPI_Message message = MPI_MESSAGE_NULL
+    cdef MPI_Status rsts, msts
+    cdef _p_irecv state
+    cdef list pending
+    if status == MPI_STATUS_IGNORE: status = &rsts
+    while True:
+        if flag == NULL:
+            with nogil: CHKERR( MPI_Probe(
+                source, tag, comm, status) )
+        else:
+            with nogil: CHKERR( MPI_Iprobe(
+                source, tag, comm, flag, status) )
+            if not flag[0]: return 0
+        if source == MPI_PROC_NULL: return 0
+        pending = irecv_lookup(comm)
+        if pending is None: return 0
+        for state in pending:
+            if state.accepts(comm, status): break
+        else:
+            return 0
+        CHKERR( PyMPI_Status_get_source(status, &msource) )
+        CHKERR( PyMPI_Status_get_tag(status, &mtag) )
+        with nogil: CHKERR( MPI_Mprobe(
+            msource, mtag, comm, &message, &msts) )
+        irecv_dispatch(comm, &message, &msts)
+
+
+cdef int irecv_mprobe(int source, int tag, MPI_Comm comm, int *flag,
+                      MPI_Message *message, MPI_Status *status) except -1:
+    # matched probe (blocking if flag is NULL) for a message
+    # not eligible for any pending receive
+    while True:
+        if flag == NULL:
+            with nogil: CHKERR( MPI_Mprobe(
+                source, tag, comm, message, status) )
+        else:
+            with nogil: CHKERR( MPI_Improbe(
+                source, tag, comm, flag, message, status) )
+            if not flag[0]: return 0
+        if irecv_lookup(comm) is None: return 0
+        if message[0] == MPI_MESSAGE_NO_PROC: return 0
+        if not irecv_dispatch(comm, message, status): return 0
+
+
+cdef object PyMPI_irecv_match(int source, int tag,
+                              MPI_Comm comm, Request request):
+    cdef _p_irecv state = _p_irecv.__new__(_p_irecv)
+    state.request = request
+    state.comm = comm
+    state.source = source
+    state.tag = tag
+    with nogil: CHKERR( MPI_Grequest_start(
+        irecv_query_fn, irecv_free_fn, irecv_cancel_fn,
+        <void*>state, &state.greq) )
+    Py_INCREF(state)
+    request.ob_mpi = state.greq
+    request.ob_buf = state
+    irecv_insert(state)
+    irecv_poll(state)
+    return request.ob_buf
+
+
+cdef int PyMPI_irecv_progress() except -1:
+    cdef _p_irecv state
+    for state in list(irecv_pending):
+        if state.request is not None:
+            irecv_poll(state)
+    return 0
+
+
+cdef int PyMPI_irecv_wait(object requests, bint waitall) except -1:
+    # match the pending receives in the given requests with blocking
+    # matched probes (waitall), then progress other pending receives
+    # until a blocking wait on the given requests is known not to hang
+    cdef Request request
+    cdef _p_irecv state
+    cdef MPI_Request handle = MPI_REQUEST_NULL
+    cdef MPI_Message message = MPI_MESSAGE_NULL
+    cdef MPI_Status status
+    cdef int flag = 0, active = 0, ready = 0
+    cdef double delay = 0.0
+    if waitall:
+        for request in requests:
+            if type(request.ob_buf) is not _p_irecv: continue
+            state = <_p_irecv>request.ob_buf
+            while (state.request is request and
+                   request.ob_mpi == state.greq):
+                with nogil: CHKERR( MPI_Mprobe(
+                    state.source, state.tag, state.comm,
+                    &message, &status) )
+                irecv_dispatch(state.comm, &message, &status)
+    while irecv_pending:
+        PyMPI_irecv_progress()
+        active = ready = 0
+        for request in requests:
+            handle = request.ob_mpi
+            if handle == MPI_REQUEST_NULL: continue
+            with nogil: CHKERR( MPI_Request_get_status(
+                handle, &flag, MPI_STATUS_IGNORE) )
+            active += 1
+            ready += flag
+        if waitall and ready == active: break
+        if not waitall and (ready > 0 or active == 0): break
+        PyTime_sleep(delay)
+        delay = min(irecv_backoff_max, max(irecv_backoff_min, 2 * delay))
+    return 0
+
+
+cdef int PyMPI_irecv_barrier(MPI_Comm comm) except -1:
+    # barrier progressing the pending receives while waiting, all
+    # processes must use a nonblocking barrier for calls to match
+    cdef Request request = <Request>New(Request)
+    with nogil: CHKERR( MPI_Ibarrier(comm, &request.ob_mpi) )
+    if irecv_lookup(comm) is not None:
+        PyMPI_irecv_wait((request,), 0)
+    with nogil: CHKERR( MPI_Wait(&request.ob_mpi, MPI_STATUS_IGNORE) )
+    return 0
+
 # -----------------------------------------------------------------------------
 
 cdef object PyMPI_sendrecv(object sobj, int dest,   int sendtag,
@@ -498,6 +1493,7 @@ cdef object PyMPI_load(MPI_Status *status, object ob):
     cdef Pickle pickle = PyMPI_PICKLE
     cdef MPI_Count rcount = 0
     cdef MPI_Datatype rtype = MPI_BYTE
+    if type(ob) is _p_obj_cco: return (<_p_obj_cco>ob).load()
     if type(ob) is not memory: return None
     CHKERR( MPI_Get_count_c(status, rtype, &rcount) )
     if rcount <= 0: return None
@@ -509,6 +1505,8 @@ cdef object PyMPI_wait(Request request, Status status):
     cdef object buf
     #
     cdef MPI_Status rsts
+    if cco_pending: PyMPI_cco_wait((request,))
+    if irecv_pending: PyMPI_irecv_wait((request,), 1)
     with nogil: CHKERR( MPI_Wait(&request.ob_mpi, &rsts) )
     buf = request.ob_buf
     if status is not None:
@@ -523,6 +1521,10 @@ cdef object PyMPI_test(Request request, int *flag, Status status):
     cdef object buf = None
     #
     cdef MPI_Status rsts
+    if cco_pending and PyMPI_cco_test((request,)):
+        flag[0] = 0
+        return None
+    if irecv_pending: PyMPI_irecv_progress()
     with nogil: CHKERR( MPI_Test(&request.ob_mpi, flag, &rsts) )
     if flag[0]:
         buf = request.ob_buf
@@ -542,15 +1544,20 @@ cdef object PyMPI_waitany(requests, int *index, Status status):
     cdef MPI_Request *irequests = NULL
     cdef MPI_Status rsts
     #
-    cdef tmp = acquire_rs(requests, None, &count, &irequests, NULL)
-    try:
-        with nogil: CHKERR( MPI_Waitany(count, irequests, index, &rsts) )
-        if index[0] != MPI_UNDEFINED:
-            buf = (<Request>requests[index[0]]).ob_buf
-        if status is not None:
-            status.ob_mpi = rsts
-    finally:
-        release_rs(requests, None, count, irequests, 0, NULL)
+    cdef tmp = None
+    while True:
+        if irecv_pending: PyMPI_irecv_wait(requests, 0)
+        tmp = acquire_rs(requests, None, &count, &irequests, NULL)
+        try:
+            with nogil: CHKERR( MPI_Waitany(count, irequests, index, &rsts) )
+            if index[0] != MPI_UNDEFINED:
+                buf = (<Request>requests[index[0]]).ob_buf
+            if status is not None:
+                status.ob_mpi = rsts
+        finally:
+            release_rs(requests, None, count, irequests, 0, NULL)
+        if not cco_pending: break
+        if not PyMPI_cco_post(requests): break
     #
     if index[0] == MPI_UNDEFINED: return None
     return PyMPI_load(&rsts, buf)
@@ -563,15 +1570,19 @@ cdef object PyMPI_testany(requests, int *index, int *flag, Status status):
     cdef MPI_Request *irequests = NULL
     cdef MPI_Status rsts
     #
+    cdef int masked = 0
     cdef tmp = acquire_rs(requests, None, &count, &irequests, NULL)
     try:
+        if cco_pending: masked = PyMPI_cco_mask(requests, irequests)
         with nogil: CHKERR( MPI_Testany(count, irequests, index, flag, &rsts) )
         if index[0] != MPI_UNDEFINED:
             buf = (<Request>requests[index[0]]).ob_buf
         if status is not None:
             status.ob_mpi = rsts
     finally:
+        if masked: PyMPI_cco_unmask(requests, irequests)
         release_rs(requests, None, count, irequests, 0, NULL)
+    if masked and index[0] == MPI_UNDEFINED: flag[0] = 0
     #
     if index[0] == MPI_UNDEFINED: return None
     if not flag[0]: return None
@@ -584,6 +1595,8 @@ cdef object PyMPI_waitall(requests, statuses):
     cdef MPI_Request *irequests = NULL
     cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
     #
+    if cco_pending: PyMPI_cco_wait(requests)
+    if irecv_pending: PyMPI_irecv_wait(requests, 1)
     cdef tmp = acquire_rs(requests, True, &count, &irequests, &istatuses)
     try:
         with nogil: CHKERR( MPI_Waitall(count, irequests, istatuses) )
@@ -600,6 +1613,9 @@ cdef object PyMPI_testall(requests, int *flag, statuses):
     cdef MPI_Request *irequests = NULL
     cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
     #
+    if cco_pending and PyMPI_cco_test(requests):
+        flag[0] = 0
+        return None
     cdef tmp = acquire_rs(requests, True, &count, &irequests, &istatuses)
     try:
         with nogil: CHKERR( MPI_Testall(count, irequests, flag, istatuses) )
@@ -621,18 +1637,27 @@ cdef object PyMPI_waitsome(requests, statuses):
     cdef int outcount = MPI_UNDEFINED, *iindices = NULL
     cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
     #
-    cdef tmp1 = acquire_rs(requests, True, &incount, &irequests, &istatuses)
-    cdef tmp2 = newarray(incount, &iindices)
-    try:
-        with nogil: CHKERR( MPI_Waitsome(
-            incount, irequests, &outcount, iindices, istatuses) )
-        if outcount != MPI_UNDEFINED:
-            bufs = [
-                (<Request>requests[iindices[i]]).ob_buf
-                for i in range(outcount)
-            ]
-    finally:
-        release_rs(requests, statuses, incount, irequests, outcount, istatuses)
+    cdef int posted = 0
+    cdef tmp1 = None, tmp2 = None
+    while True:
+        posted = 0
+        if irecv_pending: PyMPI_irecv_wait(requests, 0)
+        tmp1 = acquire_rs(requests, True, &incount, &irequests, &istatuses)
+        tmp2 = newarray(incount, &iindices)
+        try:
+            with nogil: CHKERR( MPI_Waitsome(
+                incount, irequests, &outcount, iindices, istatuses) )
+            if cco_pending: posted = PyMPI_cco_filter(
+                requests, &outcount, iindices, istatuses)
+            if outcount != MPI_UNDEFINED:
+                bufs = [
+                    (<Request>requests[iindices[i]]).ob_buf
+                    for i in range(outcount)
+                ]
+        finally:
+            release_rs(requests, statuses, incount, irequests, outcount, istatuses)
+        if posted: PyMPI_cco_post(requests)
+        if not posted or outcount > 0: break
     #
     if outcount != MPI_UNDEFINED:
         indices = [iindices[i] for i in range(outcount)]
@@ -649,9 +1674,11 @@ cdef object PyMPI_testsome(requests, statuses):
     cdef int outcount = MPI_UNDEFINED, *iindices = NULL
     cdef MPI_Status *istatuses = MPI_STATUSES_IGNORE
     #
+    cdef int masked = 0
     cdef tmp1 = acquire_rs(requests, True, &incount, &irequests, &istatuses)
     cdef tmp2 = newarray(incount, &iindices)
     try:
+        if cco_pending: masked = PyMPI_cco_mask(requests, irequests)
         with nogil: CHKERR( MPI_Testsome(
             incount, irequests, &outcount, iindices, istatuses) )
         if outcount != MPI_UNDEFINED:
@@ -660,7 +1687,11 @@ cdef object PyMPI_testsome(requests, statuses):
                 for i in range(outcount)
             ]
     finally:
+        if masked: PyMPI_cco_unmask(requests, irequests)
         release_rs(requests, statuses, incount, irequests, outcount, istatuses)
+    if masked and outcount == MPI_UNDEFINED:
+        outcount = 0
+        bufs = []
     #
     if outcount != MPI_UNDEFINED:
         indices = [iindices[i] for i in range(outcount)]
@@ -671,13 +1702,13 @@ cdef object PyMPI_testsome(requests, statuses):
 
 cdef object PyMPI_probe(int source, int tag,
                         MPI_Comm comm, MPI_Status *status):
-    with nogil: CHKERR( MPI_Probe(source, tag, comm, status) )
+    irecv_probe(source, tag, comm, NULL, status)
     return True
 
 cdef object PyMPI_iprobe(int source, int tag,
                          MPI_Comm comm, MPI_Status *status):
     cdef int flag = 0
-    with nogil: CHKERR( MPI_Iprobe(source, tag, comm, &flag, status) )
+    irecv_probe(source, tag, comm, &flag, status)
     return <bint>flag
 
 cdef object PyMPI_mprobe(int source, int tag, MPI_Comm comm,
@@ -687,7 +1718,7 @@ cdef object PyMPI_mprobe(int source, int tag, MPI_Comm comm,
     cdef MPI_Datatype rtype = MPI_BYTE
     cdef MPI_Status rsts
     if (status == MPI_STATUS_IGNORE): status = &rsts
-    with nogil: CHKERR( MPI_Mprobe(source, tag, comm, message, status) )
+    irecv_mprobe(source, tag, comm, NULL, message, status)
     if message[0] == MPI_MESSAGE_NO_PROC: return None
     CHKERR( MPI_Get_count_c(status, rtype, &rcount) )
     cdef object rmsg = pickle_alloc(&rbuf, rcount)
@@ -700,7 +1731,7 @@ cdef object PyMPI_improbe(int source, int tag, MPI_Comm comm, int *flag,
     cdef MPI_Datatype rtype = MPI_BYTE
     cdef MPI_Status rsts
     if (status == MPI_STATUS_IGNORE): status = &rsts
-    with nogil: CHKERR( MPI_Improbe(source, tag, comm, flag, message, status) )
+    irecv_mprobe(source, tag, comm, flag, message, status)
     if flag[0] == 0 or message[0] == MPI_MESSAGE_NO_PROC: return None
     CHKERR( MPI_Get_count_c(status, rtype, &rcount) )
     cdef object rmsg = pickle_alloc(&rbuf, rcount)
@@ -747,6 +1778,9 @@ cdef object PyMPI_imrecv(object rmsg,
 # -----------------------------------------------------------------------------
 
 cdef object PyMPI_barrier(MPI_Comm comm):
+    if options.irecv_mprobe:
+        PyMPI_irecv_barrier(comm)
+        return None
     with nogil: CHKERR( MPI_Barrier(comm) )
     return None
 
@@ -757,6 +1791,7 @@ cdef object PyMPI_bcast(object obj, int root, MPI_Comm comm):
     cdef void *buf = NULL
     cdef MPI_Count count = 0
     cdef MPI_Datatype dtype = MPI_BYTE
+    cdef MPI_Count length = 0
     #
     cdef int dosend=0, dorecv=0
     cdef int inter=0, rank=0
@@ -774,32 +1809,148 @@ cdef object PyMPI_bcast(object obj, int root, MPI_Comm comm):
             dosend=1; dorecv=1;
         else:
             dosend=0; dorecv=1;
+    if not inter and options.bcast_chunk > 0:
+        return PyMPI_bcast_stream(obj, root, comm, options.bcast_chunk)
     #
     cdef object smsg = None
     cdef object rmsg = None
+    cdef object tmpr = None
     #
-    if dosend: smsg = pickle_dump(pickle, obj, &buf, &count)
+    cdef BufferPool pool = None
+    if dorecv and not dosend: pool = recvpool_lookup(pickle, comm)
+    if dosend: smsg = pickle_dump_oob(pickle, obj, &buf, &count, &dtype, &length)
     if dosend and dorecv: rmsg = smsg
     with PyMPI_Lock(comm, "bcast"):
         with nogil: CHKERR( MPI_Bcast_c(
-            &count, 1, MPI_COUNT,
+            &length, 1, MPI_COUNT,
             root, comm) )
         if dorecv and not dosend:
-            rmsg = pickle_alloc(&buf, count)
+            rmsg = tmpr = pickle_alloc_pool(pool, &buf, length)
+            count = length if length >= 0 else -length
         with nogil: CHKERR( MPI_Bcast_c(
             buf, count, dtype,
             root, comm) )
-    if dorecv: rmsg = pickle_load(pickle, buf, count)
+    if dorecv:
+        if length >= 0:
+            rmsg = pickle_load(pickle, buf, count)
+            pickle_free(tmpr)
+        elif dosend:
+            rmsg = pickle_copy_oob(pickle, buf, count, dtype, length)
+        else:
+            rmsg = pickle_load_oob(pickle, rmsg, buf, count)
     #
     return rmsg
 
 
+# Streamed broadcast of large objects (rc.bcast_chunk). The root sends
+# the number and lengths of the out-of-band buffers and the length of
+# the pickle data stream, then every part in chunks, keeping at most
+# PyMPI_BCAST_DEPTH nonblocking broadcasts pending. Receivers allocate
+# every out-of-band buffer separately and receive it in place, thus no
+# single message buffer holds (and keeps alive) the whole object.
+
+cdef enum:
+    PyMPI_BCAST_DEPTH = 2
+
+cdef int bcast_chunks(
+    void *buf, MPI_Count count, MPI_Count chunk,
+    int root, MPI_Comm comm,
+    MPI_Request requests[], int *k,
+) except -1 nogil:
+    cdef MPI_Count offset = 0, n = 0
+    cdef MPI_Request *request = NULL
+    while offset < count:
+        n = min(chunk, count - offset)
+        request = &requests[k[0] % PyMPI_BCAST_DEPTH]
+        if request[0] != MPI_REQUEST_NULL:
+            CHKERR( MPI_Wait(request, MPI_STATUS_IGNORE) )
+        CHKERR( MPI_Ibcast_c(
+            <char*>buf + offset, n, MPI_BYTE,
+            root, comm, request) )
+        offset += n
+        k[0] += 1
+    return 0
+
+cdef object PyMPI_bcast_stream(object obj, int root, MPI_Comm comm,
+                               MPI_Count chunk):
+    cdef Pickle pickle = PyMPI_PICKLE
+    #
+    cdef int rank = 0
+    CHKERR( MPI_Comm_rank(comm, &rank) )
+    cdef bint dosend = (root == rank)
+    #
+    cdef MPI_Count head[2]
+    cdef MPI_Count *lengths = NULL
+    cdef MPI_Request requests[<int>PyMPI_BCAST_DEPTH]
+    cdef int k = 0
+    cdef void *p = NULL
+    cdef memory buf
+    cdef object data = None
+    cdef list buffers = []
+    cdef object tmp, mem
+    #
+    head[0] = head[1] = 0
+    for i in range(<int>PyMPI_BCAST_DEPTH):
+        requests[i] = MPI_REQUEST_NULL
+    if dosend:
+        if pickle_oob(pickle):
+            data, buffers = cdumps_oob(pickle, obj)
+        else:
+            data = cdumps(pickle, obj)
+        head[0] = len(buffers)
+        head[1] = PyBytes_Size(data)
+    with PyMPI_Lock(comm, "bcast"):
+        with nogil: CHKERR( MPI_Bcast_c(
+            head, 2, MPI_COUNT,
+            root, comm) )
+        tmp = allocate(<Py_ssize_t>head[0], sizeof(MPI_Count), &lengths)
+        if dosend:
+            for i in range(head[0]):
+                lengths[i] = (<memory>buffers[i]).view.len
+        if head[0] > 0:
+            with nogil: CHKERR( MPI_Bcast_c(
+                lengths, head[0], MPI_COUNT,
+                root, comm) )
+        # pending broadcasts must complete before
+        # their buffers may be released on errors
+        try:
+            for i in range(head[0]):
+                if not dosend:
+                    mem = allocate(<Py_ssize_t>lengths[i], 1, &p)
+                    buffers.append(tobuffer(mem, p, <MPI_Aint>lengths[i], 0))
+                buf = <memory>buffers[i]
+                with nogil: bcast_chunks(
+                    buf.view.buf, lengths[i], chunk,
+                    root, comm, requests, &k)
+            if not dosend:
+                data = pickle_alloc(&p, head[1])
+            p = PyBytes_AsString(data)
+            with nogil: bcast_chunks(
+                p, head[1], chunk,
+                root, comm, requests, &k)
+            with nogil: CHKERR( MPI_Waitall(
+                <int>PyMPI_BCAST_DEPTH, requests, MPI_STATUSES_IGNORE) )
+        finally:
+            with nogil: <void>MPI_Waitall(
+                <int>PyMPI_BCAST_DEPTH, requests, MPI_STATUSES_IGNORE)
+    if dosend:
+        for i in range(head[0]):
+            buf = <memory>buffers[i]
+            mem = allocate(buf.view.len, 1, &p)
+            <void>memcpy(p, buf.view.buf, <size_t>buf.view.len)
+            buffers[i] = tobuffer(mem, p, buf.view.len, 0)
+    if buffers:
+        return cloads_oob(pickle, data, buffers)
+    return cloads(pickle, data)
+
+
 cdef object PyMPI_gather(object sendobj, int root, MPI_Comm comm):
     cdef Pickle pickle = PyMPI_PICKLE
     #
     cdef void *sbuf = NULL
     cdef MPI_Count scount = 0
     cdef MPI_Datatype stype = MPI_BYTE
+    cdef MPI_Count slength = 0
     cdef void *rbuf = NULL
     cdef MPI_Count *rcounts = NULL
     cdef MPI_Aint  *rdispls = NULL
@@ -828,19 +1979,24 @@ cdef object PyMPI_gather(object sendobj, int root, MPI_Comm comm):
     cdef object rmsg = None
     cdef object tmp1
     #
+    cdef object tmpr = None
+    cdef BufferPool pool = None
+    #
     if dorecv: tmp1 = allocate_count_displ(size, &rcounts, &rdispls)
-    if dosend: tmps = pickle_dump(pickle, sendobj, &sbuf, &scount)
+    if dorecv: pool = recvpool_lookup(pickle, comm)
+    if dosend: tmps = pickle_dump_oob(pickle, sendobj, &sbuf, &scount, &stype, &slength)
     with PyMPI_Lock(comm, "gather"):
         with nogil: CHKERR( MPI_Gather_c(
-            &scount, 1, MPI_COUNT,
+            &slength, 1, MPI_COUNT,
             rcounts, 1, MPI_COUNT,
             root, comm) )
-        if dorecv: rmsg = pickle_allocv(&rbuf, size, rcounts, rdispls)
+        if dorecv: tmpr = pickle_allocv(&rbuf, size, rcounts, rdispls, pool)
         with nogil: CHKERR( MPI_Gatherv_c(
             sbuf, scount,           stype,
             rbuf, rcounts, rdispls, rtype,
             root, comm) )
-    if dorecv: rmsg = pickle_loadv(pickle, rbuf, size, rcounts, rdispls)
+    if dorecv: rmsg = pickle_loadv(pickle, tmpr, rbuf, size, rcounts, rdispls)
+    if dorecv: pickle_free(tmpr)
     #
     return rmsg
 
@@ -879,19 +2035,27 @@ cdef object PyMPI_scatter(object sendobj, int root, MPI_Comm comm):
     cdef object rmsg = None
     cdef object tmp1
     #
+    if options.pickle_threads >= 2 and not inter and size > 1:
+        if root >= 0 and root < size:
+            return PyMPI_scatter_pipe(sendobj, root, size, comm)
+    cdef object tmpr = None
+    cdef BufferPool pool = None
+    #
     if dosend: tmp1 = allocate_count_displ(size, &scounts, &sdispls)
     if dosend: tmps = pickle_dumpv(pickle, sendobj, &sbuf, size, scounts, sdispls)
+    if dorecv: pool = recvpool_lookup(pickle, comm)
     with PyMPI_Lock(comm, "scatter"):
         with nogil: CHKERR( MPI_Scatter_c(
             scounts, 1, MPI_COUNT,
             &rcount, 1, MPI_COUNT,
             root, comm) )
-        if dorecv: rmsg = pickle_alloc(&rbuf, rcount)
+        if dorecv: tmpr = pickle_alloc_pool(pool, &rbuf, rcount)
         with nogil: CHKERR( MPI_Scatterv_c(
             sbuf, scounts, sdispls, stype,
             rbuf, rcount,           rtype,
             root, comm) )
     if dorecv: rmsg = pickle_load(pickle, rbuf, rcount)
+    if dorecv: pickle_free(tmpr)
     #
     return rmsg
 
@@ -902,6 +2066,7 @@ cdef object PyMPI_allgather(object sendobj, MPI_Comm comm):
     cdef void *sbuf = NULL
     cdef MPI_Count scount = 0
     cdef MPI_Datatype stype = MPI_BYTE
+    cdef MPI_Count slength = 0
     cdef void *rbuf = NULL
     cdef MPI_Count *rcounts = NULL
     cdef MPI_Aint  *rdispls = NULL
@@ -918,19 +2083,23 @@ cdef object PyMPI_allgather(object sendobj, MPI_Comm comm):
     cdef object rmsg = None
     cdef object tmp1
     #
+    cdef object tmpr = None
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
+    #
     tmp1 = allocate_count_displ(size, &rcounts, &rdispls)
-    tmps = pickle_dump(pickle, sendobj, &sbuf, &scount)
+    tmps = pickle_dump_oob(pickle, sendobj, &sbuf, &scount, &stype, &slength)
     with PyMPI_Lock(comm, "allgather"):
         with nogil: CHKERR( MPI_Allgather_c(
-            &scount, 1, MPI_COUNT,
+            &slength, 1, MPI_COUNT,
             rcounts, 1, MPI_COUNT,
             comm) )
-        rmsg = pickle_allocv(&rbuf, size, rcounts, rdispls)
+        tmpr = pickle_allocv(&rbuf, size, rcounts, rdispls, pool)
         with nogil: CHKERR( MPI_Allgatherv_c(
             sbuf, scount,           stype,
             rbuf, rcounts, rdispls, rtype,
             comm) )
-    rmsg = pickle_loadv(pickle, rbuf, size, rcounts, rdispls)
+    rmsg = pickle_loadv(pickle, tmpr, rbuf, size, rcounts, rdispls)
+    pickle_free(tmpr)
     #
     return rmsg
 
@@ -958,6 +2127,13 @@ cdef object PyMPI_alltoall(object sendobj, MPI_Comm comm):
     cdef object rmsg = None
     cdef object tmp1, tmp2
     #
+    if options.pickle_threads >= 2 and not inter and size > 1:
+        return PyMPI_alltoall_pipe(sendobj, size, comm)
+    if pickle_oob(pickle):
+        return PyMPI_alltoall_oob(sendobj, size, comm)
+    cdef object tmpr = None
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
+    #
     tmp1 = allocate_count_displ(size, &scounts, &sdispls)
     tmp2 = allocate_count_displ(size, &rcounts, &rdispls)
     tmps = pickle_dumpv(pickle, sendobj, &sbuf, size, scounts, sdispls)
@@ -966,12 +2142,52 @@ cdef object PyMPI_alltoall(object sendobj, MPI_Comm comm):
             scounts, 1, MPI_COUNT,
             rcounts, 1, MPI_COUNT,
             comm) )
-        rmsg = pickle_allocv(&rbuf, size, rcounts, rdispls)
+        tmpr = pickle_allocv(&rbuf, size, rcounts, rdispls, pool)
         with nogil: CHKERR( MPI_Alltoallv_c(
             sbuf, scounts, sdispls, stype,
             rbuf, rcounts, rdispls, rtype,
             comm) )
-    rmsg = pickle_loadv(pickle, rbuf, size, rcounts, rdispls)
+    rmsg = pickle_loadv(pickle, tmpr, rbuf, size, rcounts, rdispls)
+    pickle_free(tmpr)
+    #
+    return rmsg
+
+
+cdef object PyMPI_alltoall_oob(object sendobj, int size, MPI_Comm comm):
+    cdef Pickle pickle = PyMPI_PICKLE
+    #
+    cdef void *sbuf = NULL
+    cdef MPI_Count *scounts = NULL
+    cdef MPI_Aint  *sdispls = NULL
+    cdef MPI_Datatype *stypes = NULL
+    cdef MPI_Count *slengths = NULL
+    cdef void *rbuf = NULL
+    cdef MPI_Count *rcounts = NULL
+    cdef MPI_Aint  *rdispls = NULL
+    cdef MPI_Datatype *rtypes = NULL
+    #
+    cdef object tmps = None
+    cdef object rmsg = None
+    cdef object tmp1, tmp2, tmp3, tmp4
+    #
+    tmp1 = allocate_count_displ(size, &scounts, &sdispls)
+    tmp2 = allocate_count_displ(size, &rcounts, &rdispls)
+    tmp3 = allocate(size, sizeof(MPI_Count), &slengths)
+    tmp4 = allocate(2*<Py_ssize_t>size, sizeof(MPI_Datatype), &stypes)
+    rtypes = stypes + size
+    for i in range(size): rtypes[i] = MPI_BYTE
+    tmps = pickle_dumpw(pickle, sendobj, &sbuf, size, scounts, sdispls, stypes, slengths)
+    with PyMPI_Lock(comm, "alltoall"):
+        with nogil: CHKERR( MPI_Alltoall_c(
+            slengths, 1, MPI_COUNT,
+            rcounts,  1, MPI_COUNT,
+            comm) )
+        rmsg = pickle_allocv(&rbuf, size, rcounts, rdispls)
+        with nogil: CHKERR( MPI_Alltoallw_c(
+            sbuf, scounts, sdispls, stypes,
+            rbuf, rcounts, rdispls, rtypes,
+            comm) )
+    rmsg = pickle_loadv(pickle, rmsg, rbuf, size, rcounts, rdispls)
     #
     return rmsg
 
@@ -994,6 +2210,9 @@ cdef object PyMPI_neighbor_allgather(object sendobj, MPI_Comm comm):
     cdef object rmsg = None
     cdef object tmp1
     #
+    cdef object tmpr = None
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
+    #
     tmp1 = allocate_count_displ(rsize, &rcounts, &rdispls)
     for i in range(rsize): rcounts[i] = 0
     tmps = pickle_dump(pickle, sendobj, &sbuf, &scount)
@@ -1002,12 +2221,13 @@ cdef object PyMPI_neighbor_allgather(object sendobj, MPI_Comm comm):
             &scount, 1, MPI_COUNT,
             rcounts, 1, MPI_COUNT,
             comm) )
-        rmsg = pickle_allocv(&rbuf, rsize, rcounts, rdispls)
+        tmpr = pickle_allocv(&rbuf, rsize, rcounts, rdispls, pool)
         with nogil: CHKERR( MPI_Neighbor_allgatherv_c(
             sbuf, scount,           stype,
             rbuf, rcounts, rdispls, rtype,
             comm) )
-    rmsg = pickle_loadv(pickle, rbuf, rsize, rcounts, rdispls)
+    rmsg = pickle_loadv(pickle, tmpr, rbuf, rsize, rcounts, rdispls)
+    pickle_free(tmpr)
     #
     return rmsg
 
@@ -1031,6 +2251,9 @@ cdef object PyMPI_neighbor_alltoall(object sendobj, MPI_Comm comm):
     cdef object rmsg = None
     cdef object tmp1, tmp2
     #
+    cdef object tmpr = None
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
+    #
     tmp1 = allocate_count_displ(ssize, &scounts, &sdispls)
     tmp2 = allocate_count_displ(rsize, &rcounts, &rdispls)
     for i in range(rsize): rcounts[i] = 0
@@ -1040,12 +2263,13 @@ cdef object PyMPI_neighbor_alltoall(object sendobj, MPI_Comm comm):
             scounts, 1, MPI_COUNT,
             rcounts, 1, MPI_COUNT,
             comm) )
-        rmsg = pickle_allocv(&rbuf, rsize, rcounts, rdispls)
+        tmpr = pickle_allocv(&rbuf, rsize, rcounts, rdispls, pool)
         with nogil: CHKERR( MPI_Neighbor_alltoallv_c(
             sbuf, scounts, sdispls, stype,
             rbuf, rcounts, rdispls, rtype,
             comm) )
-    rmsg = pickle_loadv(pickle, rbuf, rsize, rcounts, rdispls)
+    rmsg = pickle_loadv(pickle, tmpr, rbuf, rsize, rcounts, rdispls)
+    pickle_free(tmpr)
     #
     return rmsg
 
@@ -1117,10 +2341,13 @@ cdef object PyMPI_recv_p2p(int src, int tag, MPI_Comm comm):
     cdef MPI_Count rcount = 0
     cdef MPI_Datatype rtype = MPI_BYTE
     cdef MPI_Status *status = MPI_STATUS_IGNORE
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
     with nogil: CHKERR( MPI_Recv_c(&rcount, 1, MPI_COUNT, src, tag, comm, status) )
-    cdef object tmpr = pickle_alloc(&rbuf, rcount)
+    cdef object tmpr = pickle_alloc_pool(pool, &rbuf, rcount)
     with nogil: CHKERR( MPI_Recv_c(rbuf, rcount, rtype, src, tag, comm, status) )
-    return pickle_load(pickle, rbuf, rcount)
+    cdef object obj = pickle_load(pickle, rbuf, rcount)
+    pickle_free(tmpr)
+    return obj
 
 cdef object PyMPI_sendrecv_p2p(object obj,
                                int dst, int stag,
@@ -1130,17 +2357,20 @@ cdef object PyMPI_sendrecv_p2p(object obj,
     cdef void *sbuf = NULL, *rbuf = NULL
     cdef MPI_Count scount = 0, rcount = 0
     cdef MPI_Datatype dtype = MPI_BYTE
+    cdef BufferPool pool = recvpool_lookup(pickle, comm)
     cdef object tmps = pickle_dump(pickle, obj, &sbuf, &scount)
     with nogil: CHKERR( MPI_Sendrecv_c(
             &scount, 1, MPI_COUNT, dst, stag,
             &rcount, 1, MPI_COUNT, src, rtag,
             comm, MPI_STATUS_IGNORE) )
-    cdef object tmpr = pickle_alloc(&rbuf, rcount)
+    cdef object tmpr = pickle_alloc_pool(pool, &rbuf, rcount)
     with nogil: CHKERR( MPI_Sendrecv_c(
             sbuf, scount, dtype, dst, stag,
             rbuf, rcount, dtype, src, rtag,
             comm, MPI_STATUS_IGNORE) )
-    return pickle_load(pickle, rbuf, rcount)
+    obj = pickle_load(pickle, rbuf, rcount)
+    pickle_free(tmpr)
+    return obj
 
 cdef object PyMPI_bcast_p2p(object obj, int root, MPI_Comm comm):
     cdef Pickle pickle = PyMPI_PICKLE
@@ -1149,12 +2379,17 @@ cdef object PyMPI_bcast_p2p(object obj, int root, MPI_Comm comm):
     cdef MPI_Datatype dtype = MPI_BYTE
     cdef int rank = MPI_PROC_NULL
     CHKERR( MPI_Comm_rank(comm, &rank) )
+    cdef BufferPool pool = None
+    if root != rank: pool = recvpool_lookup(pickle, comm)
     if root == rank: obj = pickle_dump(pickle, obj, &buf, &count)
     with PyMPI_Lock(comm, "@bcast_p2p@"):
         with nogil: CHKERR( MPI_Bcast_c(&count, 1, MPI_COUNT, root, comm) )
-        if root != rank: obj = pickle_alloc(&buf, count)
+        if root != rank: obj = pickle_alloc_pool(pool, &buf, count)
         with nogil: CHKERR( MPI_Bcast_c(buf, count, dtype, root, comm) )
-    return pickle_load(pickle, buf, count)
+    cdef object tmp = obj
+    obj = pickle_load(pickle, buf, count)
+    pickle_free(tmp)
+    return obj
 
 cdef object PyMPI_reduce_p2p(object sendobj, object op, int root,
                              MPI_Comm comm, int tag):
@@ -1196,6 +2431,57 @@ cdef object PyMPI_reduce_p2p(object sendobj, object op, int root,
     #
     return result
 
+cdef object PyMPI_allreduce_p2p(object sendobj, object op,
+                                MPI_Comm comm, int tag):
+    # Get communicator size and rank
+    cdef int size = MPI_UNDEFINED
+    cdef int rank = MPI_PROC_NULL
+    CHKERR( MPI_Comm_size(comm, &size) )
+    CHKERR( MPI_Comm_rank(comm, &rank) )
+    #
+    cdef object result = PyMPI_copy(sendobj)
+    cdef object tmp
+    # Fold processes in excess of a power of two
+    cdef int pof2 = 1
+    while pof2 <= size // 2:
+        pof2 <<= 1
+    cdef int nrem = size - pof2
+    cdef int vrank = rank - nrem
+    if rank < 2 * nrem:
+        if rank % 2 == 0:
+            PyMPI_send_p2p(result, rank + 1, tag, comm)
+            vrank = -1
+        else:
+            tmp = PyMPI_recv_p2p(rank - 1, tag, comm)
+            result = op(tmp, result)
+            vrank = rank // 2
+    # Compute reduction by recursive doubling
+    cdef int umask = 1
+    cdef int vtarget = 0
+    cdef int target = 0
+    if vrank >= 0:
+        while umask < pof2:
+            vtarget = vrank ^ umask
+            if vtarget < nrem:
+                target = vtarget * 2 + 1
+            else:
+                target = vtarget + nrem
+            tmp = PyMPI_sendrecv_p2p(result, target, tag,
+                                     target, tag, comm)
+            if rank > target:
+                result = op(tmp, result)
+            else:
+                result = op(result, tmp)
+            umask <<= 1
+    # Send reduction to folded processes
+    if rank < 2 * nrem:
+        if rank % 2 == 0:
+            result = PyMPI_recv_p2p(rank + 1, tag, comm)
+        else:
+            PyMPI_send_p2p(result, rank - 1, tag, comm)
+    #
+    return result
+
 cdef object PyMPI_scan_p2p(object sendobj, object op,
                            MPI_Comm comm, int tag):
     # Get communicator size and rank
@@ -1269,6 +2555,7 @@ cdef object PyMPI_exscan_p2p(object sendobj, object op,
 cdef extern from * nogil:
     int PyMPI_Commctx_intra(MPI_Comm,MPI_Comm*,int*)
     int PyMPI_Commctx_inter(MPI_Comm,MPI_Comm*,int*,MPI_Comm*,int*)
+    int PyMPI_Commctx_idup(MPI_Comm,MPI_Request**)
 
 cdef int PyMPI_Commctx_INTRA(MPI_Comm comm,
                              MPI_Comm *dupcomm, int *tag) except -1:
@@ -1340,6 +2627,8 @@ cdef object PyMPI_reduce_inter(object sendobj, object op,
 cdef object PyMPI_allreduce_intra(object sendobj, object op, MPI_Comm comm):
     cdef int tag = MPI_UNDEFINED
     PyMPI_Commctx_INTRA(comm, &comm, &tag)
+    if options.allreduce_algorithm == 2: # recursive doubling
+        return PyMPI_allreduce_p2p(sendobj, op, comm, tag)
     sendobj = PyMPI_reduce_p2p(sendobj, op, 0, comm, tag)
     return PyMPI_bcast_p2p(sendobj, 0, comm)
 
@@ -1368,6 +2657,125 @@ cdef object PyMPI_exscan_intra(object sendobj, object op, MPI_Comm comm):
 
 # -----
 
+# With rc.pickle_threads, scatter() and alltoall() on intracommunicators
+# pipeline serialization with communication: the thread pool pickles the
+# items ahead in send order, every item is sent point-to-point on the
+# private duplicate as soon as it is pickled, and received items are
+# unpickled in the pool while later ones are still in flight. Items
+# failing to pickle are sent as empty messages (unpickled as None) to keep
+# the exchange going, and the error is raised once the sends complete.
+
+cdef object PyMPI_scatter_pipe(object sendobj, int root,
+                               int size, MPI_Comm comm):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef int oob = pickle_oob(pickle)
+    cdef int tag = MPI_UNDEFINED, rank = 0
+    cdef int i = 0, dest = MPI_PROC_NULL
+    PyMPI_Commctx_INTRA(comm, &comm, &tag)
+    CHKERR( MPI_Comm_rank(comm, &rank) )
+    #
+    cdef void *buf = NULL
+    cdef MPI_Count count = 0
+    cdef MPI_Datatype dtype = MPI_BYTE
+    cdef MPI_Message message = MPI_MESSAGE_NULL
+    cdef MPI_Status status
+    cdef object tmp, tmpr
+    if rank != root:
+        with nogil: CHKERR( MPI_Mprobe(root, tag, comm, &message, &status) )
+        CHKERR( MPI_Get_count_c(&status, MPI_BYTE, &count) )
+        tmpr = pickle_alloc(&buf, -count if oob else count)
+        with nogil: CHKERR( MPI_Mrecv_c(
+            buf, count, MPI_BYTE, &message, MPI_STATUS_IGNORE) )
+        return pickle_pipe_load(pickle, tmpr)
+    #
+    cdef list items = pickle_items(sendobj, size)
+    cdef object executor = pickle_pool()
+    cdef object dump = lambda item: cdumps(pickle, item)
+    if oob: dump = lambda item: cdumps_oob(pickle, item)
+    cdef object rmsg = executor.submit(
+        lambda item: PyMPI_copy(item), items[root])
+    cdef list sdata = [
+        executor.submit(dump, items[(root + i) % size])
+        for i in range(1, size)
+    ]
+    cdef MPI_Request *requests = NULL
+    tmp = allocate(size - 1, sizeof(MPI_Request), &requests)
+    for i in range(size - 1): requests[i] = MPI_REQUEST_NULL
+    cdef object error = None
+    try:
+        for i in range(size - 1):
+            dest = (root + 1 + i) % size
+            try:
+                sdata[i] = pickle_pipe_dump(
+                    pickle, sdata[i], &buf, &count, &dtype)
+            except BaseException as exc:
+                if error is None: error = exc
+                buf = NULL; count = 0; dtype = MPI_BYTE
+            with nogil: CHKERR( MPI_Isend_c(
+                buf, count, dtype, dest, tag, comm, &requests[i]) )
+    finally:
+        with nogil: CHKERR( MPI_Waitall(
+            size - 1, requests, MPI_STATUSES_IGNORE) )
+    if error is not None: raise error
+    return rmsg.result()
+
+
+cdef object PyMPI_alltoall_pipe(object sendobj, int size, MPI_Comm comm):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef int oob = pickle_oob(pickle)
+    cdef list items = pickle_items(sendobj, size)
+    cdef int tag = MPI_UNDEFINED, rank = 0
+    cdef int i = 0, dest = MPI_PROC_NULL, source = MPI_PROC_NULL
+    PyMPI_Commctx_INTRA(comm, &comm, &tag)
+    CHKERR( MPI_Comm_rank(comm, &rank) )
+    #
+    cdef object executor = pickle_pool()
+    cdef object dump = lambda item: cdumps(pickle, item)
+    if oob: dump = lambda item: cdumps_oob(pickle, item)
+    cdef object load = lambda ob: pickle_pipe_load(pickle, ob)
+    cdef list sdata = [
+        executor.submit(dump, items[(rank + i) % size])
+        for i in range(size)
+    ]
+    cdef list rdata = [None] * size
+    cdef object rmsg = None
+    #
+    cdef void *sbuf = NULL, *rbuf = NULL
+    cdef MPI_Count scount = 0, rcount = 0
+    cdef MPI_Datatype stype = MPI_BYTE
+    cdef MPI_Message message = MPI_MESSAGE_NULL
+    cdef MPI_Status status
+    cdef MPI_Request *requests = NULL
+    cdef object tmp = allocate(size, sizeof(MPI_Request), &requests)
+    for i in range(size): requests[i] = MPI_REQUEST_NULL
+    cdef object error = None
+    try:
+        for i in range(size):
+            dest = (rank + i) % size
+            source = (rank - i + size) % size
+            try:
+                sdata[i] = pickle_pipe_dump(
+                    pickle, sdata[i], &sbuf, &scount, &stype)
+            except BaseException as exc:
+                if error is None: error = exc
+                sbuf = NULL; scount = 0; stype = MPI_BYTE
+            with nogil: CHKERR( MPI_Isend_c(
+                sbuf, scount, stype, dest, tag, comm, &requests[i]) )
+            with nogil: CHKERR( MPI_Mprobe(
+                source, tag, comm, &message, &status) )
+            CHKERR( MPI_Get_count_c(&status, MPI_BYTE, &rcount) )
+            rmsg = pickle_alloc(&rbuf, -rcount if oob else rcount)
+            with nogil: CHKERR( MPI_Mrecv_c(
+                rbuf, rcount, MPI_BYTE, &message, MPI_STATUS_IGNORE) )
+            rdata[source] = executor.submit(load, rmsg)
+    finally:
+        with nogil: CHKERR( MPI_Waitall(
+            size, requests, MPI_STATUSES_IGNORE) )
+    if error is not None: raise error
+    return [future.result() for future in rdata]
+
+# -----
+
 cdef inline bint comm_is_intra(MPI_Comm comm) except -1 nogil:
     cdef int inter = 0
     CHKERR( MPI_Comm_test_inter(comm, &inter) )
@@ -1407,3 +2815,513 @@ cdef object PyMPI_exscan(object sendobj, object op, MPI_Comm comm):
         return PyMPI_exscan_intra(sendobj, op, comm)
 
 # -----------------------------------------------------------------------------
+
+# Nonblocking collectives post the exchange of message sizes at
+# initiation time. Once it completes, the transfer of the pickled data
+# is posted on a private duplicate of the communicator reusing the same
+# request object, either by completion calls on the request or by any
+# subsequent communication method with Python objects on the
+# communicator. The duplicate is created with MPI_Comm_idup() by the
+# first operation on a communicator. Data transfers must be posted in
+# the same order by all processes, thus operations with a pending size
+# exchange are queued and advanced strictly in initiation order per
+# communicator.
+# The state of the operation is kept alive in the request object until
+# completion, then received objects are unpickled by PyMPI_load().
+
+cdef list cco_pending = []
+
+cdef enum:
+    PyMPI_CCO_BCAST
+    PyMPI_CCO_GATHER
+    PyMPI_CCO_SCATTER
+    PyMPI_CCO_ALLGATHER
+    PyMPI_CCO_ALLTOALL
+
+
+@cython.final
+@cython.internal
+cdef class _p_obj_cco:
+
+    # raw C-side arguments
+    cdef void *buf
+    cdef MPI_Count count, length
+    cdef MPI_Datatype dtype
+    cdef int size
+    cdef MPI_Count *counts
+    cdef MPI_Aint  *displs
+    cdef bint dosend, dorecv
+    # python-side arguments
+    cdef object smsg, rmsg
+    cdef object tmp, mem
+    cdef object op
+    # pending data transfer
+    cdef Request request
+    cdef MPI_Comm comm
+    cdef MPI_Request *dupreq
+    cdef int kind, root, nprocs
+    cdef void *sbuf
+    cdef MPI_Count scount
+    cdef MPI_Datatype stype
+    cdef MPI_Count *scounts
+    cdef MPI_Aint  *sdispls
+    cdef MPI_Datatype *stypes
+    cdef MPI_Count *rcounts
+    cdef MPI_Aint  *rdispls
+
+    def __cinit__(self):
+        self.buf = NULL
+        self.count = self.length = 0
+        self.dtype = MPI_BYTE
+        self.size = -1
+        self.counts = NULL
+        self.displs = NULL
+        self.dosend = self.dorecv = 0
+        self.request = None
+        self.comm = MPI_COMM_NULL
+        self.dupreq = NULL
+        self.kind = self.root = self.nprocs = 0
+        self.sbuf = NULL
+        self.scount = 0
+        self.stype = MPI_BYTE
+        self.scounts = NULL
+        self.sdispls = NULL
+        self.stypes = NULL
+        self.rcounts = NULL
+        self.rdispls = NULL
+
+    cdef int keepv(self, int n, MPI_Count cnt[], MPI_Aint dsp[]) except -1:
+        # large-count fallbacks may convert argument arrays in place
+        self.size = n
+        self.mem = allocate_count_displ(n, &self.counts, &self.displs)
+        for i in range(n):
+            self.counts[i] = cnt[i]
+            self.displs[i] = dsp[i]
+        return 0
+
+    cdef int start(self, MPI_Comm comm, Request request) except -1:
+        # called with the size exchange posted to the request
+        with PyMPI_Lock(comm, "@commctx_intra"):
+            CHKERR( PyMPI_Commctx_idup(comm, &self.dupreq) )
+        self.comm = comm
+        self.request = request
+        cco_pending.append(self)
+        return 0
+
+    cdef int post(self) except -1:
+        cdef Request request = self.request
+        cdef MPI_Comm comm = MPI_COMM_NULL
+        cdef int root = self.root
+        cdef int n = self.nprocs
+        cdef MPI_Datatype rtype = MPI_BYTE
+        PyMPI_Commctx_INTRA(self.comm, &comm, NULL)
+        cco_pending.remove(self)
+        self.request = None
+        if self.kind == PyMPI_CCO_BCAST:
+            if self.dorecv and not self.dosend:
+                self.rmsg = pickle_alloc(&self.buf, self.length)
+                self.count = self.length if self.length >= 0 else -self.length
+            with nogil: CHKERR( MPI_Ibcast_c(
+                self.buf, self.count, self.dtype,
+                root, comm, &request.ob_mpi) )
+        elif self.kind == PyMPI_CCO_GATHER:
+            if self.dorecv:
+                self.rmsg = pickle_allocv(&self.buf, n, self.rcounts, self.rdispls)
+                self.keepv(n, self.rcounts, self.rdispls)
+            with nogil: CHKERR( MPI_Igatherv_c(
+                self.sbuf, self.scount,                self.stype,
+                self.buf,  self.rcounts, self.rdispls, rtype,
+                root, comm, &request.ob_mpi) )
+        elif self.kind == PyMPI_CCO_SCATTER:
+            if self.dorecv:
+                self.rmsg = pickle_alloc(&self.buf, self.length)
+            with nogil: CHKERR( MPI_Iscatterv_c(
+                self.sbuf, self.scounts, self.sdispls, self.stype,
+                self.buf,  self.length,                rtype,
+                root, comm, &request.ob_mpi) )
+        elif self.kind == PyMPI_CCO_ALLGATHER:
+            self.rmsg = pickle_allocv(&self.buf, n, self.rcounts, self.rdispls)
+            self.keepv(n, self.rcounts, self.rdispls)
+            with nogil: CHKERR( MPI_Iallgatherv_c(
+                self.sbuf, self.scount,                self.stype,
+                self.buf,  self.rcounts, self.rdispls, rtype,
+                comm, &request.ob_mpi) )
+        elif self.kind == PyMPI_CCO_ALLTOALL:
+            self.rmsg = pickle_allocv(&self.buf, n, self.rcounts, self.rdispls)
+            self.keepv(n, self.rcounts, self.rdispls)
+            if self.stypes != NULL:
+                with nogil: CHKERR( MPI_Ialltoallw_c(
+                    self.sbuf, self.scounts, self.sdispls, self.stypes,
+                    self.buf,  self.rcounts, self.rdispls, self.stypes + n,
+                    comm, &request.ob_mpi) )
+            else:
+                with nogil: CHKERR( MPI_Ialltoallv_c(
+                    self.sbuf, self.scounts, self.sdispls, MPI_BYTE,
+                    self.buf,  self.rcounts, self.rdispls, MPI_BYTE,
+                    comm, &request.ob_mpi) )
+        return 0
+
+    cdef object load(self):
+        cdef Pickle pickle = PyMPI_PICKLE
+        cdef object obj = None
+        if not self.dorecv: return None
+        if self.size < 0:
+            if self.length >= 0:
+                obj = pickle_load(pickle, self.buf, self.length)
+            elif self.dosend:
+                obj = pickle_copy_oob(pickle, self.buf, self.count, self.dtype, self.length)
+            else:
+                obj = pickle_load_oob(pickle, self.rmsg, self.buf, -self.length)
+        else:
+            obj = pickle_loadv(pickle, self.rmsg, self.buf, self.size, self.counts, self.displs)
+            if self.op is not None: obj = _py_reduce(obj, self.op)
+        return obj
+
+
+cdef inline _p_obj_cco cco_state(Request request):
+    # operation state if its size exchange is pending
+    cdef object ob = request.ob_buf
+    if type(ob) is not _p_obj_cco: return None
+    if (<_p_obj_cco>ob).request is None: return None
+    return <_p_obj_cco>ob
+
+
+cdef int cco_advance(MPI_Comm comm, _p_obj_cco last) except -1:
+    # post data transfers in initiation order, waiting for
+    # size exchanges up to the given operation if any,
+    # otherwise only as long as they have completed
+    cdef _p_obj_cco state
+    cdef Request request
+    cdef int flag = 0
+    with PyMPI_Lock(comm, "@cco"):
+        for state in list(cco_pending):
+            if state.comm != comm: continue
+            if state.request is None: continue
+            request = state.request
+            if last is not None:
+                with nogil: CHKERR( MPI_Wait(
+                    state.dupreq, MPI_STATUS_IGNORE) )
+                with nogil: CHKERR( MPI_Wait(
+                    &request.ob_mpi, MPI_STATUS_IGNORE) )
+            else:
+                with nogil: CHKERR( MPI_Test(
+                    state.dupreq, &flag, MPI_STATUS_IGNORE) )
+                if not flag: break
+                with nogil: CHKERR( MPI_Test(
+                    &request.ob_mpi, &flag, MPI_STATUS_IGNORE) )
+                if not flag: break
+            state.post()
+            if state is last: break
+    return 0
+
+
+cdef int PyMPI_cco_progress(MPI_Comm comm) except -1:
+    # post data transfers of operations on a communicator with the
+    # size exchange completed, called by communication methods;
+    # progressing MPI_Comm_idup() between initiations may interleave
+    # its internal collectives with later size exchanges, thus the
+    # duplicate is completed only by calls on the requests
+    cdef _p_obj_cco state
+    for state in cco_pending:
+        if state.comm == comm:
+            if state.dupreq[0] != MPI_REQUEST_NULL: return 0
+            return cco_advance(comm, None)
+    return 0
+
+
+cdef int PyMPI_cco_wait(object requests) except -1:
+    # complete the size exchange of pending operations
+    cdef Request request
+    cdef _p_obj_cco state
+    for request in requests:
+        state = cco_state(request)
+        if state is not None:
+            cco_advance(state.comm, state)
+    return 0
+
+
+cdef int PyMPI_cco_test(object requests) except -1:
+    # progress size exchanges, return whether any is pending
+    cdef Request request
+    cdef _p_obj_cco state
+    cdef int pending = 0
+    for request in requests:
+        state = cco_state(request)
+        if state is not None:
+            cco_advance(state.comm, None)
+        if cco_state(request) is not None:
+            pending = 1
+    return pending
+
+
+cdef int PyMPI_cco_post(object requests) except -1:
+    # post data transfers of operations with the size exchange
+    # completed by a wait call, return their number
+    cdef Request request
+    cdef _p_obj_cco state
+    cdef int count = 0
+    for request in requests:
+        if request.ob_mpi != MPI_REQUEST_NULL: continue
+        state = cco_state(request)
+        if state is not None:
+            cco_advance(state.comm, state)
+            count += 1
+    return count
+
+
+cdef int PyMPI_cco_mask(object requests, MPI_Request array[]) except -1:
+    # hide pending size exchanges from a test call, return their number
+    cdef Py_ssize_t n = len(requests)
+    cdef Request request
+    cdef int count = 0
+    if not PyMPI_cco_test(requests): return 0
+    for i in range(n):
+        request = <Request>requests[i]
+        array[i] = request.ob_mpi
+        if cco_state(request) is not None:
+            array[i] = MPI_REQUEST_NULL
+            count += 1
+    return count
+
+
+cdef int PyMPI_cco_unmask(object requests, MPI_Request array[]) except -1:
+    cdef Py_ssize_t n = len(requests)
+    cdef Request request
+    for i in range(n):
+        request = <Request>requests[i]
+        if cco_state(request) is not None:
+            array[i] = request.ob_mpi
+    return 0
+
+
+cdef int PyMPI_cco_filter(object requests, int *outcount,
+                          int indices[], MPI_Status statuses[]) except -1:
+    # drop size exchanges from the output of a some call,
+    # return their number
+    if outcount[0] == MPI_UNDEFINED: return 0
+    cdef int i = 0, j = 0
+    for i in range(outcount[0]):
+        if cco_state(<Request>requests[indices[i]]) is not None:
+            continue
+        indices[j] = indices[i]
+        if statuses != MPI_STATUSES_IGNORE:
+            statuses[j] = statuses[i]
+        j += 1
+    i = outcount[0] - j
+    outcount[0] = j
+    return i
+
+
+cdef object PyMPI_ibcast(object obj, int root, MPI_Comm comm,
+                         Request request):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef _p_obj_cco state = _p_obj_cco.__new__(_p_obj_cco)
+    #
+    cdef int dosend=0, dorecv=0
+    cdef int inter=0, rank=0
+    CHKERR( MPI_Comm_test_inter(comm, &inter) )
+    if inter:
+        if root == MPI_PROC_NULL:
+            dosend=0; dorecv=0;
+        elif root == MPI_ROOT:
+            dosend=1; dorecv=0;
+        else:
+            dosend=0; dorecv=1;
+    else:
+        CHKERR( MPI_Comm_rank(comm, &rank) )
+        if root == rank:
+            dosend=1; dorecv=1;
+        else:
+            dosend=0; dorecv=1;
+    state.dosend = dosend
+    state.dorecv = dorecv
+    state.kind = PyMPI_CCO_BCAST
+    state.root = root
+    #
+    if dosend: state.smsg = pickle_dump_oob(
+        pickle, obj, &state.buf, &state.count, &state.dtype, &state.length)
+    with PyMPI_Lock(comm, "bcast"):
+        with nogil: CHKERR( MPI_Ibcast_c(
+            &state.length, 1, MPI_COUNT,
+            root, comm, &request.ob_mpi) )
+        state.start(comm, request)
+    #
+    return state
+
+
+cdef object PyMPI_igather(object sendobj, int root, MPI_Comm comm,
+                          Request request):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef _p_obj_cco state = _p_obj_cco.__new__(_p_obj_cco)
+    #
+    cdef MPI_Count slength = 0
+    #
+    cdef int dosend=0, dorecv=0
+    cdef int inter=0, size=0, rank=0
+    CHKERR( MPI_Comm_test_inter(comm, &inter) )
+    if inter:
+        CHKERR( MPI_Comm_remote_size(comm, &size) )
+        if root == MPI_PROC_NULL:
+            dosend=0; dorecv=0;
+        elif root == MPI_ROOT:
+            dosend=0; dorecv=1;
+        else:
+            dosend=1; dorecv=0;
+    else:
+        CHKERR( MPI_Comm_size(comm, &size) )
+        CHKERR( MPI_Comm_rank(comm, &rank) )
+        if root == rank:
+            dosend=1; dorecv=1;
+        else:
+            dosend=1; dorecv=0;
+    state.dosend = dosend
+    state.dorecv = dorecv
+    state.kind = PyMPI_CCO_GATHER
+    state.root = root
+    state.nprocs = size
+    #
+    if dorecv: state.tmp = allocate_count_displ(
+        size, &state.rcounts, &state.rdispls)
+    if dosend: state.smsg = pickle_dump_oob(
+        pickle, sendobj, &state.sbuf, &state.scount, &state.stype, &slength)
+    state.length = slength
+    with PyMPI_Lock(comm, "gather"):
+        with nogil: CHKERR( MPI_Igather_c(
+            &state.length, 1, MPI_COUNT,
+            state.rcounts, 1, MPI_COUNT,
+            root, comm, &request.ob_mpi) )
+        state.start(comm, request)
+    #
+    return state
+
+
+cdef object PyMPI_iscatter(object sendobj, int root, MPI_Comm comm,
+                           Request request):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef _p_obj_cco state = _p_obj_cco.__new__(_p_obj_cco)
+    #
+    cdef int dosend=0, dorecv=0
+    cdef int inter=0, size=0, rank=0
+    CHKERR( MPI_Comm_test_inter(comm, &inter) )
+    if inter:
+        CHKERR( MPI_Comm_remote_size(comm, &size) )
+        if root == MPI_PROC_NULL:
+            dosend=0; dorecv=0;
+        elif root == MPI_ROOT:
+            dosend=1; dorecv=0;
+        else:
+            dosend=0; dorecv=1;
+    else:
+        CHKERR( MPI_Comm_size(comm, &size) )
+        CHKERR( MPI_Comm_rank(comm, &rank) )
+        if root == rank:
+            dosend=1; dorecv=1;
+        else:
+            dosend=0; dorecv=1;
+    state.dorecv = dorecv
+    state.kind = PyMPI_CCO_SCATTER
+    state.root = root
+    state.nprocs = size
+    #
+    if dosend: state.tmp = allocate_count_displ(
+        size, &state.scounts, &state.sdispls)
+    if dosend: state.smsg = pickle_dumpv(
+        pickle, sendobj, &state.sbuf, size, state.scounts, state.sdispls)
+    with PyMPI_Lock(comm, "scatter"):
+        with nogil: CHKERR( MPI_Iscatter_c(
+            state.scounts, 1, MPI_COUNT,
+            &state.length, 1, MPI_COUNT,
+            root, comm, &request.ob_mpi) )
+        state.start(comm, request)
+    #
+    return state
+
+
+cdef object PyMPI_iallgather(object sendobj, MPI_Comm comm,
+                             Request request):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef _p_obj_cco state = _p_obj_cco.__new__(_p_obj_cco)
+    #
+    cdef MPI_Count slength = 0
+    #
+    cdef int inter=0, size=0
+    CHKERR( MPI_Comm_test_inter(comm, &inter) )
+    if inter:
+        CHKERR( MPI_Comm_remote_size(comm, &size) )
+    else:
+        CHKERR( MPI_Comm_size(comm, &size) )
+    state.dosend = 1
+    state.dorecv = 1
+    state.kind = PyMPI_CCO_ALLGATHER
+    state.nprocs = size
+    #
+    state.tmp = allocate_count_displ(size, &state.rcounts, &state.rdispls)
+    state.smsg = pickle_dump_oob(
+        pickle, sendobj, &state.sbuf, &state.scount, &state.stype, &slength)
+    state.length = slength
+    with PyMPI_Lock(comm, "allgather"):
+        with nogil: CHKERR( MPI_Iallgather_c(
+            &state.length, 1, MPI_COUNT,
+            state.rcounts, 1, MPI_COUNT,
+            comm, &request.ob_mpi) )
+        state.start(comm, request)
+    #
+    return state
+
+
+cdef object PyMPI_ialltoall(object sendobj, MPI_Comm comm,
+                            Request request):
+    cdef Pickle pickle = PyMPI_PICKLE
+    cdef _p_obj_cco state = _p_obj_cco.__new__(_p_obj_cco)
+    #
+    cdef MPI_Count *slengths = NULL
+    #
+    cdef int inter=0, size=0
+    CHKERR( MPI_Comm_test_inter(comm, &inter) )
+    if inter:
+        CHKERR( MPI_Comm_remote_size(comm, &size) )
+    else:
+        CHKERR( MPI_Comm_size(comm, &size) )
+    state.dosend = 1
+    state.dorecv = 1
+    state.kind = PyMPI_CCO_ALLTOALL
+    state.nprocs = size
+    #
+    cdef bint oob = pickle_oob(pickle)
+    cdef object tmp1, tmp2, tmp3=None, tmp4=None
+    tmp1 = allocate_count_displ(size, &state.scounts, &state.sdispls)
+    tmp2 = allocate_count_displ(size, &state.rcounts, &state.rdispls)
+    if oob:
+        tmp3 = allocate(size, sizeof(MPI_Count), &slengths)
+        tmp4 = allocate(2*<Py_ssize_t>size, sizeof(MPI_Datatype), &state.stypes)
+        for i in range(size): state.stypes[size+i] = MPI_BYTE
+        state.smsg = pickle_dumpw(
+            pickle, sendobj, &state.sbuf, size,
+            state.scounts, state.sdispls, state.stypes, slengths)
+    else:
+        state.smsg = pickle_dumpv(
+            pickle, sendobj, &state.sbuf, size,
+            state.scounts, state.sdispls)
+        slengths = state.scounts
+    state.tmp = (tmp1, tmp2, tmp3, tmp4)
+    with PyMPI_Lock(comm, "alltoall"):
+        with nogil: CHKERR( MPI_Ialltoall_c(
+            slengths,      1, MPI_COUNT,
+            state.rcounts, 1, MPI_COUNT,
+            comm, &request.ob_mpi) )
+        state.start(comm, request)
+    #
+    return state
+
+
+# The nonblocking reduction gathers the contributions of all processes
+# and reduces them locally on completion, thus every process holds the
+# pickled contributions of all the other processes at the same time.
+
+cdef object PyMPI_iallreduce(object sendobj, object op, MPI_Comm comm,
+                             Request request):
+    cdef _p_obj_cco state = PyMPI_iallgather(sendobj, comm, request)
+    state.op = op
+    return state
+
+# -----------------------------------------------------------------------------
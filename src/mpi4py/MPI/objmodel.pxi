@@ -431,6 +431,9 @@ cdef inline object reduce_Op(Op self):
         "cannot pickle user-defined reduction operation")
     cdef object function = op_user_registry[index]
     cdef object commute = self.Is_commutative()
+    if type(function) is _p_ufunc:
+        function = (<_p_ufunc>function).ufunc
+        return (type(self).Create_from_ufunc, (function, commute,))
     return (type(self).Create, (function, commute,))
 
 #------------------------------------------------------------------------------
@@ -86,23 +86,125 @@ cdef object op_NO_OP(object x, object y):
 
 # -----------------------------------------------------------------------------
 
+cdef extern from * nogil:
+    enum: PyMPI_OP_USER_MAX
+    ctypedef void (*PyMPI_op_user_call_t)(
+        int, void *, void *, MPI_Count, MPI_Datatype,
+    ) noexcept nogil
+    PyMPI_op_user_call_t PyMPI_op_user_call
+    MPI_User_function   *PyMPI_op_user_i[]
+    MPI_User_function_c *PyMPI_op_user_c[]
+
+# -----------------------------------------------------------------------------
+
+# Operations created from NumPy ufuncs are applied to arrays viewing
+# the MPI buffers directly, without wrapping them in Python objects
+# for a user-level callback. NumPy dtypes are resolved once per named
+# MPI datatype, keyed by its Fortran handle. Only datatypes mapping
+# to a NumPy dtype supported by the ufunc are accepted; these are
+# checked before starting reductions, as errors within the MPI
+# callback are unrecoverable.
+
+@cython.final
+@cython.internal
+cdef class _p_ufunc:
+
+    cdef object ufunc
+    cdef object frombuffer
+    cdef object dtype
+    cdef dict   dtypes
+    cdef void      *cache_p[2]
+    cdef MPI_Count  cache_n[2]
+    cdef list       cache_a
+
+    def __cinit__(self, ufunc):
+        from numpy import frombuffer, dtype, ufunc as ufunc_t
+        if not isinstance(ufunc, ufunc_t): raise TypeError(
+            f"expecting a NumPy ufunc, got {type(ufunc).__name__}")
+        if ufunc.nin != 2 or ufunc.nout != 1: raise ValueError(
+            f"expecting a binary ufunc, got {ufunc!r}")
+        self.ufunc = ufunc
+        self.frombuffer = frombuffer
+        self.dtype = dtype
+        self.dtypes = {}
+        self.cache_p[0] = self.cache_p[1] = NULL
+        self.cache_n[0] = self.cache_n[1] = 0
+        self.cache_a = [None, None]
+
+    def __call__(self, x, y, dt):
+        <void> dt # unused
+        return self.ufunc(x, y)
+
+    cdef object getdtype(self, MPI_Datatype datatype):
+        cdef bint cached = named(datatype)
+        cdef object key = MPI_Type_c2f(datatype) if cached else None
+        cdef object dtype = self.dtypes.get(key) if cached else None
+        if dtype is not None:
+            return dtype
+        cdef const char *code = DatatypeCode(datatype)
+        if code == NULL: raise TypeError(
+            "cannot map MPI datatype to NumPy dtype")
+        dtype = self.dtype(pystr(code))
+        cdef object array = self.frombuffer(bytearray(), dtype)
+        self.ufunc(array, array, out=array)
+        if cached: self.dtypes[key] = dtype
+        return dtype
+
+    cdef object asarray(self, void *p, MPI_Count n, object dtype, int i):
+        # arrays are bare views of memory addresses,
+        # reuse them if called again on the same memory
+        cdef object array
+        if self.cache_p[i] == p and self.cache_n[i] == n:
+            array = self.cache_a[i]
+            if array is not None and array.dtype is dtype:
+                return array
+        array = self.frombuffer(mpibuf(p, n), dtype)
+        self.cache_p[i] = p
+        self.cache_n[i] = n
+        self.cache_a[i] = array
+        return array
+
+    cdef int reduce(
+        self, void *a, void *b, MPI_Count n, MPI_Datatype t,
+    ) except -1:
+        cdef object dtype = self.getdtype(t)
+        cdef object x = self.asarray(a, n, dtype, 0)
+        cdef object y = self.asarray(b, n, dtype, 1)
+        self.ufunc(x, y, out=y)
+        return 0
+
+# -----------------------------------------------------------------------------
+
 cdef object op_user_lock     = Lock()
-cdef list   op_user_registry = [None]*(1+32)
+cdef list   op_user_registry = [None]
 
 cdef inline object op_user_py(int index, object x, object y, object dt):
     return op_user_registry[index](x, y, dt)
 
+cdef inline int op_user_check(Op op, MPI_Datatype datatype) except -1:
+    if op.ob_uid <= 0: return 0
+    if datatype == MPI_DATATYPE_NULL: return 0
+    cdef object function = op_user_registry[op.ob_uid]
+    if type(function) is _p_ufunc:
+        (<_p_ufunc>function).getdtype(datatype)
+    return 0
+
 cdef inline void op_user_mpi(
     int index,
     void *a, void *b, MPI_Count n, MPI_Datatype t,
 ) with gil:
     cdef Datatype datatype
+    cdef object function
     # errors in user-defined reduction operations are unrecoverable
     try:
+        function = op_user_registry[index]
+        if type(function) is _p_ufunc:
+            (<_p_ufunc>function).reduce(a, b, n, t)
+            return
         datatype = <Datatype>New(Datatype)
         datatype.ob_mpi = t
         try:
-            op_user_py(index, mpibuf(a, n), mpibuf(b, n), datatype)
+            function(mpibuf(a, n), mpibuf(b, n), datatype)
         finally:
             datatype.ob_mpi = MPI_DATATYPE_NULL
     except:
@@ -116,7 +218,7 @@ cdef inline void op_user_mpi(
         finally:
             <void>MPI_Abort(MPI_COMM_WORLD, 1)
 
-cdef inline void op_user_call(
+cdef void op_user_call(
     int index,
     void *a, void *b, MPI_Count count, MPI_Datatype t,
 ) noexcept nogil:
@@ -133,145 +235,7 @@ cdef inline void op_user_call(
     # make the actual GIL-safe Python call
     op_user_mpi(index, a, b, n, t)
 
-ctypedef fused op_count_t:
-    int
-    MPI_Count
-
-ctypedef fused op_usrfn_t:
-    MPI_User_function
-    MPI_User_function_c
-
-@cython.callspec("MPIAPI")
-cdef void op_user_01(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 1, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_02(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 2, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_03(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 3, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_04(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 4, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_05(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 5, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_06(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 6, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_07(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 7, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_08(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 8, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_09(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call( 9, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_10(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(10, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_11(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(11, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_12(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(12, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_13(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(13, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_14(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(14, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_15(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(15, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_16(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(16, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_17(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(17, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_18(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(18, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_19(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(19, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_20(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(20, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_21(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(21, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_22(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(22, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_23(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(23, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_24(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(24, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_25(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(25, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_26(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(26, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_27(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(27, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_28(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(28, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_29(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(29, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_30(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(30, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_31(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(31, a, b, n[0], t[0])
-@cython.callspec("MPIAPI")
-cdef void op_user_32(void *a, void *b, op_count_t *n, MPI_Datatype *t) noexcept nogil:
-    op_user_call(32, a, b, n[0], t[0])
-
-cdef void op_user_map(int index, op_usrfn_t **fn) noexcept nogil:
-    if   index ==  1: fn[0] = op_user_01
-    elif index ==  2: fn[0] = op_user_02
-    elif index ==  3: fn[0] = op_user_03
-    elif index ==  4: fn[0] = op_user_04
-    elif index ==  5: fn[0] = op_user_05
-    elif index ==  6: fn[0] = op_user_06
-    elif index ==  7: fn[0] = op_user_07
-    elif index ==  8: fn[0] = op_user_08
-    elif index ==  9: fn[0] = op_user_09
-    elif index == 10: fn[0] = op_user_10
-    elif index == 11: fn[0] = op_user_11
-    elif index == 12: fn[0] = op_user_12
-    elif index == 13: fn[0] = op_user_13
-    elif index == 14: fn[0] = op_user_14
-    elif index == 15: fn[0] = op_user_15
-    elif index == 16: fn[0] = op_user_16
-    elif index == 17: fn[0] = op_user_17
-    elif index == 18: fn[0] = op_user_18
-    elif index == 19: fn[0] = op_user_19
-    elif index == 20: fn[0] = op_user_20
-    elif index == 21: fn[0] = op_user_21
-    elif index == 22: fn[0] = op_user_22
-    elif index == 23: fn[0] = op_user_23
-    elif index == 24: fn[0] = op_user_24
-    elif index == 25: fn[0] = op_user_25
-    elif index == 26: fn[0] = op_user_26
-    elif index == 27: fn[0] = op_user_27
-    elif index == 28: fn[0] = op_user_28
-    elif index == 29: fn[0] = op_user_29
-    elif index == 30: fn[0] = op_user_30
-    elif index == 31: fn[0] = op_user_31
-    elif index == 32: fn[0] = op_user_32
-    else:             fn[0] = NULL
+PyMPI_op_user_call = op_user_call
 
 cdef int op_user_new(
     object function,
@@ -280,21 +244,25 @@ cdef int op_user_new(
 ) except -1:
     # check whether the function is callable
     function.__call__
-    # find a free slot in the registry
-    # and register the Python function
+    # find a free slot in the registry, growing
+    # it as needed, and register the Python function
     cdef int index = 0
-    try:
-        with op_user_lock:
+    with op_user_lock:
+        try:
             index = op_user_registry.index(None, 1)
-            op_user_registry[index] = function
-    except ValueError:
-        raise RuntimeError(
-            "cannot create too many user-defined reduction operations",
-        )
-    # map slot index to the associated C callback,
-    # and return the slot index in the registry
-    op_user_map(index, fn_i)
-    op_user_map(index, fn_c)
+        except ValueError:
+            index = len(op_user_registry)
+            if index > PyMPI_OP_USER_MAX:
+                raise RuntimeError(
+                    "cannot create too many "
+                    "user-defined reduction operations",
+                )
+            op_user_registry.append(None)
+        op_user_registry[index] = function
+    # map slot index to the associated C callback (index
+    # zero is reserved), and return the slot index in the registry
+    fn_i[0] = PyMPI_op_user_i[index - 1]
+    fn_c[0] = PyMPI_op_user_c[index - 1]
     return index
 
 cdef int op_user_del(
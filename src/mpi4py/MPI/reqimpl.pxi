@@ -16,6 +16,7 @@ cdef object acquire_rs(
      cdef MPI_Status  *array_s = NULL
      cdef object ob_r = None, ob_s = None
      cdef Py_ssize_t n = len(requests)
+     if irecv_pending: PyMPI_irecv_progress()
      count[0] = <int>n
      ob_r = allocate(n, sizeof(MPI_Request), &array_r)
      for i in range(n):
@@ -42,7 +43,8 @@ cdef int release_rs(
         req = <Request>requests[i]
         req.ob_mpi = rp[i]
         if rp[i] == MPI_REQUEST_NULL:
-            req.ob_buf = None
+            if cco_state(req) is None:
+                req.ob_buf = None
     if statuses is not None and outcount != MPI_UNDEFINED:
         ns = len(statuses)
         if outcount > ns:
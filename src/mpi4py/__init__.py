@@ -40,8 +40,25 @@ class Rc:
         Automatic MPI finalization at exit (default: None).
     fast_reduce : bool
         Use tree-based reductions for objects (default: True).
+    allreduce_algorithm : {"auto", "reduce_bcast", "recursive_doubling"}
+        Algorithm for allreductions of objects (default: "auto").
     recv_mprobe : bool
         Use matched probes to receive objects (default: True).
+    irecv_mprobe : bool
+        Use matched probes to size nonblocking receives of objects
+        (default: False).
+    recv_pool : bool or int
+        Reuse buffers to receive objects, up to a total size in bytes
+        (default: False).
+    lock_stats : bool
+        Collect contention statistics of communicator locks
+        (default: False).
+    pickle_threads : bool or int or "auto"
+        Pickle items of vector collectives with a pool of threads
+        (default: "auto").
+    bcast_chunk : bool or int
+        Broadcast objects in chunks of the given size in bytes
+        (default: False).
     errors : {"exception", "default", "abort", "fatal"}
         Error handling policy (default: "exception").
 
@@ -52,7 +69,13 @@ class Rc:
     thread_level = 'multiple'
     finalize = None
     fast_reduce = True
+    allreduce_algorithm = 'auto'
     recv_mprobe = True
+    irecv_mprobe = False
+    recv_pool = False
+    lock_stats = False
+    pickle_threads = 'auto'
+    bcast_chunk = False
     errors = 'exception'
 
     def __init__(self, **kwargs):
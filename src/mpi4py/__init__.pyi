@@ -13,11 +13,17 @@ class Rc:
     thread_level: str = 'multiple'
     finalize: bool | None = None
     fast_reduce: bool = True
+    allreduce_algorithm: str = 'auto'
     recv_mprobe: bool = True
+    irecv_mprobe: bool = False
+    recv_pool: bool | int = False
+    lock_stats: bool = False
+    pickle_threads: bool | int | str = 'auto'
+    bcast_chunk: bool | int = False
     errors: str = 'exception'
-    def __init__(self, **kwargs: bool | str) -> None: ...
-    def __setattr__(self, name: str, value: bool | str) -> None: ...
-    def __call__(self, **kwargs: bool | str) -> None: ...
+    def __init__(self, **kwargs: bool | int | str) -> None: ...
+    def __setattr__(self, name: str, value: bool | int | str) -> None: ...
+    def __call__(self, **kwargs: bool | int | str) -> None: ...
     def __repr__(self) -> str: ...
 
 rc: Rc = ...
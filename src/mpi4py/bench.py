@@ -1,6 +1,7 @@
 # Author:  Lisandro Dalcin
 # Contact: dalcinl@gmail.com
 """Run MPI benchmarks and tests."""
+# pylint: disable=too-many-lines
 import os as _os
 import sys as _sys
 
@@ -122,6 +123,172 @@ def ringtest(comm, args=None, verbose=True):
     return elapsed
 
 
+def _add_output_arguments(parser):
+    parser.add_argument("--output", action="store",
+                        dest="output", default="text",
+                        choices=["text", "csv", "json"],
+                        help="output format")
+    parser.add_argument("--outfile", action="store",
+                        dest="outfile", default=None,
+                        help="write output to file")
+
+
+def _percentile(data, q):
+    # linear interpolation between closest ranks of sorted data
+    if not data:
+        return float('nan')
+    k = (len(data) - 1) * q / 100
+    i = int(k)
+    j = min(i + 1, len(data) - 1)
+    return data[i] + (data[j] - data[i]) * (k - i)
+
+
+def _summary(t_list):
+    # pylint: disable=import-outside-toplevel
+    import statistics
+    data = sorted(t_list)
+    return {
+        'mean': statistics.mean(data) if data else float('nan'),
+        'stdev': statistics.stdev(data) if len(data) > 1 else 0.0,
+        'p50': _percentile(data, 50),
+        'p95': _percentile(data, 95),
+        'p99': _percentile(data, 99),
+        'samples': len(data),
+    }
+
+
+def _stats_header():
+    return (
+        " | Time Mean [s] \u00b1 StdDev [s]"
+        "    P50 [s]    P95 [s]    P99 [s]  Samples"
+    )
+
+
+def _stats_message(stats):
+    return (
+        f" | {stats['mean']:.7e} \u00b1 {stats['stdev']:.4e}"
+        f" {stats['p50']:.4e} {stats['p95']:.4e} {stats['p99']:.4e}"
+        f" {stats['samples']:8d}"
+    )
+
+
+def _metadata(comm):
+    # pylint: disable=import-outside-toplevel
+    import time
+    import platform
+    from . import __version__, rc, MPI
+    hosts = comm.allgather(MPI.Get_processor_name())
+    return {
+        'mpi4py': __version__,
+        'mpi_version': '.'.join(map(str, MPI.Get_version())),
+        'mpi_library': MPI.Get_library_version().rstrip('\x00').strip(),
+        'python': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'rc': {key: getattr(rc, key)
+               for key in dir(rc) if not key.startswith('_')},
+        'pickle_protocol': MPI.pickle.PROTOCOL,
+        'processes': comm.Get_size(),
+        'hosts': sorted(set(hosts)),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+class _Report:
+    # pylint: disable=too-many-instance-attributes
+    # pylint: disable=missing-function-docstring
+    # Benchmark results are printed in human-readable text by the
+    # benchmark itself, or collected here and written as CSV rows
+    # (with metadata in comment lines) or as a single JSON document.
+
+    def __init__(self, comm, benchmark, options, parameters):
+        self.benchmark = benchmark
+        self.output = options.output
+        self.outfile = options.outfile
+        self.verbose = options.verbose and comm.Get_rank() == 0
+        self.metadata = None
+        if self.output != 'text':
+            self.metadata = _metadata(comm)
+        self.parameters = parameters
+        self.results = []
+        self.stream = None
+
+    def write(self, line):
+        if not self.verbose:
+            return
+        if self.stream is None:
+            if self.outfile is None:
+                self.stream = _sys.stdout
+            else:
+                self.stream = open(  # pylint: disable=consider-using-with
+                    self.outfile, 'w', encoding='utf-8')
+        self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def text(self, line):
+        if self.output == 'text':
+            self.write(line)
+
+    def add(self, size, stats):
+        self.results.append({'size': size, **stats})
+        if self.output == 'csv':
+            if len(self.results) == 1:
+                self._write_csv_header()
+            fields = [self.benchmark, size] + [
+                stats[key] for key in ('mean', 'stdev', 'p50', 'p95', 'p99')
+            ] + [stats['samples']]
+            self.write(','.join(map(str, fields)))
+
+    def _write_csv_header(self):
+        # pylint: disable=import-outside-toplevel
+        import json
+        for key, value in self.metadata.items():
+            self.write(f"# {key}: {json.dumps(value)}")
+        for key, value in self.parameters.items():
+            self.write(f"# {key}: {json.dumps(value)}")
+        self.write("benchmark,size,mean,stdev,p50,p95,p99,samples")
+
+    def close(self):
+        # pylint: disable=import-outside-toplevel
+        if self.output == 'json':
+            import json
+            self.write(json.dumps({
+                'benchmark': self.benchmark,
+                'parameters': self.parameters,
+                'metadata': self.metadata,
+                'results': self.results,
+            }, indent=2))
+        if self.stream not in (None, _sys.stdout):
+            self.stream.close()
+        self.stream = None
+
+
+def _allocator(array):
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=import-error
+    numpy = cupy = numba = None
+    if array == 'numpy':
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            pass
+    elif array == 'cupy':  # pragma: no cover
+        import cupy
+    elif array == 'numba':  # pragma: no cover
+        import numba.cuda
+
+    def allocate(nbytes):  # pragma: no cover
+        if numpy:
+            return numpy.empty(nbytes, 'B')
+        elif cupy:
+            return cupy.empty(nbytes, 'B')
+        elif numba:
+            return numba.cuda.device_array(nbytes, 'B')
+        else:
+            return bytearray(nbytes)
+
+    return allocate, numpy or cupy
+
+
 def pingpong(comm, args=None, verbose=True):
     """Time messages between processes."""
     # pylint: disable=too-many-locals
@@ -177,23 +344,13 @@ def pingpong(comm, args=None, verbose=True):
                         dest="print_header", default=True)
     parser.add_argument("--no-stats", action="store_false",
                         dest="print_stats", default=True)
+    _add_output_arguments(parser)
     options = parser.parse_args(args)
 
-    import statistics
     from . import MPI
     from .util import pkl5
 
-    # pylint: disable=import-error
-    numpy = cupy = numba = None
-    if options.array == 'numpy':
-        try:
-            import numpy
-        except ImportError:  # pragma: no cover
-            pass
-    elif options.array == 'cupy':  # pragma: no cover
-        import cupy
-    elif options.array == 'numba':  # pragma: no cover
-        import numba.cuda
+    allocate, _ = _allocator(options.array)
 
     skip = options.skip
     loop = options.loop
@@ -221,6 +378,13 @@ def pingpong(comm, args=None, verbose=True):
     buf_sizes = [1 << i for i in range(33)]
     buf_sizes = [n for n in buf_sizes if min_size <= n <= max_size]
 
+    mode = "pkl5" if use_outband else "pickle" if use_pickle else "buffer"
+    report = _Report(comm, "pingpong", options, {
+        'mode': mode,
+        'array': options.array,
+        'threshold': threshold,
+    })
+
     wtime = MPI.Wtime
     if use_pickle:
         send = comm.send
@@ -232,16 +396,6 @@ def pingpong(comm, args=None, verbose=True):
         sendrecv = comm.Sendrecv
     s_msg = r_msg = None
 
-    def allocate(nbytes):  # pragma: no cover
-        if numpy:
-            return numpy.empty(nbytes, 'B')
-        elif cupy:
-            return cupy.empty(nbytes, 'B')
-        elif numba:
-            return numba.cuda.device_array(nbytes, 'B')
-        else:
-            return bytearray(nbytes)
-
     def run_pingpong():
         rank = comm.Get_rank()
         size = comm.Get_size()
@@ -283,31 +437,429 @@ def pingpong(comm, args=None, verbose=True):
 
         s_msg = r_msg = None
 
-        t_mean = statistics.mean(t_list) if t_list else float('nan')
-        t_stdev = statistics.stdev(t_list) if len(t_list) > 1 else 0.0
+        stats = _summary(t_list)
+        t_mean, t_stdev = stats['mean'], stats['stdev']
+        result.append((nbytes, t_mean, t_stdev))
+        report.add(nbytes, stats)
+
+        if options.print_header:
+            options.print_header = False
+            report.text("# MPI PingPong Test")
+            header = "# Size [B]  Bandwidth [MB/s]"
+            if options.print_stats:
+                header += _stats_header()
+            report.text(header)
+        bandwidth = nbytes / t_mean
+        message = f"{nbytes:10d}{bandwidth/1e6:18.2f}"
+        if options.print_stats:
+            message += _stats_message(stats)
+        report.text(message)
+
+    report.close()
+    return result
+
+
+_COLLECTIVES = {
+    'barrier': "Barrier",
+    'bcast': "Bcast",
+    'allgather': "Allgather",
+    'alltoall': "Alltoall",
+    'alltoallv': "Alltoallv",
+    'allreduce': "Allreduce",
+    'reduce_scatter': "Reduce_scatter",
+}
+
+
+def _maxlist(xs, ys):
+    return list(map(max, xs, ys))
+
+
+def _collective(name, comm, args=None, verbose=True):
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-branches
+    # pylint: disable=too-many-statements
+    # pylint: disable=import-outside-toplevel
+    from argparse import ArgumentParser
+    parser = ArgumentParser(prog=_prog(name))
+    parser.add_argument("-q", "--quiet", action="store_false",
+                        dest="verbose", default=verbose,
+                        help="quiet output")
+    parser.add_argument("-m", "--min-size", type=int,
+                        dest="min_size", default=1,
+                        help="minimum message size")
+    parser.add_argument("-n", "--max-size", type=int,
+                        dest="max_size", default=1 << 20,
+                        help="maximum message size")
+    parser.add_argument("-s", "--skip", type=int,
+                        dest="skip", default=100,
+                        help="number of warm-up iterations")
+    parser.add_argument("-l", "--loop", type=int,
+                        dest="loop", default=1000,
+                        help="number of iterations")
+    parser.add_argument("-a", "--array", action="store",
+                        dest="array", default="numpy",
+                        choices=["numpy", "cupy", "numba", "none"],
+                        help="use NumPy/CuPy/Numba arrays")
+    parser.add_argument("-p", "--pickle", action="store_true",
+                        dest="pickle", default=False,
+                        help="use pickle-based collectives")
+    parser.add_argument("--protocol", type=int,
+                        dest="protocol", default=None,
+                        help="pickle protocol version")
+    parser.add_argument("-o", "--outband", action="store_true",
+                        dest="outband", default=False,
+                        help="use out-of-band pickle-based collectives")
+    parser.add_argument("--threshold", type=int,
+                        dest="threshold", default=None,
+                        help="size threshold for out-of-band pickle buffers")
+    parser.add_argument("--skip-large", type=int,
+                        dest="skip_large", default=10)
+    parser.add_argument("--loop-large", type=int,
+                        dest="loop_large", default=100)
+    parser.add_argument("--large-size", type=int,
+                        dest="large_size", default=1 << 13)
+    parser.add_argument("--skip-huge", type=int,
+                        dest="skip_huge", default=1)
+    parser.add_argument("--loop-huge", type=int,
+                        dest="loop_huge", default=10)
+    parser.add_argument("--huge-size", type=int,
+                        dest="huge_size", default=1 << 20)
+    parser.add_argument("--no-header", action="store_false",
+                        dest="print_header", default=True)
+    parser.add_argument("--no-stats", action="store_false",
+                        dest="print_stats", default=True)
+    _add_output_arguments(parser)
+    options = parser.parse_args(args)
+
+    from functools import partial, reduce
+    from . import MPI
+    from .util import pkl5
+
+    allocate, arithmetic = _allocator(options.array)
+
+    skip = options.skip
+    loop = options.loop
+    min_size = options.min_size
+    max_size = options.max_size
+    skip_large = options.skip_large
+    loop_large = options.loop_large
+    large_size = options.large_size
+    skip_huge = options.skip_huge
+    loop_huge = options.loop_huge
+    huge_size = options.huge_size
+
+    use_pickle = options.pickle or options.outband
+    use_outband = options.outband
+    protocol = options.protocol if use_pickle else None
+    threshold = options.threshold if use_outband else None
+
+    world = comm
+    if use_outband:
+        comm = pkl5.Intracomm(comm)
+    if protocol is not None:
+        MPI.pickle.PROTOCOL = protocol
+    if threshold is not None:
+        pkl5.pickle.THRESHOLD = threshold
+
+    if name == 'barrier':
+        buf_sizes = [0]
+    else:
+        buf_sizes = [1 << i for i in range(33)]
+        buf_sizes = [n for n in buf_sizes if min_size <= n <= max_size]
+
+    wtime = MPI.Wtime
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    # pickle-based reductions use elementwise sums for array types
+    # supporting arithmetic operations, otherwise a trivial operation
+    op = MPI.SUM if arithmetic else MPI.REPLACE
+
+    def setup_buffer(nbytes):
+        # pylint: disable=too-many-return-statements
+        byte, uchar = MPI.BYTE, MPI.UNSIGNED_CHAR
+        if name == 'barrier':
+            return comm.Barrier
+        if name == 'bcast':
+            return partial(
+                comm.Bcast, [allocate(nbytes), byte], 0)
+        if name == 'allgather':
+            return partial(
+                comm.Allgather,
+                [allocate(nbytes), byte],
+                [allocate(nbytes * size), byte])
+        if name == 'alltoall':
+            return partial(
+                comm.Alltoall,
+                [allocate(nbytes * size), byte],
+                [allocate(nbytes * size), byte])
+        if name == 'alltoallv':
+            counts = [nbytes] * size
+            displs = [nbytes * i for i in range(size)]
+            return partial(
+                comm.Alltoallv,
+                [allocate(nbytes * size), (counts, displs), byte],
+                [allocate(nbytes * size), (counts, displs), byte])
+        if name == 'allreduce':
+            return partial(
+                comm.Allreduce,
+                [allocate(nbytes), uchar],
+                [allocate(nbytes), uchar], MPI.SUM)
+        assert name == 'reduce_scatter'  # noqa: S101
+        return partial(
+            comm.Reduce_scatter_block,
+            [allocate(nbytes * size), uchar],
+            [allocate(nbytes), uchar], MPI.SUM)
+
+    def setup_pickle(nbytes):
+        # pylint: disable=too-many-return-statements
+        if name == 'barrier':
+            return comm.barrier
+        if name == 'bcast':
+            obj = allocate(nbytes) if rank == 0 else None
+            return partial(comm.bcast, obj, 0)
+        if name == 'allgather':
+            return partial(comm.allgather, allocate(nbytes))
+        if name in ('alltoall', 'alltoallv'):
+            objs = [allocate(nbytes) for _ in range(size)]
+            return partial(comm.alltoall, objs)
+        if name == 'allreduce':
+            obj = allocate(nbytes)
+            if use_outband:
+                return lambda: reduce(op, comm.allgather(obj))
+            return partial(comm.allreduce, obj, op)
+        assert name == 'reduce_scatter'  # noqa: S101
+        objs = [allocate(nbytes) for _ in range(size)]
+        return lambda: reduce(op, comm.alltoall(objs))
+
+    setup = setup_pickle if use_pickle else setup_buffer
+    mode = "pkl5" if use_outband else "pickle" if use_pickle else "buffer"
+    title = f"MPI {_COLLECTIVES[name]} Test"
+    report = _Report(world, name, options, {
+        'mode': mode,
+        'array': options.array,
+        'threshold': threshold,
+    })
+
+    result = []
+    for nbytes in buf_sizes:
+        if nbytes > large_size:
+            skip = min(skip, skip_large)
+            loop = min(loop, loop_large)
+        if nbytes > huge_size:
+            skip = min(skip, skip_huge)
+            loop = min(loop, loop_huge)
+        iterations = list(range(loop + skip))
+
+        run = setup(nbytes)
+
+        t_list = []
+        world.Barrier()
+        for i in iterations:
+            t_start = wtime()
+            run()
+            t_end = wtime()
+            if i >= skip:
+                t_list.append(t_end - t_start)
+
+        run = None
+        t_list = world.allreduce(t_list, op=_maxlist)
+
+        stats = _summary(t_list)
+        t_mean, t_stdev = stats['mean'], stats['stdev']
         result.append((nbytes, t_mean, t_stdev))
+        report.add(nbytes, stats)
 
-        if options.verbose and comm.rank == 0:
-            if options.print_header:
-                options.print_header = False
-                print("# MPI PingPong Test")
-                header = "# Size [B]  Bandwidth [MB/s]"
-                if options.print_stats:
-                    header += " | Time Mean [s] \u00b1 StdDev [s]  Samples"
-                print(header, flush=True)
-            bandwidth = nbytes / t_mean
-            message = f"{nbytes:10d}{bandwidth/1e6:18.2f}"
+        if options.print_header:
+            options.print_header = False
+            report.text(f"# {title} [{size} processes, {mode}]")
+            header = "# Size [B]  Latency [us]"
             if options.print_stats:
-                message += f" | {t_mean:.7e} \u00b1 {t_stdev:.4e} {loop:8d}"
-            print(message, flush=True)
+                header += _stats_header()
+            report.text(header)
+        message = f"{nbytes:10d}{t_mean*1e6:14.2f}"
+        if options.print_stats:
+            message += _stats_message(stats)
+        report.text(message)
 
+    report.close()
     return result
 
 
+def barrier(comm, args=None, verbose=True):
+    """Time barrier synchronization."""
+    return _collective('barrier', comm, args, verbose)
+
+
+def bcast(comm, args=None, verbose=True):
+    """Time broadcast of messages."""
+    return _collective('bcast', comm, args, verbose)
+
+
+def allgather(comm, args=None, verbose=True):
+    """Time gather-to-all of messages."""
+    return _collective('allgather', comm, args, verbose)
+
+
+def alltoall(comm, args=None, verbose=True):
+    """Time all-to-all scatter/gather of messages."""
+    return _collective('alltoall', comm, args, verbose)
+
+
+def alltoallv(comm, args=None, verbose=True):
+    """Time vector all-to-all scatter/gather of messages."""
+    return _collective('alltoallv', comm, args, verbose)
+
+
+def allreduce(comm, args=None, verbose=True):
+    """Time reduce-to-all of messages."""
+    return _collective('allreduce', comm, args, verbose)
+
+
+def reduce_scatter(comm, args=None, verbose=True):
+    """Time reduce-scatter of messages."""
+    return _collective('reduce_scatter', comm, args, verbose)
+
+
 def _fn_identity(arg):  # pragma: no cover
     return arg
 
 
+def halo(comm, args=None, verbose=True):
+    """Time exchanges of objects with neighbor processes."""
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-statements
+    # pylint: disable=too-many-branches
+    # pylint: disable=import-outside-toplevel
+    from argparse import ArgumentParser
+    parser = ArgumentParser(prog=_prog("halo"))
+    parser.add_argument("-q", "--quiet", action="store_false",
+                        dest="verbose", default=verbose,
+                        help="quiet output")
+    parser.add_argument("-m", "--min-size", type=int,
+                        dest="min_size", default=1,
+                        help="minimum message size")
+    parser.add_argument("-n", "--max-size", type=int,
+                        dest="max_size", default=1 << 16,
+                        help="maximum message size")
+    parser.add_argument("-s", "--skip", type=int,
+                        dest="skip", default=100,
+                        help="number of warm-up iterations")
+    parser.add_argument("-l", "--loop", type=int,
+                        dest="loop", default=10000,
+                        help="number of iterations")
+    parser.add_argument("-P", "--persistent", action="store_true",
+                        dest="persistent", default=False,
+                        help="use persistent send_init/recv_init requests")
+    parser.add_argument("--no-header", action="store_false",
+                        dest="print_header", default=True)
+    parser.add_argument("--no-stats", action="store_false",
+                        dest="print_stats", default=True)
+    _add_output_arguments(parser)
+    options = parser.parse_args(args)
+
+    from . import MPI
+
+    skip = options.skip
+    loop = options.loop
+    buf_sizes = [1 << i for i in range(33)]
+    buf_sizes = [
+        n for n in buf_sizes
+        if options.min_size <= n <= options.max_size
+    ]
+
+    wtime = MPI.Wtime
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    left = (rank - 1) % size
+    right = (rank + 1) % size
+
+    mode = "persistent" if options.persistent else "nonblocking"
+    report = _Report(comm, "halo", options, {
+        'mode': mode,
+    })
+
+    def setup_nonblocking(box):
+        bufsize = len(MPI.pickle.dumps(box)) + 64
+
+        def run():
+            requests = [
+                comm.irecv(bufsize, left, 0),
+                comm.irecv(bufsize, right, 1),
+                comm.isend(box, right, 0),
+                comm.isend(box, left, 1),
+            ]
+            MPI.Request.waitall(requests)
+
+        def free():
+            pass
+
+        return run, free
+
+    def setup_persistent(box):
+        bufsize = len(MPI.pickle.dumps(box)) + 64
+        requests = [
+            comm.recv_init(bufsize, left, 0),
+            comm.recv_init(bufsize, right, 1),
+            comm.send_init(box, right, 0),
+            comm.send_init(box, left, 1),
+        ]
+
+        def run():
+            MPI.Prequest.startall(requests)
+            MPI.Prequest.waitall(requests)
+
+        def free():
+            for request in requests:
+                request.Free()
+
+        return run, free
+
+    setup = setup_persistent if options.persistent else setup_nonblocking
+
+    result = []
+    for nbytes in buf_sizes:
+        box = [bytes(nbytes)]
+        run, free = setup(box)
+
+        t_list = []
+        comm.Barrier()
+        for i in range(loop + skip):
+            t_start = wtime()
+            run()
+            t_end = wtime()
+            if i >= skip:
+                t_list.append(t_end - t_start)
+
+        free()
+        t_list = comm.allreduce(t_list, op=_maxlist)
+
+        stats = _summary(t_list)
+        t_mean, t_stdev = stats['mean'], stats['stdev']
+        result.append((nbytes, t_mean, t_stdev))
+        report.add(nbytes, stats)
+
+        if options.print_header:
+            options.print_header = False
+            report.text(f"# MPI Halo Exchange Test [{size} processes, {mode}]")
+            header = "# Size [B]  Latency [us]"
+            if options.print_stats:
+                header += _stats_header()
+            report.text(header)
+        message = f"{nbytes:10d}{t_mean*1e6:14.2f}"
+        if options.print_stats:
+            message += _stats_message(stats)
+        report.text(message)
+
+    report.close()
+    return result
+
+
+def _group_size(value):
+    if value == 'node':
+        return value
+    return int(value)
+
+
 def futures(comm, args=None, verbose=True):
     """Measure mpi4py.futures task throughput."""
     # pylint: disable=too-many-locals
@@ -353,10 +905,31 @@ def futures(comm, args=None, verbose=True):
         "-b", "--backoff", help="backoff parameter",
         type=float, dest="backoff", default=0.0,
     )
+    parser.add_argument(
+        "--batch-size", help="batch_size parameter",
+        type=int, dest="batch_size", default=1,
+    )
+    parser.add_argument(
+        "--prefetch", help="prefetch parameter",
+        type=int, dest="prefetch", default=0,
+    )
+    parser.add_argument(
+        "--group-size", help="group_size parameter",
+        type=_group_size, dest="group_size", default=1,
+    )
+    parser.add_argument(
+        "-d", "--dispatch", help="dispatch mode",
+        action="store", dest="dispatch", default="poll",
+        choices=["poll", "event"],
+    )
     parser.add_argument(
         "-o", "--outband", help="use out-of-band pickle",
         action="store_true", dest="outband", default=False,
     )
+    parser.add_argument(
+        "--latency", help="measure task round-trip latency",
+        action="store_true", dest="latency", default=False,
+    )
     parser.add_argument(
         "-s", "--skip", help="number of warm-up iterations",
         type=int, dest="skip", default=1,
@@ -397,10 +970,10 @@ def futures(comm, args=None, verbose=True):
         "--no-stats",
         action="store_false", dest="print_stats", default=True,
     )
+    _add_output_arguments(parser)
     options = parser.parse_args(args)
 
     import time
-    import statistics
     import concurrent.futures
     from .futures import MPIPoolExecutor
 
@@ -409,8 +982,13 @@ def futures(comm, args=None, verbose=True):
     tasks = options.tasks
     allocator = options.allocator
     backoff = options.backoff
+    dispatch = options.dispatch
+    batch_size = options.batch_size
+    prefetch = options.prefetch
+    group_size = options.group_size
     use_pkl5 = options.outband
     chunksize = options.chunksize
+    latency = options.latency
 
     skip = options.skip
     loop = options.loop
@@ -459,6 +1037,10 @@ def futures(comm, args=None, verbose=True):
         return MPIPoolExecutor(
             max_workers=workers,
             backoff=backoff,
+            dispatch=dispatch,
+            batch_size=batch_size,
+            prefetch=prefetch,
+            group_size=group_size,
             use_pkl5=use_pkl5,
         )
 
@@ -476,15 +1058,37 @@ def futures(comm, args=None, verbose=True):
         for _ in iterator:
             pass
 
+    def executor_roundtrip(task, data):
+        submit = executor.submit
+        for item in data:
+            submit(task, item).result()
+
     def run_futures():
         t_start = wtime()
-        executor_map(_fn_identity, data)
+        if latency:
+            executor_roundtrip(_fn_identity, data)
+        else:
+            executor_map(_fn_identity, data)
         t_end = wtime()
         return t_end - t_start
 
     executor = create_executor()
     num_workers = get_num_workers()
     num_tasks = num_workers * tasks
+    report = _Report(comm, "futures", options, {
+        'executor': executor_type,
+        'workers': num_workers,
+        'tasks': num_tasks,
+        'allocator': allocator,
+        'chunksize': chunksize,
+        'backoff': backoff,
+        'dispatch': dispatch,
+        'batch_size': batch_size,
+        'prefetch': prefetch,
+        'group_size': group_size,
+        'outband': use_pkl5,
+        'latency': latency,
+    })
 
     result = []
     prime_executor()
@@ -507,32 +1111,102 @@ def futures(comm, args=None, verbose=True):
 
         data = None
 
-        t_mean = statistics.mean(t_list) if t_list else float('nan')
-        t_stdev = statistics.stdev(t_list) if len(t_list) > 1 else 0.0
+        stats = _summary(t_list)
+        t_mean, t_stdev = stats['mean'], stats['stdev']
         result.append((nbytes, t_mean, t_stdev))
+        report.add(nbytes, stats)
 
-        if options.verbose and comm.rank == 0:
-            if options.print_header:
-                options.print_header = False
-                print(
-                    f"# {type(executor).__name__} - "
-                    f"{num_workers} workers, "
-                    f"{tasks} tasks/worker"
-                )
+        if options.print_header:
+            options.print_header = False
+            report.text(
+                f"# {type(executor).__name__} - "
+                f"{num_workers} workers, "
+                f"{tasks} tasks/worker"
+            )
+            if latency:
+                header = "# Size [B]  Latency [us]"
+            else:
                 header = "# Size [B]  Tasks/s"
-                if options.print_stats:
-                    header += " | Time Mean [s] \u00b1 StdDev [s]  Samples"
-                print(header, flush=True)
+            if options.print_stats:
+                header += _stats_header()
+            report.text(header)
+        if latency:
+            roundtrip = t_mean / num_tasks
+            message = f"{nbytes:10d}{roundtrip*1e6:14.2f}"
+        else:
             throughput = num_tasks / t_mean
             message = f"{nbytes:10d}{throughput:9.0f}"
-            if options.print_stats:
-                message += f" | {t_mean:.7e} \u00b1 {t_stdev:.4e} {loop:8d}"
-            print(message, flush=True)
+        if options.print_stats:
+            message += _stats_message(stats)
+        report.text(message)
 
+    report.close()
     executor.shutdown()
     return result
 
 
+def compare(comm, args=None, verbose=True):
+    """Compare benchmark results and flag regressions."""
+    # pylint: disable=too-many-locals
+    # pylint: disable=import-outside-toplevel
+    from argparse import ArgumentParser
+    parser = ArgumentParser(prog=_prog("compare"))
+    parser.add_argument("-q", "--quiet", action="store_false",
+                        dest="verbose", default=verbose,
+                        help="quiet output")
+    parser.add_argument("-t", "--threshold", type=float,
+                        dest="threshold", default=0.1,
+                        help="relative slowdown flagged as regression")
+    parser.add_argument("-k", "--key", action="store",
+                        dest="key", default="p50",
+                        choices=["mean", "p50", "p95", "p99"],
+                        help="statistic to compare")
+    parser.add_argument("baseline", metavar="<baseline>",
+                        help="JSON output of the baseline run")
+    parser.add_argument("current", metavar="<current>",
+                        help="JSON output of the current run")
+    options = parser.parse_args(args)
+
+    import json
+    with open(options.baseline, encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    with open(options.current, encoding='utf-8') as fh:
+        current = json.load(fh)
+
+    key = options.key
+    threshold = options.threshold
+    benchmark = current['benchmark']
+    if baseline['benchmark'] != benchmark:
+        parser.error(
+            f"cannot compare {baseline['benchmark']!r} "
+            f"with {benchmark!r} results"
+        )
+    old = {item['size']: item[key] for item in baseline['results']}
+    new = {item['size']: item[key] for item in current['results']}
+
+    def write(line):
+        if options.verbose and comm.Get_rank() == 0:
+            print(line, flush=True)
+
+    write(f"# Compare {benchmark} [{key}, threshold {threshold:.1%}]")
+    for label, data in (("Baseline", baseline), ("Current", current)):
+        metadata = data.get('metadata') or {}
+        library = metadata.get('mpi_library', '').splitlines()[:1]
+        write(f"# {label}: {''.join(library)}")
+    write("# Size [B]  Baseline [s]   Current [s]   Change")
+    regressions = []
+    for size in sorted(old.keys() & new.keys()):
+        t_old, t_new = old[size], new[size]
+        change = (t_new - t_old) / t_old if t_old > 0 else 0.0
+        message = f"{size:10d}{t_old:14.4e}{t_new:14.4e}{change:+9.1%}"
+        if change > threshold:
+            regressions.append((size, t_old, t_new))
+            message += "  REGRESSION"
+        write(message)
+    write(f"# {len(regressions)} regression(s)")
+    return regressions
+
+
 def main(args=None):
     """Entry-point for ``python -m mpi4py.bench``."""
     # pylint: disable=import-outside-toplevel
@@ -571,7 +1245,9 @@ def main(args=None):
             parser.error(f"unknown command {options.command!r}")
         parser.exit(2)
     command = main.commands[options.command]
-    command(comm, options.args)
+    result = command(comm, options.args)
+    if command is compare and result:
+        parser.exit(1)
     parser.exit()
 
 
@@ -579,7 +1255,16 @@ main.commands = {  # type: ignore[attr-defined]
     'helloworld': helloworld,
     'ringtest': ringtest,
     'pingpong': pingpong,
+    'barrier': barrier,
+    'bcast': bcast,
+    'allgather': allgather,
+    'alltoall': alltoall,
+    'alltoallv': alltoallv,
+    'allreduce': allreduce,
+    'reduce_scatter': reduce_scatter,
+    'halo': halo,
     'futures': futures,
+    'compare': compare,
 }
 
 if __name__ == '__main__':
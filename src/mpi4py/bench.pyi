@@ -4,5 +4,14 @@ from .MPI import Intracomm
 def helloworld(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> str: ...
 def ringtest(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> float: ...
 def pingpong(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def barrier(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def bcast(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def allgather(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def alltoall(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def alltoallv(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def allreduce(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def reduce_scatter(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def halo(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
 def futures(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
+def compare(comm: Intracomm, args: Sequence[str] | None = None, verbose: bool = True) -> list[tuple[int, float, float]]: ...
 def main(args: Sequence[str] | None = ...) -> None: ...
@@ -12,6 +12,7 @@ import os
 import sys
 import time
 import atexit
+import hashlib
 import weakref
 import warnings
 import itertools
@@ -21,6 +22,7 @@ import collections
 
 from .. import MPI
 from ..util import pkl5
+from ._base import Future
 from ._base import BrokenExecutor
 
 
@@ -144,16 +146,536 @@ class Backoff:
         time.sleep(self.tval)
         self.tval = min(self.tmax, max(self.tmin, self.tval * 2))
 
+    def wait(self, event):
+        event.wait(self.tval)
+        self.tval = min(self.tmax, max(self.tmin, self.tval * 2))
+
+
+DISPATCH = 'poll'
+DISPATCH_MODES = ('poll', 'event')
+
+
+def _getenv_dispatch():
+    value = os_environ_get('DISPATCH')
+    if value is None:
+        return None
+    if value.lower() in DISPATCH_MODES:
+        return value.lower()
+    warnings.warn(
+        f"environment variable MPI4PY_FUTURES_DISPATCH: "
+        f"unexpected value {value!r}",
+        RuntimeWarning, stacklevel=1,
+    )
+    return None
+
+
+def _getopt_dispatch(options):
+    dispatch = options.get('dispatch')
+    if dispatch is None:
+        dispatch = _getenv_dispatch()
+    if dispatch is None:
+        dispatch = DISPATCH
+    return dispatch
+
+
+def _setopt_dispatch(options):
+    options['dispatch'] = _getopt_dispatch(options)
+
+
+def _getopt_batch(options):
+    batch_size = int(options.get('batch_size') or 1)
+    batch_linger = float(options.get('batch_linger') or 0.0)
+    return max(batch_size, 1), max(batch_linger, 0.0)
+
+
+class Waker:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.request = None
+
+    def __call__(self):
+        self.event.set()
+        if self.request is not None:
+            with self.lock:
+                request, self.request = self.request, None
+            if request is not None:
+                request.Complete()
+
+    def clear(self):
+        self.event.clear()
+
+    def wait(self, timeout=None):
+        self.event.wait(timeout)
+
+    def arm(self):
+        request = MPI.Grequest.Start(None, None, None)
+        with self.lock:
+            self.request = request
+        return request
+
+    def disarm(self, request):
+        with self.lock:
+            armed = self.request is request
+            self.request = None
+        if armed:
+            request.Complete()
+        request.Wait()
+
+
+class Notifier:
+    # pylint: disable=too-many-instance-attributes
+    # Workers send an empty notification message right before
+    # every result. The manager waits for these notifications
+    # and for task submissions, either blocking in the MPI progress
+    # engine (thread level MPI_THREAD_MULTIPLE) or sleeping on
+    # a wake-up event signaled from the task queue.
+
+    def __init__(self, comm, tag, backoff, worker_set, task_queue):
+        self.tag = tag
+        self.backoff = backoff
+        self.worker_set = worker_set
+        self.task_queue = task_queue
+        self.blocking = serialized.lock is None
+        self.waker = task_queue.waker = Waker()
+        self.requests = {}
+        self.ready = collections.deque()
+        self.comm_irecv = serialized(comm.Irecv)
+        self.request_testsome = serialized(MPI.Request.Testsome)
+
+    def close(self):
+        self.task_queue.waker = None
+
+    def post(self, pid):
+        # Post at most one notification receive per worker, and only
+        # after the result following the previous notification has
+        # been received, otherwise the receive would match the result.
+        if pid in self.requests or pid in self.ready:
+            return
+        request = self.comm_irecv([None, 'B'], pid, self.tag)
+        self.requests[pid] = request
+
+    def test(self):
+        if not self.requests:
+            return
+        pids = list(self.requests)
+        requests = list(self.requests.values())
+        indices = self.request_testsome(requests) or ()
+        for index in indices:
+            pid = pids[index]
+            del self.requests[pid]
+            self.ready.append(pid)
+
+    def wait(self, timeout=None):
+        waker = self.waker
+        backoff = self.backoff
+        worker_set = self.worker_set
+        task_queue = self.task_queue
+        if self.blocking and self.requests and timeout is None:
+            backoff.reset()
+            pids = list(self.requests)
+            requests = list(self.requests.values())
+            if worker_set:
+                request = waker.arm()
+                if not task_queue:
+                    index = MPI.Request.Waitany([*requests, request])
+                else:
+                    index = len(requests)
+                waker.disarm(request)
+            else:
+                index = MPI.Request.Waitany(requests)
+            if index < len(pids):
+                pid = pids[index]
+                del self.requests[pid]
+                self.ready.append(pid)
+            return
+        waker.clear()
+        if task_queue and worker_set and timeout is None:
+            backoff.reset()
+        elif worker_set and not self.requests:
+            backoff.reset()
+            waker.wait(timeout)
+        else:
+            backoff.wait(waker.event)
+
+
+def _getopt_prefetch(options):
+    prefetch = int(options.get('prefetch') or 0)
+    return max(prefetch, 0)
+
+
+def _setopt_prefetch(options, workers):
+    prefetch = _getopt_prefetch(options)
+    workers.extend(list(workers) * prefetch)
+
+
+def _getopt_cache_size(options):
+    cache_size = int(options.get('cache_size') or 0)
+    return max(cache_size, 0)
+
+
+class FuncRef(bytes):
+    __slots__ = ()
+
+
+class FuncCacheUpdate(tuple):
+    __slots__ = ()
+
+
+class FuncCache:
+    # The manager replaces callables with content digests of their
+    # pickled representation. Callables are pickled again at every
+    # submission, thus mutating the state of a callable changes its
+    # digest; the cache saves workers the transfer and unpickling.
+    # Workers are told explicitly which callables to store and evict
+    # ahead of the tasks using them, thus the cache contents are kept
+    # in sync even if unpickling a task message fails in the worker.
+
+    def __init__(self, size):
+        self.size = size
+        self.workers = {}
+        self.pinned = set()
+        self.ops = []
+
+    def lookup(self, func):
+        data = MPI.pickle.dumps(func)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        return digest, data
+
+    def encode(self, pid, task):
+        func, args, kwargs = task
+        digest, data = self.lookup(func)
+        cache = self.workers.get(pid)
+        if cache is None:
+            cache = self.workers[pid] = collections.OrderedDict()
+        if digest in cache:
+            cache.move_to_end(digest)
+        else:
+            cache[digest] = None
+            self.ops.append((digest, data))
+        self.pinned.add(digest)
+        if len(cache) > self.size:
+            for key in cache:
+                if key not in self.pinned:
+                    del cache[key]
+                    self.ops.append((key, None))
+                    break
+        return (FuncRef(digest), args, kwargs)
+
+    def flush(self):
+        ops, self.ops = self.ops, []
+        self.pinned.clear()
+        return FuncCacheUpdate(ops) if ops else None
+
 
 class TaskQueue(collections.deque):
-    put = collections.deque.append
+    waker = None
+    stats = None
+
+    def put(self, item):
+        self.append(item)
+        if self.waker is not None:
+            self.waker()
+
     pop = collections.deque.popleft
     add = collections.deque.appendleft
 
 
+def _getopt_stats(options):
+    return bool(options.get('stats'))
+
+
+class TaskStats(tuple):
+    __slots__ = ()
+
+
+class Stats:
+    # Counters and histograms of task timings, updated by the manager
+    # once per message. Workers report their timings along with
+    # results, the time spent sending a result is reported with
+    # the next one. Histogram bucket i counts times in the range
+    # [2**(i-1), 2**i) microseconds, bucket 0 counts times below
+    # one microsecond, and the last bucket counts all longer times.
+
+    keys = ('queue', 'send', 'recv', 'load', 'exec', 'dump')
+    nbins = 32
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timer = time.perf_counter
+        self.reset()
+
+    def reset(self):
+        self.start = self.timer()
+        self.tasks = 0
+        self.metrics = {
+            key: [0, 0.0, 0.0, [0] * self.nbins]
+            for key in self.keys
+        }
+        self.workers = {}
+
+    def add(self, key, value):
+        metric = self.metrics[key]
+        metric[0] += 1
+        metric[1] += value
+        metric[2] = max(metric[2], value)
+        index = int(value * 1e6).bit_length()
+        metric[3][min(index, self.nbins - 1)] += 1
+
+    def send(self, futures, start, stop):
+        with self.lock:
+            self.add('send', stop - start)
+            for future in futures:
+                submitted = getattr(future, '_submitted', start)
+                self.add('queue', max(start - submitted, 0.0))
+
+    def recv(self, pid, count, start, stop, times):
+        with self.lock:
+            self.tasks += count
+            self.add('recv', stop - start)
+            worker = self.workers.get(pid)
+            if worker is None:
+                worker = self.workers[pid] = [0, 0.0]
+            worker[0] += count
+            if times is None:
+                return
+            load, execs, dump = times
+            if load is not None:
+                self.add('load', load)
+            if dump is not None:
+                self.add('dump', dump)
+            for value in execs:
+                self.add('exec', value)
+                worker[1] += value
+
+    def snapshot(self, reset=False):
+        with self.lock:
+            elapsed = self.timer() - self.start
+            data = {
+                'elapsed': elapsed,
+                'tasks': self.tasks,
+                'throughput': self.tasks / elapsed if elapsed else 0.0,
+            }
+            for key, (count, total, maximum, hist) in self.metrics.items():
+                data[key] = {
+                    'count': count,
+                    'total': total,
+                    'mean': total / count if count else 0.0,
+                    'max': maximum,
+                    'histogram': list(hist),
+                }
+            data['workers'] = {
+                pid: {
+                    'tasks': tasks,
+                    'busy': busy,
+                    'utilization': busy / elapsed if elapsed else 0.0,
+                }
+                for pid, (tasks, busy) in sorted(self.workers.items())
+            }
+            if reset:
+                self.reset()
+        return data
+
+
 class WorkerSet(collections.deque):
+    # Schedulers keep the slots of idle workers. The manager takes
+    # a slot with pop(key) for the task at the head of the queue,
+    # given its affinity key (or None), and returns it with add(pid)
+    # once the worker can take another task. Workers are located
+    # with locate(nodes), nodes[pid] being the node of worker pid.
+    # This scheduler hands out slots in FIFO order.
     add = collections.deque.append
-    pop = collections.deque.popleft
+
+    def pop(self, key=None):
+        # pylint: disable=arguments-differ,unused-argument
+        return self.popleft()
+
+    def locate(self, nodes):
+        pass
+
+
+class LocalityWorkerSet:
+    # Idle worker slots are grouped by node. A task with an affinity
+    # key goes to the node that took the first task with that key,
+    # or to the next node with idle workers if that node is busy.
+    # Tasks without affinity key take nodes in round-robin order.
+
+    capacity = 1 << 16  # maximum number of affinity keys tracked
+
+    def __init__(self, iterable=()):
+        self.lock = threading.Lock()
+        self.nodes = {}
+        self.slots = collections.OrderedDict()
+        self.homes = collections.OrderedDict()
+        self.count = 0
+        self.extend(iterable)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with self.lock:
+            pids = [pid for slots in self.slots.values() for pid in slots]
+        return iter(pids)
+
+    def extend(self, iterable):
+        for pid in iterable:
+            self.add(pid)
+
+    def clear(self):
+        with self.lock:
+            self.slots.clear()
+            self.homes.clear()
+            self.count = 0
+
+    def add(self, pid):
+        with self.lock:
+            node = self.nodes.get(pid)
+            slots = self.slots.get(node)
+            if slots is None:
+                slots = self.slots[node] = collections.deque()
+            slots.append(pid)
+            self.count += 1
+
+    def pop(self, key=None):
+        with self.lock:
+            if not self.count:
+                raise LookupError("no idle workers")
+            node = slots = None
+            if key is not None:
+                node = self.homes.get(key)
+            if node is not None:
+                self.homes.move_to_end(key)
+                slots = self.slots.get(node)
+            if not slots:
+                node = next(
+                    node for node, slots in self.slots.items() if slots
+                )
+                slots = self.slots[node]
+                self.slots.move_to_end(node)
+                if key is not None and key not in self.homes:
+                    self.homes[key] = node
+                    if len(self.homes) > self.capacity:
+                        self.homes.popitem(last=False)
+            self.count -= 1
+            return slots.popleft()
+
+    def locate(self, nodes):
+        pids = list(self)
+        names = {}
+        self.nodes = {
+            pid: names.setdefault(name, len(names))
+            for pid, name in enumerate(nodes)
+        }
+        self.clear()
+        self.extend(pids)
+
+
+SCHEDULER = 'fifo'
+SCHEDULERS = {
+    'fifo': WorkerSet,
+    'locality': LocalityWorkerSet,
+}
+
+
+def _getopt_scheduler(options):
+    return options.get('scheduler') or SCHEDULER
+
+
+def _setopt_scheduler(options, workers):
+    scheduler = SCHEDULERS[_getopt_scheduler(options)]
+    if not isinstance(workers, scheduler):
+        workers = scheduler(workers)
+    return workers
+
+
+def _locate(options):
+    return (
+        _getopt_scheduler(options) != SCHEDULER
+        or _getopt_group_size(options) == 'node'
+    )
+
+
+def client_locate(comm):
+    return serialized(comm.gather)(None, MPI.ROOT)
+
+
+def server_locate(comm):
+    comm.gather(MPI.Get_processor_name(), 0)
+
+
+def _affinity(item):
+    return getattr(item[0], '_affinity', None) if item else None
+
+
+def _getopt_group_size(options):
+    group_size = options.get('group_size') or 1
+    if group_size == 'node':
+        return group_size
+    return max(int(group_size), 1)
+
+
+def _split(options):
+    return _getopt_group_size(options) != 1
+
+
+def _split_groups(options, nodes, size):
+    # Every worker is assigned to the group of its leader, which
+    # is the worker with the lowest rank in the group. Leaders of
+    # groups with two or more workers act as sub-managers.
+    group_size = _getopt_group_size(options)
+    if group_size == 'node':
+        leaders = {}
+        return [
+            leaders.setdefault(node, pid)
+            for pid, node in enumerate(nodes)
+        ]
+    return [pid - pid % group_size for pid in range(size)]
+
+
+def client_split(comm, options, nodes):
+    size = comm.Get_remote_size()
+    leaders = _split_groups(options, nodes, size)
+    serialized(bcast_send)(comm, leaders)
+    intracomm = serialized(comm.Merge)(False)
+    serialized(intracomm.Split)(MPI.UNDEFINED, 0)
+    serialized(intracomm.Free)()
+    # The manager sees sub-managers as workers able to run as
+    # many tasks at once as workers in their group. Slots are
+    # interleaved to spread tasks evenly among groups.
+    counts = collections.Counter(leaders)
+    slots = [max(count - 1, 1) for count in counts.values()]
+    return [
+        pid
+        for index in range(max(slots))
+        for pid, count in zip(counts, slots)
+        if index < count
+    ]
+
+
+def server_split(comm):
+    leaders = bcast_recv(comm)
+    rank = comm.Get_rank()
+    intracomm = comm.Merge(True)
+    group = intracomm.Split(leaders[rank], rank)
+    intracomm.Free()
+    if group.Get_size() == 1:
+        group.Free()
+        return None
+    leader = group.Get_rank() == 0
+    local = group.Split(int(not leader), 0)
+    intercomm = local.Create_intercomm(0, group, int(leader), 0)
+    local.Free()
+    group.Free()
+    return (intercomm, leader)
+
+
+def _setopt_workers(options, workers, slots):
+    if slots is not None:
+        workers.clear()
+        workers.extend(slots)
+        _setopt_prefetch(options, workers)
 
 
 THREADS_QUEUES = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
@@ -179,6 +701,8 @@ class Pool:
         self.size = None
         self.event = threading.Event()
         self.queue = queue = TaskQueue()
+        if _getopt_stats(executor._options):
+            queue.stats = Stats()
         self.exref = weakref.ref(executor, lambda _, q=queue: q.put(None))
 
         args = (self, executor._options, *args)
@@ -194,11 +718,20 @@ class Pool:
         self.event.wait()
 
     def push(self, item):
+        stats = self.queue.stats
+        if stats is not None:
+            item[0]._submitted = stats.timer()
         self.queue.put(item)
 
     def done(self):
         self.queue.put(None)
 
+    def stats(self, reset=False):
+        stats = self.queue.stats
+        if stats is None:
+            return None
+        return stats.snapshot(reset)
+
     def join(self):
         self.thread.join()
 
@@ -328,14 +861,21 @@ def _manager_comm(pool, options, comm, full=True):
     assert comm.Is_inter()        # noqa: S101
     assert comm.Get_size() == 1   # noqa: S101
     serialized(client_sync)(comm, options, full)
+    nodes = client_locate(comm) if _locate(options) else None
+    slots = client_split(comm, options, nodes) if _split(options) else None
     comm = client_comm(comm, options)
     if not client_init(comm, options):
         pool.broken("initializer failed")
         serialized(client_close)(comm)
         return
     size = comm.Get_remote_size()
-    queue = pool.setup(size)
-    workers = WorkerSet(range(size))
+    if slots is None:
+        slots = range(size)
+    queue = pool.setup(len(slots))
+    workers = _setopt_scheduler(options, slots)
+    if nodes is not None:
+        workers.locate(nodes)
+    _setopt_prefetch(options, workers)
     client_exec(comm, options, 0, workers, queue)
     serialized(client_close)(comm)
 
@@ -405,11 +945,29 @@ def _set_shared_pool(obj):
     SharedPool = obj
 
 
-def _manager_shared(pool, options, comm, tag, workers):
+def _manager_shared(pool, options, comm, tag, workers, ready):
+    # pylint: disable=too-many-arguments
+    # Managers of executors other than the first one wait for the
+    # first manager to set up the workers, as sub-managers change
+    # the workers that tasks can be sent to.
     if tag == 0:
-        comm = MPI.Intercomm(comm)
-        serialized(client_sync)(comm, options)
-        comm = client_comm(comm, options)
+        size = None
+        try:
+            comm = MPI.Intercomm(comm)
+            serialized(client_sync)(comm, options)
+            nodes = client_locate(comm) if _locate(options) else None
+            slots = None
+            if _split(options):
+                slots = client_split(comm, options, nodes)
+            _setopt_workers(options, workers, slots)
+            if nodes is not None:
+                workers.locate(nodes)
+            comm = client_comm(comm, options)
+            size = comm.Get_remote_size() if slots is None else len(slots)
+        finally:
+            ready.set_result(size)
+    else:
+        size = ready.result()
     if tag == 0:
         if not client_init(comm, options):
             pool.broken("initializer failed")
@@ -418,7 +976,9 @@ def _manager_shared(pool, options, comm, tag, workers):
         if options.get('initializer') is not None:
             pool.broken("cannot run initializer")
             return
-    size = comm.Get_remote_size()
+    if size is None:  # pragma: no cover
+        pool.broken("cannot set up workers")
+        return
     queue = pool.setup(size)
     client_exec(comm, options, tag, workers, queue)
 
@@ -430,6 +990,8 @@ class SharedPoolCtx:
         self.on_root = None
         self.counter = None
         self.workers = None
+        self.ready = None
+        self.dispatch = None
         self.threads = weakref.WeakKeyDictionary()
 
     def __call__(self, executor):
@@ -439,8 +1001,15 @@ class SharedPoolCtx:
             if tag == 0:
                 options = executor._options
                 self.comm = client_comm(self.comm, options)
+                _setopt_dispatch(options)
+                self.workers = _setopt_scheduler(options, self.workers)
+                _setopt_prefetch(options, self.workers)
+                self.ready = Future()
+                self.dispatch = options['dispatch']
+            else:
+                executor._options['dispatch'] = self.dispatch
             manager = _manager_shared
-            args = (self.comm, tag, self.workers)
+            args = (self.comm, tag, self.workers, self.ready)
         else:
             manager, args = _manager_thread, ()
         pool = Pool(executor, manager, *args)
@@ -475,9 +1044,15 @@ class SharedPoolCtx:
                 client_close(comm)
             else:
                 options = server_sync(comm)
+                if _locate(options):
+                    server_locate(comm)
+                group = server_split(comm) if _split(options) else None
                 comm = server_comm(comm, options)
                 server_init(comm)
-                server_exec(comm, options)
+                if group is None:
+                    server_exec(comm, options)
+                else:
+                    server_relay(comm, options, *group)
                 server_close(comm)
         if not self.on_root:
             join_threads(self.threads)
@@ -486,6 +1061,8 @@ class SharedPoolCtx:
         self.on_root = None
         self.counter = None
         self.workers = None
+        self.ready = None
+        self.dispatch = None
         self.threads.clear()
         return False
 
@@ -579,6 +1156,7 @@ def bcast_recv(comm):
 def client_sync(comm, options, full=True):
     barrier(comm)
     _setopt_use_pkl5(options)
+    _setopt_dispatch(options)
     if full:
         options = _sync_get_data(options)
     bcast_send(comm, options)
@@ -599,16 +1177,32 @@ def client_init(comm, options):
 
 def client_exec(comm, options, tag, worker_set, task_queue):
     # pylint: disable=too-many-locals
+    # pylint: disable=too-many-branches
     # pylint: disable=too-many-statements
     backoff = Backoff(_getopt_backoff(options))
+    dispatch = _getopt_dispatch(options)
+    batch_size, batch_linger = _getopt_batch(options)
+    batch_timer = None
+    cache_size = _getopt_cache_size(options)
+    stats = task_queue.stats
+    timer = time.perf_counter
 
     status = MPI.Status()
     comm_recv = serialized(comm.recv)
     comm_isend = serialized(comm.issend)
     comm_iprobe = serialized(comm.iprobe)
     request_free = serialized(_get_mpi(comm).Request.Free)
+    request_wait = serialized(_get_mpi(comm).Request.wait)
+    pickle_dumps = MPI.pickle.dumps
 
     pending = {}
+    notifier = None
+    if dispatch == 'event':
+        notifier = Notifier(comm, tag, backoff, worker_set, task_queue)
+    updates = {}
+    cache = None
+    if cache_size:
+        cache = FuncCache(cache_size)
 
     def iprobe():
         pid = MPI.ANY_SOURCE
@@ -620,17 +1214,40 @@ def client_exec(comm, options, tag, worker_set, task_queue):
         while not comm_iprobe(pid, tag, status):
             backoff.sleep()
 
-    def recv():
-        pid = MPI.ANY_SOURCE
+    def recv(pid=MPI.ANY_SOURCE):
+        start = timer() if stats is not None else None
         try:
             task = comm_recv(None, pid, tag, status)
         except BaseException:
             task = (None, sys_exception())
+        times = None
+        if isinstance(task, TaskStats):
+            task, times = task
         pid = status.source
         worker_set.add(pid)
 
-        future, request = pending.pop(pid)
-        request_free(request)
+        queue = pending[pid]
+        future, requests = queue.popleft()
+        if not queue:
+            del pending[pid]
+        elif notifier is not None:
+            notifier.post(pid)
+        for request in requests:
+            request_free(request)
+        if stats is not None:
+            count = len(future) if isinstance(future, list) else 1
+            stats.recv(pid, count, start, timer(), times)
+        if isinstance(future, list):
+            results = task if isinstance(task, list) else [task] * len(future)
+            for item in zip(future, results):
+                complete(*item)
+            del results
+        else:
+            complete(future, task)
+
+        del future, task, requests
+
+    def complete(future, task):
         result, exception = task
         if exception is None:
             future.set_result(result)
@@ -640,12 +1257,124 @@ def client_exec(comm, options, tag, worker_set, task_queue):
         del result, exception
         del future, task
 
+    def linger():
+        nonlocal batch_timer
+        if len(task_queue) >= batch_size or task_queue[-1] is None:
+            batch_timer = None
+            return 0.0
+        now = time.monotonic()
+        if batch_timer is None:
+            batch_timer = now + batch_linger
+        if now >= batch_timer:
+            batch_timer = None
+            return 0.0
+        return batch_timer - now
+
+    def collect(count):
+        items = []
+        while len(items) < count:
+            try:
+                item = task_queue.pop()
+            except LookupError:  # pragma: no cover
+                break
+            if item is None:
+                if not items:
+                    return None
+                task_queue.add(item)
+                break
+            future, task = item
+            if future.set_running_or_notify_cancel():
+                items.append(item)
+            del future, task, item
+        return items
+
+    def issue(pid, future, request):
+        requests = [*updates.pop(pid, ()), request]
+        queue = pending.get(pid)
+        if queue is None:
+            queue = pending[pid] = collections.deque()
+        queue.append((future, requests))
+        if notifier is not None:
+            notifier.post(pid)
+
+    def update(pid):
+        message = cache.flush()
+        if message is not None:
+            request = comm_isend(message, pid, tag)
+            updates.setdefault(pid, []).append(request)
+
+    def encode(pid, items):
+        keep = []
+        for future, task in items:
+            try:
+                task = cache.encode(pid, task)
+            except BaseException:
+                future.set_exception(sys_exception())
+            else:
+                keep.append((future, task))
+        try:
+            update(pid)
+        except BaseException:
+            exception = sys_exception()
+            for future, _ in keep:
+                future.set_exception(exception)
+            return []
+        return keep
+
+    def discard(items, exception):
+        keep = []
+        for future, task in items:
+            try:
+                pickle_dumps(task)
+            except BaseException:
+                future.set_exception(sys_exception())
+            else:
+                keep.append((future, task))
+        if len(keep) < len(items):
+            return keep
+        for future, _ in items:
+            future.set_exception(exception)
+        return []
+
+    def send_batch(pid):
+        count = -(-len(task_queue) // (len(worker_set) + 1))
+        count = max(1, min(count, batch_size))
+        items = collect(count)
+        if items is None:
+            worker_set.add(pid)
+            return True
+
+        if cache is not None:
+            items = encode(pid, items)
+
+        while items:
+            futures = [future for future, _ in items]
+            tasks = [task for _, task in items]
+            start = timer() if stats is not None else None
+            try:
+                request = comm_isend(tasks, pid, tag)
+            except BaseException:
+                items = discard(items, sys_exception())
+                continue
+            if stats is not None:
+                stats.send(futures, start, timer())
+            issue(pid, futures, request)
+            break
+        else:
+            worker_set.add(pid)
+
+        del items
+        return None
+
     def send():
         try:
-            pid = worker_set.pop()
+            pid = worker_set.pop(_affinity(task_queue[0]))
         except LookupError:  # pragma: no cover
             return False
 
+        if batch_size > 1:
+            return send_batch(pid)
+
         try:
             item = task_queue.pop()
         except LookupError:  # pragma: no cover
@@ -662,8 +1391,14 @@ def client_exec(comm, options, tag, worker_set, task_queue):
             return False
 
         try:
+            if cache is not None:
+                task = cache.encode(pid, task)
+                update(pid)
+            start = timer() if stats is not None else None
             request = comm_isend(task, pid, tag)
-            pending[pid] = (future, request)
+            if stats is not None:
+                stats.send((future,), start, timer())
+            issue(pid, future, request)
         except BaseException:
             worker_set.add(pid)
             future.set_exception(sys_exception())
@@ -671,12 +1406,43 @@ def client_exec(comm, options, tag, worker_set, task_queue):
         del future, task, item
         return None
 
+    if notifier is not None:
+        ready = notifier.ready
+        while True:
+            delay = None
+            if task_queue and worker_set:
+                delay = linger() if batch_linger else 0.0
+                if not delay:
+                    stop = send()
+                    if stop:
+                        break
+                    continue
+            if not ready:
+                notifier.test()
+            if ready:
+                recv(ready.popleft())
+                continue
+            notifier.wait(delay)
+        while pending:
+            if not ready:
+                notifier.test()
+            if not ready:
+                notifier.wait()
+            if ready:
+                recv(ready.popleft())
+        notifier.close()
+        for requests in updates.values():
+            for request in requests:
+                request_wait(request)
+        return
+
     while True:
         if task_queue and worker_set:
-            backoff.reset()
-            stop = send()
-            if stop:
-                break
+            if not batch_linger or not linger():
+                backoff.reset()
+                stop = send()
+                if stop:
+                    break
         if pending and iprobe():
             backoff.reset()
             recv()
@@ -684,6 +1450,9 @@ def client_exec(comm, options, tag, worker_set, task_queue):
     while pending:
         probe()
         recv()
+    for requests in updates.values():
+        for request in requests:
+            request_wait(request)
 
 
 def client_close(comm):
@@ -718,13 +1487,26 @@ def server_init(comm):
 
 
 def server_exec(comm, options):
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-statements
     backoff = Backoff(_getopt_backoff(options))
+    dispatch = _getopt_dispatch(options)
+    stats = _getopt_stats(options)
+    timer = time.perf_counter
+    load = dump = None
+    execs = []
 
     status = MPI.Status()
     comm_recv = comm.recv
     comm_isend = comm.issend
     comm_iprobe = comm.iprobe
+    comm_probe = comm.probe
+    comm_send = comm.Send
     request_test = _get_mpi(comm).Request.test
+    request_wait = _get_mpi(comm).Request.wait
+    pickle_dumps = MPI.pickle.dumps
+    pickle_loads = MPI.pickle.loads
+    caches = {}
 
     def exception():
         exc = sys_exception()
@@ -732,44 +1514,324 @@ def server_exec(comm, options):
         return _wrap_exc(exc, tb)
 
     def recv():
+        nonlocal load
         pid, tag = MPI.ANY_SOURCE, MPI.ANY_TAG
-        backoff.reset()
-        while not comm_iprobe(pid, tag, status):
-            backoff.sleep()
+        if dispatch == 'event':
+            comm_probe(pid, tag, status)
+        else:
+            backoff.reset()
+            while not comm_iprobe(pid, tag, status):
+                backoff.sleep()
         pid, tag = status.source, status.tag
+        start = timer() if stats else None
         try:
             task = comm_recv(None, pid, tag, status)
         except BaseException:
             task = exception()
+        if stats:
+            load = timer() - start
         return task
 
+    def check(item):
+        try:
+            pickle_dumps(item)
+            return item
+        except BaseException:
+            return (None, exception())
+
+    def update(message):
+        cache = caches.setdefault(status.tag, {})
+        for digest, data in message:
+            if data is None:
+                cache.pop(digest, None)
+            else:
+                cache[digest] = data
+
+    def lookup(digest):
+        cache = caches.get(status.tag, {})
+        try:
+            func = cache[digest]
+        except KeyError:
+            raise LookupError("callable not found in cache") from None
+        if isinstance(func, bytes):
+            func = cache[digest] = pickle_loads(func)
+        return func
+
     def call(task):
         if isinstance(task, BaseException):
             return (None, task)
+        if isinstance(task, list):
+            return [call(item) for item in task]
         func, args, kwargs = task
+        start = timer() if stats else None
         try:
+            if isinstance(func, FuncRef):
+                func = lookup(func)
             result = func(*args, **kwargs)
             return (result, None)
         except BaseException:
             return (None, exception())
+        finally:
+            if stats:
+                execs.append(timer() - start)
+
+    def pack(task, times):
+        if times is None:
+            return task
+        return TaskStats((task, times))
 
     def send(task):
+        nonlocal dump
         pid, tag = status.source, status.tag
+        times = start = None
+        if stats:
+            times = (load, execs[:], dump)
+            execs.clear()
+        if dispatch == 'event':
+            comm_send([None, 'B'], pid, tag)
+        if stats:
+            start = timer()
         try:
-            request = comm_isend(task, pid, tag)
+            request = comm_isend(pack(task, times), pid, tag)
         except BaseException:
-            task = (None, exception())
-            request = comm_isend(task, pid, tag)
+            if isinstance(task, list):
+                task = [check(item) for item in task]
+            else:
+                task = (None, exception())
+            request = comm_isend(pack(task, times), pid, tag)
+        if stats:
+            dump = timer() - start
+        return request
+
+    def wait(request):
+        if dispatch == 'event':
+            request_wait(request)
+            return
         backoff.reset()
         while not request_test(request)[0]:
             backoff.sleep()
 
+    request = None
     while True:
         task = recv()
         if task is None:
             break
+        if isinstance(task, FuncCacheUpdate):
+            update(task)
+            continue
         task = call(task)
-        send(task)
+        if request is not None:
+            wait(request)
+        request = send(task)
+    if request is not None:
+        wait(request)
+
+
+def relay_exec(comm, local, options):
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-statements
+    # Sub-managers receive tasks from the manager and run them in
+    # a pool of the workers in their group, managed from a thread.
+    # Results are sent back to the manager in the order tasks were
+    # received, as the manager expects them from regular workers.
+    # In event dispatch mode with MPI_THREAD_MULTIPLE, a receiver thread
+    # blocks in the MPI progress engine waiting for messages from the
+    # manager, and the relay sleeps on the event signaled by either the
+    # receiver thread or the completion of tasks.
+    setup_mpi_threads()
+    backoff = Backoff(_getopt_backoff(options))
+    dispatch = _getopt_dispatch(options)
+    blocking = dispatch == 'event' and serialized.lock is None
+
+    status = MPI.Status()
+    comm_recv = serialized(comm.recv)
+    comm_isend = serialized(comm.issend)
+    comm_iprobe = serialized(comm.iprobe)
+    comm_probe = serialized(comm.probe)
+    comm_send = serialized(comm.Send)
+    request_test = serialized(_get_mpi(comm).Request.test)
+    request_wait = serialized(_get_mpi(comm).Request.wait)
+    pickle_dumps = MPI.pickle.dumps
+    pickle_loads = MPI.pickle.loads
+    caches = {}
+    replies = {}
+    event = threading.Event()
+
+    task_queue = TaskQueue()
+    worker_set = WorkerSet(range(local.Get_remote_size()))
+    _setopt_prefetch(options, worker_set)
+    thread = threading.Thread(
+        target=client_exec,
+        args=(local, options, 0, worker_set, task_queue),
+    )
+    thread.start()
+
+    def exception(exc):
+        cause = exc.__cause__
+        if isinstance(cause, RemoteTraceback):
+            tb = cause.args[0]
+        else:
+            tb = _format_exc(exc, comm)
+        return _wrap_exc(exc, tb)
+
+    def check(item):
+        try:
+            pickle_dumps(item)
+            return item
+        except BaseException:
+            return (None, exception(sys_exception()))
+
+    def update(tag, message):
+        cache = caches.setdefault(tag, {})
+        for digest, data in message:
+            if data is None:
+                cache.pop(digest, None)
+            else:
+                cache[digest] = data
+
+    def lookup(tag, digest):
+        cache = caches.get(tag, {})
+        try:
+            func = cache[digest]
+        except KeyError:
+            raise LookupError("callable not found in cache") from None
+        if isinstance(func, bytes):
+            func = cache[digest] = pickle_loads(func)
+        return func
+
+    def submit(tag, task):
+        future = Future()
+        future.add_done_callback(lambda _: event.set())
+        try:
+            if isinstance(task, BaseException):
+                raise task
+            func, args, kwargs = task
+            if isinstance(func, FuncRef):
+                func = lookup(tag, func)
+        except BaseException:
+            future.set_exception(sys_exception())
+        else:
+            task_queue.put((future, (func, args, kwargs)))
+        del task
+        return future
+
+    def recv(pid, tag, status):
+        try:
+            return comm_recv(None, pid, tag, status)
+        except BaseException:
+            return sys_exception()
+
+    def receive(inbox):
+        status = MPI.Status()
+        while True:
+            comm_probe(MPI.ANY_SOURCE, MPI.ANY_TAG, status)
+            pid, tag = status.source, status.tag
+            task = recv(pid, tag, status)
+            inbox.append((tag, task))
+            event.set()
+            if task is None:
+                break
+
+    def process(tag, task):
+        if task is None:
+            return False
+        if isinstance(task, FuncCacheUpdate):
+            update(tag, task)
+            return True
+        if isinstance(task, list):
+            entry = [submit(tag, item) for item in task]
+        else:
+            entry = submit(tag, task)
+        replies.setdefault(tag, collections.deque()).append(entry)
+        return True
+
+    def result(future):
+        exc = future.exception()
+        if exc is None:
+            return (future.result(), None)
+        return (None, exception(exc))
+
+    def send(tag, entry):
+        if isinstance(entry, list):
+            task = [result(future) for future in entry]
+        else:
+            task = result(entry)
+        if dispatch == 'event':
+            comm_send([None, 'B'], 0, tag)
+        try:
+            request = comm_isend(task, 0, tag)
+        except BaseException:
+            if isinstance(task, list):
+                task = [check(item) for item in task]
+            else:
+                task = (None, exception(sys_exception()))
+            request = comm_isend(task, 0, tag)
+        return request
+
+    def wait(request):
+        if dispatch == 'event':
+            request_wait(request)
+            return
+        backoff.reset()
+        while not request_test(request)[0]:
+            backoff.sleep()
+
+    def done(entry):
+        if isinstance(entry, list):
+            return all(future.done() for future in entry)
+        return entry.done()
+
+    def flush(request):
+        for tag, entries in replies.items():
+            while entries and done(entries[0]):
+                if request is not None:
+                    wait(request)
+                request = send(tag, entries.popleft())
+        return request
+
+    request = None
+    if blocking:
+        inbox = collections.deque()
+        receiver = threading.Thread(target=receive, args=(inbox,))
+        receiver.start()
+        running = True
+        while running:
+            event.wait()
+            event.clear()
+            request = flush(request)
+            while inbox:
+                running = process(*inbox.popleft())
+        receiver.join()
+    else:
+        while True:
+            if event.is_set():
+                event.clear()
+                backoff.reset()
+                request = flush(request)
+            if comm_iprobe(MPI.ANY_SOURCE, MPI.ANY_TAG, status):
+                backoff.reset()
+                pid, tag = status.source, status.tag
+                if not process(tag, recv(pid, tag, status)):
+                    break
+                continue
+            backoff.wait(event)
+    task_queue.put(None)
+    thread.join()
+    request = flush(request)
+    if request is not None:
+        wait(request)
+
+
+def server_relay(comm, options, local, leader):
+    if isinstance(comm, pkl5.Comm):
+        local = pkl5.Intercomm(local)
+    if leader:
+        relay_exec(comm, local, options)
+        client_close(local)
+    else:
+        server_exec(local, options)
+        server_close(local)
+        comm.recv(None, 0, 0)
 
 
 def server_close(comm):
@@ -1129,9 +2191,15 @@ def server_main_comm(comm, full=True):
     assert comm.Is_inter()              # noqa: S101
     assert comm.Get_remote_size() == 1  # noqa: S101
     options = server_sync(comm, full)
+    if _locate(options):
+        server_locate(comm)
+    group = server_split(comm) if _split(options) else None
     comm = server_comm(comm, options)
     server_init(comm)
-    server_exec(comm, options)
+    if group is None:
+        server_exec(comm, options)
+    else:
+        server_relay(comm, options, *group)
     server_close(comm)
 
 
@@ -2,7 +2,8 @@ from typing import Any, Generic, TypeVar
 from typing import Callable, Iterable, Iterator, Sequence, Mapping
 import weakref
 import threading
-from ..MPI  import Info, Intracomm, Intercomm
+import collections
+from ..MPI  import Info, Intracomm, Intercomm, Request, Grequest
 from ._base import Executor, Future
 
 _T = TypeVar("_T")
@@ -26,15 +27,126 @@ class Backoff:
     def __init__(self, seconds: float = BACKOFF) -> None: ...
     def reset(self) -> None: ...
     def sleep(self) -> None: ...
+    def wait(self, event: threading.Event) -> None: ...
+
+DISPATCH: str = ...
+DISPATCH_MODES: tuple[str, ...] = ...
+
+class Waker:
+    lock: threading.Lock
+    event: threading.Event
+    request: Grequest | None
+    def __init__(self) -> None: ...
+    def __call__(self) -> None: ...
+    def clear(self) -> None: ...
+    def wait(self, timeout: float | None = None) -> None: ...
+    def arm(self) -> Grequest: ...
+    def disarm(self, request: Grequest) -> None: ...
+
+class Notifier:
+    tag: int
+    backoff: Backoff
+    worker_set: WorkerSet[int]
+    task_queue: TaskQueue[Any]
+    blocking: bool
+    waker: Waker
+    requests: dict[int, Request]
+    ready: collections.deque[int]
+    def __init__(self,
+        comm: Intercomm,
+        tag: int,
+        backoff: Backoff,
+        worker_set: WorkerSet[int],
+        task_queue: TaskQueue[Any],
+    ) -> None: ...
+    def close(self) -> None: ...
+    def post(self, pid: int) -> None: ...
+    def test(self) -> None: ...
+    def wait(self, timeout: float | None = None) -> None: ...
+
+class FuncRef(bytes): ...
+class FuncCacheUpdate(tuple[tuple[bytes, bytes | None], ...]): ...
+
+class FuncCache:
+    size: int
+    workers: dict[int, collections.OrderedDict[bytes, None]]
+    pinned: set[bytes]
+    ops: list[tuple[bytes, bytes | None]]
+    def __init__(self, size: int) -> None: ...
+    def lookup(self, func: Callable[..., Any]) -> tuple[bytes, bytes]: ...
+    def encode(self, pid: int, task: _Task[_T]) -> tuple[FuncRef, tuple[Any, ...], dict[str, Any]]: ...
+    def flush(self) -> FuncCacheUpdate | None: ...
 
 class TaskQueue(Generic[_T]):
-    def put(self, x: _T) -> None: ...
+    waker: Waker | None
+    stats: Stats | None
+    def put(self, item: _T) -> None: ...
     def pop(self) -> _T: ...
     def add(self, x: _T) -> None: ...
 
+class TaskStats(tuple[Any, ...]): ...
+
+class Stats:
+    keys: tuple[str, ...]
+    nbins: int
+    lock: threading.Lock
+    timer: Callable[[], float]
+    start: float
+    tasks: int
+    metrics: dict[str, list[Any]]
+    workers: dict[int, list[Any]]
+    def __init__(self) -> None: ...
+    def reset(self) -> None: ...
+    def add(self, key: str, value: float) -> None: ...
+    def send(
+        self,
+        futures: Iterable[Future[Any]],
+        start: float,
+        stop: float,
+    ) -> None: ...
+    def recv(
+        self,
+        pid: int,
+        count: int,
+        start: float,
+        stop: float,
+        times: tuple[float | None, list[float], float | None] | None,
+    ) -> None: ...
+    def snapshot(self, reset: bool = False) -> dict[str, Any]: ...
+
 class WorkerSet(Generic[_T]):
     def add(self, x: _T) -> None: ...
-    def pop(self) -> _T: ...
+    def pop(self, key: Any = None) -> _T: ...
+    def locate(self, nodes: Sequence[str]) -> None: ...
+
+class LocalityWorkerSet:
+    capacity: int
+    lock: threading.Lock
+    nodes: dict[int, int]
+    slots: collections.OrderedDict[int | None, collections.deque[int]]
+    homes: collections.OrderedDict[Any, int | None]
+    count: int
+    def __init__(self, iterable: Iterable[int] = ()) -> None: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[int]: ...
+    def extend(self, iterable: Iterable[int]) -> None: ...
+    def clear(self) -> None: ...
+    def add(self, pid: int) -> None: ...
+    def pop(self, key: Any = None) -> int: ...
+    def locate(self, nodes: Sequence[str]) -> None: ...
+
+SCHEDULER: str = ...
+SCHEDULERS: dict[str, type[WorkerSet[int] | LocalityWorkerSet]] = ...
+
+def client_locate(comm: Intercomm) -> list[str]: ...
+def server_locate(comm: Intercomm) -> None: ...
+
+def client_split(
+    comm: Intercomm,
+    options: Any,
+    nodes: Sequence[str] | None,
+) -> list[int]: ...
+def server_split(comm: Intercomm) -> tuple[Intercomm, bool] | None: ...
 
 _WeakKeyDict = weakref.WeakKeyDictionary
 _ThreadQueueMap = _WeakKeyDict[threading.Thread, TaskQueue[_Item[Any] | None]]
@@ -55,6 +167,7 @@ class Pool:
     def wait(self) -> None: ...
     def push(self, item: _Item[Any]) -> None: ...
     def done(self) -> None: ...
+    def stats(self, reset: bool = False) -> dict[str, Any] | None: ...
     def join(self) -> None: ...
     def setup(self, size: int) -> TaskQueue[_Item[Any] | None]: ...
     def cancel(self, handler: Callable[[Future[Any]], None] | None = None) -> None: ...
@@ -74,6 +187,8 @@ class SharedPoolCtx:
     on_root: bool | None
     counter: Iterator[int]
     workers: WorkerSet[int]
+    ready: Future[int | None] | None
+    dispatch: str | None
     threads: _ThreadQueueMap
     def __init__(self) -> None: ...
     def __call__(self, executor: Executor) -> Pool: ...
@@ -97,6 +212,13 @@ def server_sync(comm: Intercomm, full: bool = True) -> Any: ...
 def server_comm(comm: Intercomm, options: Any) -> Intercomm: ...
 def server_init(comm: Intercomm) -> bool: ...
 def server_exec(comm: Intercomm, options: Any) -> None: ...
+def relay_exec(comm: Intercomm, local: Intercomm, options: Any) -> None: ...
+def server_relay(
+    comm: Intercomm,
+    options: Any,
+    local: Intercomm,
+    leader: bool,
+) -> None: ...
 def server_close(comm: Intercomm) -> None: ...
 
 def get_comm_world() -> Intracomm: ...
@@ -6,11 +6,16 @@ import sys
 import time
 import functools
 import itertools
+import operator
 import threading
+import collections
 
 from ._base import Future
 from ._base import Executor
 from ._base import as_completed
+from ._base import wait
+from ._base import FIRST_COMPLETED
+from ._base import TimeoutError
 
 from . import _lib
 
@@ -43,6 +48,15 @@ class MPIPoolExecutor(Executor):
             wdir: Path to set current working directory in workers.
             env: Environment variables to update ``os.environ`` in workers.
             use_pkl5: If ``True``, use pickle5 out-of-band for communication.
+            backoff: Maximum number of seconds to sleep while idle-waiting.
+            dispatch: Either ``'poll'`` or ``'event'``, see documentation.
+            batch_size: Maximum number of tasks to send in a single message.
+            batch_linger: Maximum number of seconds to wait to fill a batch.
+            prefetch: Number of tasks to send ahead to busy workers.
+            cache_size: Maximum number of callables to cache in workers.
+            scheduler: Either ``'fifo'`` or ``'locality'``, see documentation.
+            group_size: Number of workers per sub-manager, or ``'node'``.
+            stats: If ``True``, collect task timing statistics.
 
         """
         if max_workers is not None:
@@ -55,6 +69,34 @@ class MPIPoolExecutor(Executor):
                 raise TypeError("initializer must be a callable")
             kwargs['initializer'] = initializer
             kwargs['initargs'] = tuple(initargs)
+        dispatch = kwargs.get('dispatch')
+        if dispatch is not None:
+            if dispatch not in _lib.DISPATCH_MODES:
+                raise ValueError(f"invalid dispatch mode {dispatch!r}")
+        batch_size = kwargs.get('batch_size')
+        if batch_size is not None:
+            if int(batch_size) <= 0:
+                raise ValueError("batch_size must be greater than 0")
+        batch_linger = kwargs.get('batch_linger')
+        if batch_linger is not None:
+            if float(batch_linger) < 0:
+                raise ValueError("batch_linger must be non-negative")
+        prefetch = kwargs.get('prefetch')
+        if prefetch is not None:
+            if int(prefetch) < 0:
+                raise ValueError("prefetch must be non-negative")
+        cache_size = kwargs.get('cache_size')
+        if cache_size is not None:
+            if int(cache_size) < 0:
+                raise ValueError("cache_size must be non-negative")
+        scheduler = kwargs.get('scheduler')
+        if scheduler is not None:
+            if scheduler not in _lib.SCHEDULERS:
+                raise ValueError(f"invalid scheduler {scheduler!r}")
+        group_size = kwargs.get('group_size')
+        if group_size is not None and group_size != 'node':
+            if int(group_size) <= 0:
+                raise ValueError("group_size must be greater than 0")
 
         self._options = kwargs
         self._shutdown = False
@@ -95,12 +137,15 @@ class MPIPoolExecutor(Executor):
                 self._pool.wait()
             return self
 
-    def submit(self, fn, *args, **kwargs):
+    def submit(self, fn, *args, affinity=None, **kwargs):
         """Submit a callable to be executed with the given arguments.
 
         Schedule the callable to be executed as ``fn(*args, **kwargs)`` and
         return a `Future` instance representing the execution of the callable.
 
+        Args:
+            affinity: Hashable key to run tasks sharing it on the same node.
+
         Returns:
             A `Future` representing the given call.
 
@@ -113,14 +158,19 @@ class MPIPoolExecutor(Executor):
                 raise RuntimeError("cannot submit after shutdown")
             self._bootstrap()
             future = self.Future()
+            if affinity is not None:
+                future._affinity = affinity
             task = (fn, args, kwargs)
             self._pool.push((future, task))
             return future
     if sys.version_info >= (3, 8):  # pragma: no branch
-        submit.__text_signature__ = '($self, fn, /, *args, **kwargs)'
+        submit.__text_signature__ = (
+            '($self, fn, /, *args, affinity=None, **kwargs)'
+        )
 
     def map(self, fn, *iterables,
-            timeout=None, chunksize=1, unordered=False):
+            timeout=None, chunksize=1, unordered=False,
+            max_pending=None):
         """Return an iterator equivalent to ``map(fn, *iterables)``.
 
         Args:
@@ -131,8 +181,11 @@ class MPIPoolExecutor(Executor):
             timeout: The maximum number of seconds to wait. If ``None``, then
                 there is no limit on the wait time.
             chunksize: The size of the chunks the iterable will be broken into
-                before being passed to a worker process.
+                before being passed to a worker process. If ``"auto"``, then
+                the size adapts to the measured execution time of tasks.
             unordered: If ``True``, yield results out-of-order, as completed.
+            max_pending: The maximum number of tasks submitted but not yet
+                yielded. If ``None``, then all tasks are submitted upfront.
 
         Returns:
             An iterator equivalent to built-in ``map(func, *iterables)``
@@ -144,10 +197,17 @@ class MPIPoolExecutor(Executor):
             Exception: If ``fn(*args)`` raises for any values.
 
         """  # noqa: D402
-        return self.starmap(fn, zip(*iterables), timeout, chunksize, unordered)
+        # pylint: disable=too-many-arguments
+        if chunksize == 'auto':
+            iterable = _Zip(*iterables)
+        else:
+            iterable = zip(*iterables)
+        return self.starmap(fn, iterable, timeout, chunksize, unordered,
+                            max_pending)
 
     def starmap(self, fn, iterable,
-                timeout=None, chunksize=1, unordered=False):
+                timeout=None, chunksize=1, unordered=False,
+                max_pending=None):
         """Return an iterator equivalent to ``itertools.starmap(...)``.
 
         Args:
@@ -157,8 +217,11 @@ class MPIPoolExecutor(Executor):
             timeout: The maximum number of seconds to wait. If ``None``, then
                 there is no limit on the wait time.
             chunksize: The size of the chunks the iterable will be broken into
-                before being passed to a worker process.
+                before being passed to a worker process. If ``"auto"``, then
+                the size adapts to the measured execution time of tasks.
             unordered: If ``True``, yield results out-of-order, as completed.
+            max_pending: The maximum number of tasks submitted but not yet
+                yielded. If ``None``, then all tasks are submitted upfront.
 
         Returns:
             An iterator equivalent to ``itertools.starmap(fn, iterable)``
@@ -171,14 +234,45 @@ class MPIPoolExecutor(Executor):
 
         """  # noqa: D402
         # pylint: disable=too-many-arguments
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be >= 1.")
+        if chunksize == 'auto':
+            num_workers = self._max_workers or 1
+            if max_pending is None:
+                max_pending = 2 * num_workers
+            return _starmap_auto(self.submit, fn, iterable,
+                                 timeout, unordered, max_pending,
+                                 num_workers)
         if chunksize < 1:
             raise ValueError("chunksize must be >= 1.")
         if chunksize == 1:
             return _starmap_helper(self.submit, fn, iterable,
-                                   timeout, unordered)
+                                   timeout, unordered, max_pending)
         else:
             return _starmap_chunks(self.submit, fn, iterable,
-                                   timeout, unordered, chunksize)
+                                   timeout, unordered, max_pending,
+                                   chunksize)
+
+    def stats(self, reset=False):
+        """Return task timing statistics.
+
+        Statistics are collected only if the executor was created
+        with the ``stats`` option enabled.
+
+        Args:
+            reset: If ``True`` then reset statistics after collecting them.
+
+        Returns:
+            A mapping with counters and histograms of task timings, or
+            ``None`` if statistics collection is not enabled or the
+            executor has not been started yet.
+
+        """
+        with self._lock:
+            pool = self._pool
+        if pool is None:
+            return None
+        return pool.stats(reset)
 
     def shutdown(self, wait=True, *, cancel_futures=False):
         """Clean-up the resources associated with the executor.
@@ -211,7 +305,12 @@ class MPIPoolExecutor(Executor):
             pool.join()
 
 
-def _starmap_helper(submit, function, iterable, timeout, unordered):
+def _starmap_helper(submit, function, iterable,
+                    timeout, unordered, max_pending=None):
+    # pylint: disable=too-many-arguments
+    if max_pending is not None:
+        return _starmap_lazy(submit, function, iterable,
+                             timeout, unordered, max_pending)
     if timeout is not None:
         timer = getattr(time, 'monotonic', time.time)
         end_time = timeout + timer()
@@ -254,6 +353,68 @@ def _starmap_helper(submit, function, iterable, timeout, unordered):
     return result_iterator()
 
 
+def _starmap_lazy(submit, function, iterable,
+                  timeout, unordered, max_pending):
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-branches
+    timer = getattr(time, 'monotonic', time.time)
+    end_time = None
+    if timeout is not None:
+        end_time = timeout + timer()
+
+    iterable = iter(iterable)
+    if unordered:
+        futures = set()
+        append = futures.add
+    else:
+        futures = collections.deque()
+        append = futures.append
+
+    def submit_next(count):
+        for args in itertools.islice(iterable, count):
+            append(submit(function, *args))
+
+    def result(future, timeout=None):
+        try:
+            try:
+                return future.result(timeout)
+            finally:
+                future.cancel()
+        finally:
+            del future
+
+    def remaining():
+        if end_time is None:
+            return None
+        return end_time - timer()
+
+    def result_iterator():
+        try:
+            if unordered:
+                while futures:
+                    done, _ = wait(futures, remaining(), FIRST_COMPLETED)
+                    if not done:
+                        raise TimeoutError
+                    futures.difference_update(done)
+                    submit_next(len(done))
+                    done = list(done)
+                    while done:
+                        yield result(done.pop())
+            else:
+                while futures:
+                    future = [futures.popleft()]
+                    value = result(future[0], remaining())
+                    future.pop()
+                    submit_next(1)
+                    yield value
+        finally:
+            while futures:
+                futures.pop().cancel()
+    submit_next(max_pending)
+    return result_iterator()
+
+
 def _apply_chunks(function, chunk):
     return [function(*args) for args in chunk]
 
@@ -275,15 +436,134 @@ def _chain_from_iterable_of_lists(iterable):
 
 
 def _starmap_chunks(submit, function, iterable,
-                    timeout, unordered, chunksize):
+                    timeout, unordered, max_pending, chunksize):
     # pylint: disable=too-many-arguments
     function = functools.partial(_apply_chunks, function)
     iterable = _build_chunks(chunksize, iterable)
     result = _starmap_helper(submit, function, iterable,
-                             timeout, unordered)
+                             timeout, unordered, max_pending)
     return _chain_from_iterable_of_lists(result)
 
 
+def _apply_chunks_timed(function, chunk):
+    timer = getattr(time, 'monotonic', time.time)
+    start = timer()
+    result = [function(*args) for args in chunk]
+    return timer() - start, result
+
+
+def _chain_from_iterable_of_timed_lists(iterable):
+    for _, item in iterable:
+        item.reverse()
+        while item:
+            yield item.pop()
+
+
+class _Zip:
+    """Like `zip()`, but keeping the length hint of the iterables."""
+
+    def __init__(self, *iterables):
+        self.hint = min(map(operator.length_hint, iterables), default=0)
+        self.iterator = zip(*iterables)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.iterator)
+
+    def __length_hint__(self):
+        return self.hint
+
+
+class _AutoChunks:
+    """Adaptive chunking of an iterable of argument tuples.
+
+    Chunk sizes aim at a target task duration, estimated from the
+    running average of the execution time per item and the minimum
+    per-task overhead (round-trip minus execution time) measured for
+    completed tasks; the minimum discards time spent queued in workers.
+    Chunks at most double in size from one to the next.
+    Near the end of iterables of known length, chunks shrink to split
+    the remaining items among all workers (guided self-scheduling).
+    """
+
+    target = 0.05  # minimum target task duration in seconds
+    factor = 10  # target task duration to per-task overhead ratio
+    weight = 0.25  # weight of new measurements in running averages
+
+    def __init__(self, iterable, num_workers):
+        self.timer = getattr(time, 'monotonic', time.time)
+        self.lock = threading.Lock()
+        self.remaining = operator.length_hint(iterable)
+        self.iterator = iter(iterable)
+        self.num_workers = max(num_workers, 1)
+        self.item_time = None
+        self.task_time = 0.0
+        self.size = 1
+
+    def update(self, size, start, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        elapsed = self.timer() - start
+        exec_time, _ = future.result()
+        item_time = exec_time / size
+        task_time = max(elapsed - exec_time, 0.0)
+        with self.lock:
+            if self.item_time is None:
+                self.item_time = item_time
+                self.task_time = task_time
+            else:
+                weight = self.weight
+                self.item_time += weight * (item_time - self.item_time)
+                self.task_time = min(self.task_time, task_time)
+
+    def chunksize(self):
+        with self.lock:
+            item_time = self.item_time
+            task_time = self.task_time
+        size = 1
+        if item_time is not None:
+            target = max(self.target, self.factor * task_time)
+            if item_time > 0:
+                size = int(target / item_time)
+            else:
+                size = 2 * self.size
+            size = max(1, min(size, 2 * self.size))
+        if self.remaining > 0:
+            share = -(-self.remaining // self.num_workers)
+            size = min(size, share)
+        self.size = size
+        return size
+
+    def __iter__(self):
+        while True:
+            chunk = tuple(itertools.islice(self.iterator, self.chunksize()))
+            if not chunk:
+                return
+            self.remaining -= len(chunk)
+            yield (chunk,)
+
+
+def _starmap_auto(submit, function, iterable,
+                  timeout, unordered, max_pending, num_workers):
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-locals
+    function = functools.partial(_apply_chunks_timed, function)
+    chunks = _AutoChunks(iterable, num_workers)
+
+    def submit_timed(function, chunk):
+        start = chunks.timer()
+        future = submit(function, chunk)
+        future.add_done_callback(
+            functools.partial(chunks.update, len(chunk), start))
+        return future
+
+    result = _starmap_lazy(submit_timed, function, chunks,
+                           timeout, unordered, max_pending)
+    return _chain_from_iterable_of_timed_lists(result)
+
+
 class MPICommExecutor:
     """Context manager for `MPIPoolExecutor`.
 
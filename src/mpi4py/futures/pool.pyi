@@ -1,5 +1,5 @@
 import sys
-from typing import Any, TypeVar
+from typing import Any, Literal, TypeVar
 from typing import Callable, Iterable, Iterator, Mapping, Sequence
 if sys.version_info >= (3, 10):
     from typing import ParamSpec
@@ -44,6 +44,7 @@ class MPIPoolExecutor(Executor):
             self,
             __fn: Callable[_P, _T],
             *args: _P.args,
+            affinity: Any | None = None,
             **kwargs: _P.kwargs,
         ) -> Future[_T]: ...
     else:
@@ -51,6 +52,7 @@ class MPIPoolExecutor(Executor):
             self,
             fn: Callable[_P, _T],
             *args: _P.args,
+            affinity: Any | None = None,
             **kwargs: _P.kwargs,
         ) -> Future[_T]: ...
     def map(
@@ -58,17 +60,20 @@ class MPIPoolExecutor(Executor):
         fn: Callable[..., _T],
         *iterables: Iterable[Any],
         timeout: float | None = None,
-        chunksize: int = 1,
+        chunksize: int | Literal['auto'] = 1,
         unordered: bool = False,
+        max_pending: int | None = None,
     ) -> Iterator[_T]: ...
     def starmap(
         self,
         fn: Callable[..., _T],
         iterable: Iterable[Any],
         timeout: float | None = None,
-        chunksize: int = 1,
+        chunksize: int | Literal['auto'] = 1,
         unordered: bool = False,
+        max_pending: int | None = None,
     ) -> Iterator[_T]: ...
+    def stats(self, reset: bool = False) -> dict[str, Any] | None: ...
     def shutdown(
         self,
         wait: bool = True,
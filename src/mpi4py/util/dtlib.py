@@ -6,6 +6,10 @@
 # pylint: disable=too-many-statements
 # pylint: disable=too-many-return-statements
 
+import atexit as _atexit
+import collections as _collections
+import threading as _threading
+import weakref as _weakref
 from .. import MPI
 
 try:
@@ -114,6 +118,102 @@ def from_numpy_dtype(dtype):
     return datatype.Dup()
 
 
+_cache = {}
+_cache_lock = _threading.Lock()
+_cache_maxsize = 128
+_cache_hits = 0
+_cache_misses = 0
+_cache_keyval = MPI.KEYVAL_INVALID
+
+_CacheInfo = _collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'],
+)
+
+
+def _cache_free(datatype):
+    if MPI.Is_initialized() and not MPI.Is_finalized():
+        datatype.Free()
+
+
+def _cache_track(datatype):
+    # Free the datatype handle once the cache and all callers
+    # have dropped their references to the Python object.
+    _weakref.finalize(datatype, _cache_free, MPI.Datatype(datatype))
+
+
+def _cache_evict(maxsize):
+    while len(_cache) > maxsize:
+        del _cache[next(iter(_cache))]
+
+
+def _cache_finalize(*args):  # pylint: disable=unused-argument
+    with _cache_lock:
+        _cache_evict(0)
+
+
+def _cache_setup():
+    # pylint: disable=global-statement
+    global _cache_keyval
+    if _cache_keyval != MPI.KEYVAL_INVALID:
+        return
+    keyval = MPI.COMM_SELF.Create_keyval(delete_fn=_cache_finalize)
+    MPI.COMM_SELF.Set_attr(keyval, None)
+    _atexit.register(_cache_finalize)
+    _cache_keyval = keyval
+
+
+def from_numpy_dtype_cached(dtype):
+    """Convert NumPy datatype to committed MPI datatype (cached)."""
+    try:
+        dtype = _np_dtype(dtype)
+    except NameError:
+        raise RuntimeError("NumPy is not available") from None
+    # pylint: disable=global-statement
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        datatype = _cache.pop(dtype, None)
+        if datatype is None:
+            _cache_setup()
+            datatype = from_numpy_dtype(dtype)
+            datatype.Commit()
+            _cache_track(datatype)
+            _cache_misses += 1
+        else:
+            _cache_hits += 1
+        _cache[dtype] = datatype
+        _cache_evict(_cache_maxsize)
+        return datatype
+
+
+def cache_info():
+    """Report statistics of `from_numpy_dtype_cached`."""
+    with _cache_lock:
+        return _CacheInfo(
+            _cache_hits, _cache_misses, _cache_maxsize, len(_cache),
+        )
+
+
+def cache_clear():
+    """Clear the cache of `from_numpy_dtype_cached`."""
+    # pylint: disable=global-statement
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        _cache_evict(0)
+        _cache_hits = _cache_misses = 0
+
+
+def cache_resize(maxsize):
+    """Set the maximum number of cached MPI datatypes."""
+    # pylint: disable=global-statement
+    global _cache_maxsize
+    maxsize = int(maxsize)
+    if maxsize < 1:
+        raise ValueError("maximum cache size must be positive")
+    with _cache_lock:
+        _cache_maxsize = maxsize
+        _cache_evict(maxsize)
+
+
 def to_numpy_dtype(datatype):
     """Convert MPI datatype to NumPy datatype."""
 
@@ -1,8 +1,17 @@
 from __future__ import annotations
-from typing import Any
+from typing import Any, NamedTuple
 from numpy import dtype
 from numpy.typing import DTypeLike
 from ..MPI import Datatype
 
 def from_numpy_dtype(dtype: DTypeLike) -> Datatype: ...
+def from_numpy_dtype_cached(dtype: DTypeLike) -> Datatype: ...
+class _CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+def cache_info() -> _CacheInfo: ...
+def cache_clear() -> None: ...
+def cache_resize(maxsize: int) -> None: ...
 def to_numpy_dtype(datatype: Datatype) -> dtype[Any]: ...
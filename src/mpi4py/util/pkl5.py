@@ -380,28 +380,156 @@ def _get_p2p_backend():
     return reqs, send, recv
 
 
-def _gather(comm, obj, root):
+_CHUNK_SIZE = 1 << 22  # 4 MiB
+
+
+def _chunks(buf):
+    buf = memoryview(buf).cast('B')
+    size = len(buf)
+    step = max(_CHUNK_SIZE, 1)
+    if size == 0:
+        return [buf]
+    return [buf[i:i + step] for i in range(0, size, step)]
+
+
+def _isend_chunks(comm, reqs, data, bufs, dest, tag):
+    # pylint: disable=too-many-arguments
+    info = [len(data)]
+    info.extend(len(sbuf) for sbuf in bufs)
+    infotype = _info_datatype()
+    info = _info_pack(info)
+    isend = MPI.Comm.Isend
+    reqs.append(isend(comm, (info, infotype), dest, tag))
+    with _bigmpi as bigmpi:
+        for sbuf in (data, *bufs):
+            for chunk in _chunks(sbuf):
+                reqs.append(isend(comm, bigmpi(chunk), dest, tag))
+
+
+def _recv_chunks(comm, reqs, source, dest, tag):
+    # pylint: disable=too-many-locals
+    # Receive a message in chunks, and forward every chunk to
+    # dest (if not PROC_NULL) as soon as it has been received.
+    status = Status()
+    MPI.Comm.Probe(comm, source, tag, status)
+    infotype = _info_datatype()
+    infosize = status.Get_elements(infotype)
+    info = _info_alloc(infosize)
+    MPI.Comm.Recv(comm, (info, infotype), source, tag)
+    isend = MPI.Comm.Isend
+    irecv = MPI.Comm.Irecv
+    if dest != PROC_NULL:
+        reqs.append(isend(comm, (info, infotype), dest, tag))
+    info = _info_unpack(info)
+    data = _new_buffer(info[0])
+    bufs = list(map(_new_buffer, info[1:]))
+    chunks = [chunk for rbuf in (data, *bufs) for chunk in _chunks(rbuf)]
+    with _bigmpi as bigmpi:
+        rreqs = [irecv(comm, bigmpi(chunk), source, tag) for chunk in chunks]
+        if dest == PROC_NULL:
+            MPI.Request.Waitall(rreqs)
+            return data, bufs
+        for chunk, rreq in zip(chunks, rreqs):
+            rreq.Wait()
+            reqs.append(isend(comm, bigmpi(chunk), dest, tag))
+    return data, bufs
+
+
+def _binomial_children(vrank, size):
+    # Children of a node in a binomial tree rooted at vrank=0,
+    # in ascending order of subtree size (1, 2, 4, ...).
+    mask = 1
+    while mask < size and not vrank & mask:
+        child = vrank + mask
+        if child >= size:
+            break
+        yield child
+        mask <<= 1
+
+
+def _binomial_order(vrank, size, reverse=False):
+    # Nodes of the subtree rooted at vrank, in the order they are
+    # received from (gather) or sent to (scatter) its parent.
+    children = list(_binomial_children(vrank, size))
+    if reverse:
+        children.reverse()
+    nodes = [vrank]
+    for child in children:
+        nodes.extend(_binomial_order(child, size, reverse))
+    return nodes
+
+
+def _copy_raw(data, bufs):
+    rbufs = []
+    for sbuf in bufs:
+        rbuf = _new_buffer(len(sbuf))
+        rbuf[:] = sbuf
+        rbufs.append(rbuf)
+    return data, rbufs
+
+
+def _check_root(comm, root, size):
+    if root < 0 or root >= size:
+        comm.Call_errhandler(MPI.ERR_ROOT)
+        raise MPI.Exception(MPI.ERR_ROOT)
+
+
+def _check_objs(objs, size):
+    if objs is None:
+        objs = [None] * size
+    elif not isinstance(objs, list):
+        objs = list(objs)
+    if len(objs) != size:
+        raise ValueError(f"expecting {size} items, got {len(objs)}")
+    return objs
+
+
+def _gather_intra(comm, obj, root):
+    # pylint: disable=too-many-locals
+    comm, tag = _commctx_intra(comm)
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    _check_root(comm, root, size)
+
+    reqs = []
+    items = {}
+    vrank = (rank - root) % size
+    parent = PROC_NULL
+    if vrank != 0:
+        parent = (vrank - (vrank & -vrank) + root) % size
+    data, bufs = _pickle_dumps(obj)
+    if parent != PROC_NULL:
+        _isend_chunks(comm, reqs, data, bufs, parent, tag)
+    else:
+        items[vrank] = _copy_raw(data, bufs)
+    for child in _binomial_children(vrank, size):
+        source = (child + root) % size
+        for node in _binomial_order(child, size):
+            item = _recv_chunks(comm, reqs, source, parent, tag)
+            if parent == PROC_NULL:
+                items[node] = item
+    MPI.Request.Waitall(reqs)
+    if parent != PROC_NULL:
+        return None
+    return [
+        _pickle_loads(*items[(source - root) % size])
+        for source in range(size)
+    ]
+
+
+def _gather_inter(comm, obj, root):
     reqs, send, recv = _get_p2p_backend()
-    if comm.Is_inter():
-        comm, tag, *_ = _commctx_inter(comm)
-        size = comm.Get_remote_size()
-        if root == PROC_NULL:
-            send = recv = None
-        elif root == MPI.ROOT:
-            send = None
-        elif 0 <= root < size:
-            recv = None
-        else:
-            comm.Call_errhandler(MPI.ERR_ROOT)
-            raise MPI.Exception(MPI.ERR_ROOT)
+    comm, tag, *_ = _commctx_inter(comm)
+    size = comm.Get_remote_size()
+    if root == PROC_NULL:
+        send = recv = None
+    elif root == MPI.ROOT:
+        send = None
+    elif 0 <= root < size:
+        recv = None
     else:
-        comm, tag = _commctx_intra(comm)
-        size = comm.Get_size()
-        if root != comm.Get_rank():
-            recv = None
-        if root < 0 or root >= size:
-            comm.Call_errhandler(MPI.ERR_ROOT)
-            raise MPI.Exception(MPI.ERR_ROOT)
+        comm.Call_errhandler(MPI.ERR_ROOT)
+        raise MPI.Exception(MPI.ERR_ROOT)
 
     if send:
         data, bufs = _pickle_dumps(obj)
@@ -418,37 +546,57 @@ def _gather(comm, obj, root):
     return objs
 
 
-def _scatter(comm, objs, root):
-    # pylint: disable=too-many-branches
-    reqs, send, recv = _get_p2p_backend()
+def _gather(comm, obj, root):
     if comm.Is_inter():
-        comm, tag, *_ = _commctx_inter(comm)
-        size = comm.Get_remote_size()
-        if root == PROC_NULL:
-            send = recv = None
-        elif root == ROOT:
-            recv = None
-        elif 0 <= root < size:
-            send = None
-        else:
-            comm.Call_errhandler(MPI.ERR_ROOT)
-            raise MPI.Exception(MPI.ERR_ROOT)
+        return _gather_inter(comm, obj, root)
     else:
-        comm, tag = _commctx_intra(comm)
-        size = comm.Get_size()
-        if root != comm.Get_rank():
-            send = None
-        if root < 0 or root >= size:
-            comm.Call_errhandler(MPI.ERR_ROOT)
-            raise MPI.Exception(MPI.ERR_ROOT)
+        return _gather_intra(comm, obj, root)
+
+
+def _scatter_intra(comm, objs, root):
+    # pylint: disable=too-many-locals
+    comm, tag = _commctx_intra(comm)
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    _check_root(comm, root, size)
+
+    reqs = []
+    vrank = (rank - root) % size
+    if vrank == 0:
+        objs = _check_objs(objs, size)
+        data, bufs = _copy_raw(*_pickle_dumps(objs[rank]))
+        for child in reversed(list(_binomial_children(vrank, size))):
+            dest = (child + root) % size
+            for node in _binomial_order(child, size, reverse=True):
+                sdata, sbufs = _pickle_dumps(objs[(node + root) % size])
+                _isend_chunks(comm, reqs, sdata, sbufs, dest, tag)
+    else:
+        parent = (vrank - (vrank & -vrank) + root) % size
+        data, bufs = _recv_chunks(comm, reqs, parent, PROC_NULL, tag)
+        for child in reversed(list(_binomial_children(vrank, size))):
+            dest = (child + root) % size
+            for _ in _binomial_order(child, size, reverse=True):
+                _recv_chunks(comm, reqs, parent, dest, tag)
+    MPI.Request.Waitall(reqs)
+    return _pickle_loads(data, bufs)
+
+
+def _scatter_inter(comm, objs, root):
+    reqs, send, recv = _get_p2p_backend()
+    comm, tag, *_ = _commctx_inter(comm)
+    size = comm.Get_remote_size()
+    if root == PROC_NULL:
+        send = recv = None
+    elif root == ROOT:
+        recv = None
+    elif 0 <= root < size:
+        send = None
+    else:
+        comm.Call_errhandler(MPI.ERR_ROOT)
+        raise MPI.Exception(MPI.ERR_ROOT)
 
     if send:
-        if objs is None:
-            objs = [None] * size
-        elif not isinstance(objs, list):
-            objs = list(objs)
-        if len(objs) != size:
-            raise ValueError(f"expecting {size} items, got {len(objs)}")
+        objs = _check_objs(objs, size)
         for dest, obj in enumerate(objs):
             data, bufs = _pickle_dumps(obj)
             _send_raw(comm, send, data, bufs, dest, tag)
@@ -461,14 +609,63 @@ def _scatter(comm, objs, root):
     return obj
 
 
-def _allgather(comm, obj):
-    reqs, send, recv = _get_p2p_backend()
+def _scatter(comm, objs, root):
     if comm.Is_inter():
-        comm, tag, *_ = _commctx_inter(comm)
-        size = comm.Get_remote_size()
+        return _scatter_inter(comm, objs, root)
     else:
-        comm, tag = _commctx_intra(comm)
-        size = comm.Get_size()
+        return _scatter_intra(comm, objs, root)
+
+
+_RING_SIZE = 1 << 16  # 64 KiB
+
+
+def _allgather_max(comm, data, bufs):
+    # All processes agree on the size of the largest pickled
+    # object to select the same allgather algorithm.
+    nbytes = len(data) + sum(len(sbuf) for sbuf in bufs)
+    sinfo = _info_pack([nbytes])
+    rinfo = _info_alloc(1)
+    infotype = _info_datatype()
+    MPI.Comm.Allreduce(comm, (sinfo, infotype), (rinfo, infotype), MPI.MAX)
+    return _info_unpack(rinfo)[0]
+
+
+def _allgather_intra(comm, obj):
+    comm, tag = _commctx_intra(comm)
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+
+    reqs = []
+    items = [None] * size
+    data, bufs = _pickle_dumps(obj)
+    items[rank] = _copy_raw(data, bufs)
+    if size > 1 and _allgather_max(comm, data, bufs) >= _RING_SIZE:
+        # Ring: every process sends and receives one message per step,
+        # large payloads are relayed in chunks as soon as received.
+        left = (rank - 1) % size
+        right = (rank + 1) % size
+        _isend_chunks(comm, reqs, data, bufs, right, tag)
+        for step in range(1, size):
+            dest = right if step < size - 1 else PROC_NULL
+            items[(rank - step) % size] = \
+                _recv_chunks(comm, reqs, left, dest, tag)
+    else:
+        # Pairwise exchange: a single communication step in latency,
+        # small payloads are not relayed through P-1 processes.
+        for step in range(1, size):
+            dest = (rank + step) % size
+            _isend_chunks(comm, reqs, data, bufs, dest, tag)
+        for step in range(1, size):
+            source = (rank - step) % size
+            items[source] = _recv_chunks(comm, reqs, source, PROC_NULL, tag)
+    MPI.Request.Waitall(reqs)
+    return [_pickle_loads(data, bufs) for data, bufs in items]
+
+
+def _allgather_inter(comm, obj):
+    reqs, send, recv = _get_p2p_backend()
+    comm, tag, *_ = _commctx_inter(comm)
+    size = comm.Get_remote_size()
 
     data, bufs = _pickle_dumps(obj)
     for dest in range(size):
@@ -482,21 +679,38 @@ def _allgather(comm, obj):
     return objs
 
 
-def _alltoall(comm, objs):
-    reqs, send, recv = _get_p2p_backend()
+def _allgather(comm, obj):
     if comm.Is_inter():
-        comm, tag, *_ = _commctx_inter(comm)
-        size = comm.Get_remote_size()
+        return _allgather_inter(comm, obj)
     else:
-        comm, tag = _commctx_intra(comm)
-        size = comm.Get_size()
+        return _allgather_intra(comm, obj)
 
-    if objs is None:
-        objs = [None] * size
-    elif not isinstance(objs, list):
-        objs = list(objs)
-    if len(objs) != size:
-        raise ValueError(f"expecting {size} items, got {len(objs)}")
+
+def _alltoall_intra(comm, objs):
+    comm, tag = _commctx_intra(comm)
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+
+    objs = _check_objs(objs, size)
+    reqs = []
+    items = [None] * size
+    items[rank] = _copy_raw(*_pickle_dumps(objs[rank]))
+    for step in range(1, size):
+        dest = (rank + step) % size
+        source = (rank - step) % size
+        data, bufs = _pickle_dumps(objs[dest])
+        _isend_chunks(comm, reqs, data, bufs, dest, tag)
+        items[source] = _recv_chunks(comm, reqs, source, PROC_NULL, tag)
+    MPI.Request.Waitall(reqs)
+    return [_pickle_loads(data, bufs) for data, bufs in items]
+
+
+def _alltoall_inter(comm, objs):
+    reqs, send, recv = _get_p2p_backend()
+    comm, tag, *_ = _commctx_inter(comm)
+    size = comm.Get_remote_size()
+
+    objs = _check_objs(objs, size)
     for dest, obj in enumerate(objs):
         data, bufs = _pickle_dumps(obj)
         _send_raw(comm, send, data, bufs, dest, tag)
@@ -509,6 +723,13 @@ def _alltoall(comm, objs):
     return objs
 
 
+def _alltoall(comm, objs):
+    if comm.Is_inter():
+        return _alltoall_inter(comm, objs)
+    else:
+        return _alltoall_intra(comm, objs)
+
+
 class Request(tuple):
     """Request."""
 
@@ -97,7 +97,8 @@ class Pool:
 
         The *iterable* is choped into a number of chunks which are submited as
         separate tasks. The (approximate) size of these chunks can be specified
-        by setting *chunksize* to a positive integer.
+        by setting *chunksize* to a positive integer, or to ``"auto"`` to adapt
+        the size to the measured execution time of tasks.
 
         Consider using `imap()` or `imap_unordered()` with explicit *chunksize*
         for better efficiency.
@@ -117,20 +118,26 @@ class Pool:
         future = _async_executor(self).submit(list, result_iterator)
         return MapResult(future, callback, error_callback)
 
-    def imap(self, func, iterable, chunksize=1):
+    def imap(self, func, iterable, chunksize=1, max_pending=None):
         """Like `map()` but return an `iterator`.
 
         Equivalent to ``map(func, iterable)``.
 
+        The *iterable* is consumed lazily if *max_pending* is a positive
+        integer, keeping at most *max_pending* chunks submitted but not yet
+        yielded.
+
         """
         return self.executor.map(
             func, iterable, chunksize=chunksize,
+            max_pending=max_pending,
         )
 
-    def imap_unordered(self, func, iterable, chunksize=1):
+    def imap_unordered(self, func, iterable, chunksize=1, max_pending=None):
         """Like `imap()` but ordering of results is arbitrary."""
         return self.executor.map(
             func, iterable, chunksize=chunksize, unordered=True,
+            max_pending=max_pending,
         )
 
     def starmap(self, func, iterable, chunksize=None):
@@ -142,7 +149,8 @@ class Pool:
 
         The *iterable* is choped into a number of chunks which are submited as
         separate tasks. The (approximate) size of these chunks can be specified
-        by setting *chunksize* to a positive integer.
+        by setting *chunksize* to a positive integer, or to ``"auto"`` to adapt
+        the size to the measured execution time of tasks.
 
         Consider using `istarmap()` or `istarmap_unordered()` with explicit
         *chunksize* for better efficiency.
@@ -162,20 +170,28 @@ class Pool:
         future = _async_executor(self).submit(list, result_iterator)
         return MapResult(future, callback, error_callback)
 
-    def istarmap(self, func, iterable, chunksize=1):
+    def istarmap(self, func, iterable, chunksize=1, max_pending=None):
         """Like `starmap()` but return an `iterator`.
 
         Equivalent to ``itertools.starmap(func, iterable)``.
 
+        The *iterable* is consumed lazily if *max_pending* is a positive
+        integer, keeping at most *max_pending* chunks submitted but not yet
+        yielded.
+
         """
         return self.executor.starmap(
             func, iterable, chunksize=chunksize,
+            max_pending=max_pending,
         )
 
-    def istarmap_unordered(self, func, iterable, chunksize=1):
+    def istarmap_unordered(
+        self, func, iterable, chunksize=1, max_pending=None,
+    ):
         """Like `istarmap()` but ordering of results is arbitrary."""
         return self.executor.starmap(
             func, iterable, chunksize=chunksize, unordered=True,
+            max_pending=max_pending,
         )
 
     def close(self):
@@ -3,6 +3,7 @@ import sys
 from typing import (
     Any,
     Generic,
+    Literal,
     TypeVar,
 )
 from typing import (
@@ -56,13 +57,13 @@ class Pool:
         self,
         func: Callable[[_S], _T],
         iterable: Iterable[_S],
-        chunksize: int | None = None,
+        chunksize: int | Literal['auto'] | None = None,
     ) -> list[_T]: ...
     def map_async(
         self,
         func: Callable[[_S], _T],
         iterable: Iterable[_S],
-        chunksize: int | None = None,
+        chunksize: int | Literal['auto'] | None = None,
         callback: Callable[[_T], None] | None = None,
         error_callback: Callable[[BaseException], None] | None = None,
     ) -> MapResult[_T]: ...
@@ -70,25 +71,27 @@ class Pool:
         self,
         func: Callable[[_S], _T],
         iterable: Iterable[_S],
-        chunksize: int = 1,
+        chunksize: int | Literal['auto'] = 1,
+        max_pending: int | None = None,
     ) -> Iterator[_T]: ...
     def imap_unordered(
         self,
         func: Callable[[_S], _T],
         iterable: Iterable[_S],
-        chunksize: int = 1,
+        chunksize: int | Literal['auto'] = 1,
+        max_pending: int | None = None,
     ) -> Iterator[_T]: ...
     def starmap(
         self,
         func: Callable[..., _T],
         iterable: Iterable[Iterable[Any]],
-        chunksize: int | None = None,
+        chunksize: int | Literal['auto'] | None = None,
     ) -> list[_T]: ...
     def starmap_async(
         self,
         func: Callable[..., _T],
         iterable: Iterable[Iterable[Any]],
-        chunksize: int | None = None,
+        chunksize: int | Literal['auto'] | None = None,
         callback: Callable[[_T], None] | None = None,
         error_callback: Callable[[BaseException], None] | None = None,
     ) -> MapResult[_T]: ...
@@ -96,13 +99,15 @@ class Pool:
         self,
         func: Callable[..., _T],
         iterable: Iterable[Iterable[Any]],
-        chunksize: int = 1,
+        chunksize: int | Literal['auto'] = 1,
+        max_pending: int | None = None,
     ) -> Iterator[_T]: ...
     def istarmap_unordered(
         self,
         func: Callable[..., _T],
         iterable: Iterable[Iterable[Any]],
-        chunksize: int = 1,
+        chunksize: int | Literal['auto'] = 1,
+        max_pending: int | None = None,
     ) -> Iterator[_T]: ...
     def close(self) -> None: ...
     def terminate(self) -> None: ...
@@ -21,6 +21,7 @@ typedef struct {
   MPI_Comm localcomm;
   int      tag;
   int      low_group;
+  MPI_Request dupreq;
 } PyMPI_Commctx;
 
 static int PyMPI_Commctx_KEYVAL = MPI_KEYVAL_INVALID;
@@ -40,6 +41,7 @@ static int PyMPI_Commctx_new(PyMPI_Commctx **_commctx)
     commctx->localcomm = MPI_COMM_NULL;
     commctx->tag = 0;
     commctx->low_group = -1;
+    commctx->dupreq = MPI_REQUEST_NULL;
   }
   *_commctx = commctx;
   return MPI_SUCCESS;
@@ -53,6 +55,8 @@ static int MPIAPI PyMPI_Commctx_free_fn(MPI_Comm comm, int k, void *v, void *xs)
   if (!commctx) return MPI_SUCCESS;
   ierr = MPI_Finalized(&finalized); CHKERR(ierr);
   if (finalized) goto fn_exit;
+  if (commctx->dupreq != MPI_REQUEST_NULL)
+    {ierr = MPI_Wait(&commctx->dupreq, MPI_STATUS_IGNORE); CHKERR(ierr);}
   if (commctx->localcomm != MPI_COMM_NULL)
     {ierr = MPI_Comm_free(&commctx->localcomm); CHKERR(ierr);}
   if (commctx->dupcomm != MPI_COMM_NULL)
@@ -89,11 +93,32 @@ static int PyMPI_Commctx_lookup(MPI_Comm comm, PyMPI_Commctx **_commctx)
   ierr = MPI_Comm_dup(comm, &commctx->dupcomm); CHKERR(ierr);
 
  fn_exit:
+  if (commctx->dupreq != MPI_REQUEST_NULL)
+    {ierr = MPI_Wait(&commctx->dupreq, MPI_STATUS_IGNORE); CHKERR(ierr);}
   if (commctx->tag >= PyMPI_Commctx_TAG_UB) commctx->tag = 0;
   if (_commctx) *_commctx = commctx;
   return MPI_SUCCESS;
 }
 
+static int PyMPI_Commctx_idup(MPI_Comm comm, MPI_Request **dupreq)
+{
+  int ierr, found = 0, keyval = MPI_KEYVAL_INVALID;
+  PyMPI_Commctx *commctx = NULL;
+
+  ierr = PyMPI_Commctx_keyval(&keyval); CHKERR(ierr);
+  ierr = MPI_Comm_get_attr(comm, keyval, &commctx, &found); CHKERR(ierr);
+  if (found && commctx) goto fn_exit;
+
+  ierr = PyMPI_Commctx_new(&commctx); CHKERR(ierr);
+  if (!commctx) {(void)MPI_Comm_call_errhandler(comm, MPI_ERR_INTERN); return MPI_ERR_INTERN;}
+  ierr = MPI_Comm_set_attr(comm, keyval, commctx); CHKERR(ierr);
+  ierr = MPI_Comm_idup(comm, &commctx->dupcomm, &commctx->dupreq); CHKERR(ierr);
+
+ fn_exit:
+  if (dupreq) *dupreq = &commctx->dupreq;
+  return MPI_SUCCESS;
+}
+
 static int PyMPI_Commctx_clear(MPI_Comm comm)
 {
   int ierr, found = 0, keyval = PyMPI_Commctx_KEYVAL;
@@ -0,0 +1,88 @@
+/* Author:  Lisandro Dalcin   */
+/* Contact: dalcinl@gmail.com */
+
+/*
+   MPI user-defined reduction functions do not take a context
+   argument. User-defined operations are mapped to a table of
+   trampoline functions, each one passing its slot index plus one
+   (index zero is reserved for predefined operations) to a
+   dispatcher installed at module initialization.
+*/
+
+#ifndef MPIAPI
+#define MPIAPI
+#endif
+
+#define PyMPI_OP_USER_TABLE 1024
+
+#if !defined(PyMPI_OP_USER_MAX)
+#define PyMPI_OP_USER_MAX PyMPI_OP_USER_TABLE
+#elif PyMPI_OP_USER_MAX > PyMPI_OP_USER_TABLE
+#undef  PyMPI_OP_USER_MAX
+#define PyMPI_OP_USER_MAX PyMPI_OP_USER_TABLE
+#endif
+
+typedef void (*PyMPI_op_user_call_t)
+  (int, void *, void *, MPI_Count, MPI_Datatype);
+
+static PyMPI_op_user_call_t PyMPI_op_user_call = NULL;
+
+#define PyMPI_OP_USER_INDEX(w,x,y,z) ((w)*512+(x)*64+(y)*8+(z)+1)
+
+#define PyMPI_OP_USER_DEFN(w,x,y,z)                             \
+  static void MPIAPI PyMPI_op_user_i_##w##x##y##z               \
+  (void *a, void *b, int *n, MPI_Datatype *t)                   \
+  { PyMPI_op_user_call(PyMPI_OP_USER_INDEX(w,x,y,z),            \
+                       a, b, (MPI_Count) *n, *t); }             \
+  static void MPIAPI PyMPI_op_user_c_##w##x##y##z               \
+  (void *a, void *b, MPI_Count *n, MPI_Datatype *t)             \
+  { PyMPI_op_user_call(PyMPI_OP_USER_INDEX(w,x,y,z),            \
+                       a, b, *n, *t); }                         \
+
+#define PyMPI_OP_USER_ITEM_I(w,x,y,z) PyMPI_op_user_i_##w##x##y##z,
+#define PyMPI_OP_USER_ITEM_C(w,x,y,z) PyMPI_op_user_c_##w##x##y##z,
+
+#define PyMPI_OP_USER_R8(M,w,x,y)                               \
+  M(w,x,y,0) M(w,x,y,1) M(w,x,y,2) M(w,x,y,3)                   \
+  M(w,x,y,4) M(w,x,y,5) M(w,x,y,6) M(w,x,y,7)                   \
+
+#define PyMPI_OP_USER_R64(M,w,x)                                \
+  PyMPI_OP_USER_R8(M,w,x,0) PyMPI_OP_USER_R8(M,w,x,1)           \
+  PyMPI_OP_USER_R8(M,w,x,2) PyMPI_OP_USER_R8(M,w,x,3)           \
+  PyMPI_OP_USER_R8(M,w,x,4) PyMPI_OP_USER_R8(M,w,x,5)           \
+  PyMPI_OP_USER_R8(M,w,x,6) PyMPI_OP_USER_R8(M,w,x,7)           \
+
+#define PyMPI_OP_USER_R512(M,w)                                 \
+  PyMPI_OP_USER_R64(M,w,0) PyMPI_OP_USER_R64(M,w,1)             \
+  PyMPI_OP_USER_R64(M,w,2) PyMPI_OP_USER_R64(M,w,3)             \
+  PyMPI_OP_USER_R64(M,w,4) PyMPI_OP_USER_R64(M,w,5)             \
+  PyMPI_OP_USER_R64(M,w,6) PyMPI_OP_USER_R64(M,w,7)             \
+
+#define PyMPI_OP_USER_R1024(M)                                  \
+  PyMPI_OP_USER_R512(M,0) PyMPI_OP_USER_R512(M,1)               \
+
+PyMPI_OP_USER_R1024(PyMPI_OP_USER_DEFN)
+
+static MPI_User_function *PyMPI_op_user_i[PyMPI_OP_USER_TABLE] = {
+  PyMPI_OP_USER_R1024(PyMPI_OP_USER_ITEM_I)
+};
+
+static MPI_User_function_c *PyMPI_op_user_c[PyMPI_OP_USER_TABLE] = {
+  PyMPI_OP_USER_R1024(PyMPI_OP_USER_ITEM_C)
+};
+
+#undef PyMPI_OP_USER_DEFN
+#undef PyMPI_OP_USER_ITEM_I
+#undef PyMPI_OP_USER_ITEM_C
+#undef PyMPI_OP_USER_R8
+#undef PyMPI_OP_USER_R64
+#undef PyMPI_OP_USER_R512
+#undef PyMPI_OP_USER_R1024
+#undef PyMPI_OP_USER_INDEX
+
+/*
+   Local variables:
+   c-basic-offset: 2
+   indent-tabs-mode: nil
+   End:
+*/
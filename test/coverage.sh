@@ -28,12 +28,41 @@ $MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench pingpong -q -l 1 -s 1 -n 1
 $MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench pingpong -q -l 1 -s 1 -n 128 -o
 $MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench pingpong -q -l 1 -s 1 -n 128 -p --protocol 4
 $MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench pingpong -q -l 1 -s 1 -n 128 -o --threshold 32
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench barrier -l 2 -s 1                   > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench bcast -n 64 --no-header            > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench bcast -n 64 --no-stats             > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench bcast -n 64 --output csv           > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench bcast -n 64 --output json          > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench allgather -q -l 1 -s 1 -n 2097152
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench pingpong -l 2 -n 64 --output csv  > /dev/null
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench pingpong -l 2 -n 64 --output json > /dev/null
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench bcast -l 2 -n 64 --output json --outfile bench-a.json
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench bcast -l 2 -n 64 --output json --outfile bench-b.json
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench compare bench-a.json bench-b.json -t 1e9 > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench compare bench-a.json bench-b.json -t -1  > /dev/null 2>&1 || true
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench compare bench-a.json bench-a.json -k mean -q
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 --output csv  > /dev/null
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 --output json > /dev/null
+rm -f bench-a.json bench-b.json
+for cmd in barrier bcast allgather alltoall alltoallv allreduce reduce_scatter; do
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench $cmd -q -l 1 -s 1 -n 128
+$MPIEXEC -n 3 $PYTHON -m coverage run -m mpi4py.bench $cmd -q -l 1 -s 1 -n 128 -p
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench $cmd -q -l 1 -s 1 -n 128 -p -a none
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench $cmd -q -l 1 -s 1 -n 128 -o --threshold 32
+done
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -l 1             > /dev/null
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 --no-header > /dev/null
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 --no-stats  > /dev/null
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 -a numpy -e mpi     -q
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 -a bytes -e process -q
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 -a array -e thread  -q
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 1 -n 8 -d event --latency -q
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 4 -n 8 --batch-size 2 -q
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 1 -t 4 -n 8 --prefetch 1 -q
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench futures -w 3 -t 4 -n 8 --group-size 2 -q
+$MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench halo -n 64 --no-header > /dev/null
+$MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench halo -q -l 1 -s 1 -n 128
+$MPIEXEC -n 3 $PYTHON -m coverage run -m mpi4py.bench halo -q -l 1 -s 1 -n 128 -P
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench              > /dev/null 2>&1 || true
 $MPIEXEC -n 2 $PYTHON -m coverage run -m mpi4py.bench              > /dev/null 2>&1 || true
 $MPIEXEC -n 1 $PYTHON -m coverage run -m mpi4py.bench qwerty       > /dev/null 2>&1 || true
@@ -2,9 +2,24 @@ from mpi4py import MPI
 import mpiunittest as unittest
 
 from functools import reduce
+try:
+    import numpy
+except ImportError:
+    numpy = None
 cumsum  = lambda seq: reduce(lambda x, y: x+y, seq, 0)
 cumprod = lambda seq: reduce(lambda x, y: x*y, seq, 1)
 
+def _raise(exc):
+    raise exc
+
+class BadDumps:
+    def __reduce__(self):
+        raise ValueError("cannot dump")
+
+class BadLoads:
+    def __reduce__(self):
+        return (_raise, (ValueError("cannot load"),))
+
 _basic = [
     None,
     True, False,
@@ -70,6 +85,170 @@ class BaseTestCCOObj:
             rmess = self.COMM.alltoall([smess] * size)
             self.assertEqual(rmess, [smess] * size)
 
+    def testOutOfBand(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        def message(i):
+            return [
+                bytearray(b'x' * 8 * i),
+                {'oob': bytearray(bytes(range(256)) * i)},
+                bytearray(b'y' * 3 * i),
+            ]
+        threshold = MPI.pickle.THRESHOLD
+        MPI.pickle.THRESHOLD = 256
+        try:
+            for root in range(size):
+                smess = message(root + 1)
+                rmess = self.COMM.bcast(smess, root=root)
+                self.assertEqual(rmess, smess)
+                self.assertIsNot(rmess[0], smess[0])
+                smess = message(rank)
+                rmess = self.COMM.gather(smess, root=root)
+                if rank == root:
+                    self.assertEqual(rmess, [message(i) for i in range(size)])
+                else:
+                    self.assertIsNone(rmess)
+            rmess = self.COMM.allgather(message(rank))
+            self.assertEqual(rmess, [message(i) for i in range(size)])
+            rmess = self.COMM.alltoall([message(i + rank) for i in range(size)])
+            self.assertEqual(rmess, [message(i + rank) for i in range(size)])
+        finally:
+            MPI.pickle.THRESHOLD = threshold
+
+    def testBcastStream(self):
+        size = self.COMM.Get_size()
+        def message(i):
+            return [
+                bytearray(b'x' * 8 * i),
+                {'oob': bytearray(bytes(range(256)) * i)},
+                'mpi4py' * 100 * i,
+            ]
+        threshold = MPI.pickle.THRESHOLD
+        bcast_chunk = MPI._set_rc_option('bcast_chunk', 0)
+        try:
+            for oob_threshold in (256, 1024**3):
+                MPI.pickle.THRESHOLD = oob_threshold
+                for chunk in (1, 100, 1000, 1024**2):
+                    MPI._set_rc_option('bcast_chunk', chunk)
+                    for root in range(size):
+                        for smess in messages + [message(root + 3)]:
+                            rmess = self.COMM.bcast(smess, root=root)
+                            self.assertEqual(rmess, smess)
+        finally:
+            MPI._set_rc_option('bcast_chunk', bcast_chunk)
+            MPI.pickle.THRESHOLD = threshold
+
+    def testPickleThreads(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        threshold = MPI.pickle.THRESHOLD
+        pickle_threads = MPI._set_rc_option('pickle_threads', 0)
+        try:
+            for nthreads in (2, 4):
+                MPI._set_rc_option('pickle_threads', nthreads)
+                for oob_threshold in (64, threshold):
+                    MPI.pickle.THRESHOLD = oob_threshold
+                    for smess in messages + [messages]:
+                        for root in range(size):
+                            if rank == root:
+                                sobj = [[smess, i] for i in range(size)]
+                            else:
+                                sobj = None
+                            rmess = self.COMM.scatter(sobj, root=root)
+                            self.assertEqual(rmess, [smess, rank])
+                            rmess = self.COMM.gather([smess, rank], root=root)
+                            if rank == root:
+                                self.assertEqual(
+                                    rmess, [[smess, i] for i in range(size)])
+                            else:
+                                self.assertIsNone(rmess)
+                        rmess = self.COMM.allgather([smess, rank])
+                        self.assertEqual(
+                            rmess, [[smess, i] for i in range(size)])
+                        sobj = [[smess, rank, i] for i in range(size)]
+                        rmess = self.COMM.alltoall(sobj)
+                        self.assertEqual(
+                            rmess, [[smess, i, rank] for i in range(size)])
+        finally:
+            MPI._set_rc_option('pickle_threads', pickle_threads)
+            MPI.pickle.THRESHOLD = threshold
+
+    def testPickleThreadsErrors(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        pickle_threads = MPI._set_rc_option('pickle_threads', 4)
+        try:
+            for bad in range(size):
+                sobj = [None] * size
+                sobj[bad] = BadDumps()
+                with self.assertRaisesRegex(ValueError, "cannot dump"):
+                    self.COMM.alltoall(sobj)
+                sobj[bad] = BadLoads()
+                if rank == bad:
+                    with self.assertRaisesRegex(ValueError, "cannot load"):
+                        self.COMM.alltoall(sobj)
+                else:
+                    rmess = self.COMM.alltoall(sobj)
+                    self.assertEqual(rmess, [None] * size)
+                self.COMM.barrier()
+                sobj = BadLoads() if rank == bad else rank
+                for root in range(size):
+                    if rank == root:
+                        with self.assertRaisesRegex(ValueError, "cannot load"):
+                            self.COMM.gather(sobj, root=root)
+                    else:
+                        self.assertIsNone(self.COMM.gather(sobj, root=root))
+                    self.COMM.barrier()
+            if size == 1:
+                with self.assertRaisesRegex(ValueError, "cannot dump"):
+                    self.COMM.scatter([BadDumps()], root=0)
+            for bad in range(size):
+                item = BadDumps() if rank == bad else rank
+                if rank == bad:
+                    with self.assertRaisesRegex(ValueError, "cannot dump"):
+                        self.COMM.alltoall([item] * size)
+                else:
+                    rmess = self.COMM.alltoall([item] * size)
+                    self.assertIsNone(rmess[bad])
+                    for i in range(size):
+                        if i != bad:
+                            self.assertEqual(rmess[i], i)
+                if rank == bad:
+                    with self.assertRaisesRegex(ValueError, "cannot dump"):
+                        self.COMM.scatter([item] * size, root=bad)
+                else:
+                    self.assertIsNone(self.COMM.scatter(None, root=bad))
+        finally:
+            MPI._set_rc_option('pickle_threads', pickle_threads)
+
+    @unittest.skipIf(numpy is None, 'numpy')
+    def testOutOfBandNumPy(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        threshold = MPI.pickle.THRESHOLD
+        MPI.pickle.THRESHOLD = 64
+        try:
+            smess = [numpy.full(rank * 17 + 3, rank, dtype='d'),
+                     numpy.arange(100, dtype='B'),
+                     numpy.full((4, 5), rank, dtype='c16', order='F')]
+            for rmess in (
+                [self.COMM.bcast(smess, root=0)],
+                self.COMM.allgather(smess),
+                self.COMM.alltoall([smess] * size),
+            ):
+                for i, item in enumerate(rmess):
+                    self.assertEqual(item[0].size, i * 17 + 3)
+                    self.assertTrue(numpy.all(item[0] == i))
+                    self.assertTrue(numpy.all(item[1] == numpy.arange(100)))
+                    self.assertTrue(numpy.all(item[2] == i))
+                    self.assertTrue(item[2].flags.f_contiguous)
+                    for array in item:
+                        self.assertTrue(array.flags.writeable)
+                        self.assertTrue(array.flags.aligned)
+                    self.assertFalse(numpy.shares_memory(item[0], smess[0]))
+        finally:
+            MPI.pickle.THRESHOLD = threshold
+
     def testReduce(self):
         size = self.COMM.Get_size()
         rank = self.COMM.Get_rank()
@@ -136,6 +315,310 @@ class BaseTestCCOObj:
             elif op == MPI.NO_OP:
                 self.assertEqual(value, 0)
 
+    def testAllreduceAlgorithm(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        sendobj = {'a': [rank], 'b': str(rank)}
+        def op(x, y):
+            return {'a': x['a'] + y['a'], 'b': f"{x['b']},{y['b']}"}
+        algorithm = MPI._set_rc_option('allreduce_algorithm', 'auto')
+        try:
+            for name in ('auto', 'reduce_bcast', 'recursive_doubling'):
+                MPI._set_rc_option('allreduce_algorithm', name)
+                value = self.COMM.allreduce(rank, MPI.SUM)
+                self.assertEqual(value, cumsum(range(size)))
+                value = self.COMM.allreduce(sendobj, op)
+                self.assertEqual(value, {
+                    'a': list(range(size)),
+                    'b': ','.join(map(str, range(size))),
+                })
+        finally:
+            MPI._set_rc_option('allreduce_algorithm', algorithm)
+
+    def testAllreduceOrder(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        value = self.COMM.allreduce([rank], MPI.SUM)
+        self.assertEqual(value, list(range(size)))
+        value = self.COMM.allreduce(str(rank), lambda a, b: f'{a},{b}')
+        self.assertEqual(value, ','.join(map(str, range(size))))
+        sendobj = {'a': [rank], 'b': [-rank]}
+        value = self.COMM.allreduce(sendobj, lambda x, y: {
+            key: x[key] + y[key] for key in x
+        })
+        self.assertEqual(value, {
+            'a': list(range(size)),
+            'b': [-i for i in range(size)],
+        })
+        self.assertEqual(sendobj, {'a': [rank], 'b': [-rank]})
+
+    def testIBcast(self):
+        for smess in messages:
+            for root in range(self.COMM.Get_size()):
+                request = self.COMM.ibcast(smess, root=root)
+                rmess = request.wait()
+                self.assertEqual(smess, rmess)
+                self.assertEqual(request, MPI.REQUEST_NULL)
+
+    def testIGather(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        for smess in messages + [messages]:
+            for root in range(size):
+                request = self.COMM.igather(smess, root=root)
+                rmess = request.wait()
+                if rank == root:
+                    self.assertEqual(rmess, [smess] * size)
+                else:
+                    self.assertIsNone(rmess)
+
+    def testIScatter(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        for smess in messages + [messages]:
+            for root in range(size):
+                if rank == root:
+                    request = self.COMM.iscatter([smess] * size, root=root)
+                else:
+                    request = self.COMM.iscatter(None, root=root)
+                rmess = request.wait()
+                self.assertEqual(rmess, smess)
+
+    def testIAllgather(self):
+        size = self.COMM.Get_size()
+        for smess in messages + [messages]:
+            request = self.COMM.iallgather(smess)
+            flag, rmess = request.test()
+            while not flag:
+                flag, rmess = request.test()
+            self.assertEqual(rmess, [smess] * size)
+
+    def testIAlltoall(self):
+        size = self.COMM.Get_size()
+        for smess in messages + [messages]:
+            request = self.COMM.ialltoall([smess] * size)
+            rmess = request.wait()
+            self.assertEqual(rmess, [smess] * size)
+
+    def testIAllreduce(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        request = self.COMM.iallreduce(rank)
+        self.assertEqual(request.wait(), cumsum(range(size)))
+        request = self.COMM.iallreduce(rank, op=MPI.MAX)
+        self.assertEqual(request.wait(), size-1)
+        request = self.COMM.iallreduce([rank], MPI.SUM)
+        self.assertEqual(request.wait(), list(range(size)))
+        request = self.COMM.iallreduce(str(rank), lambda a, b: f'{a},{b}')
+        self.assertEqual(request.wait(), ','.join(map(str, range(size))))
+        request = self.COMM.iallreduce(rank)
+        request.Wait()
+        self.assertIsNone(request.wait())
+
+    def testNonblockingOutstanding(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        requests = [
+            self.COMM.ibcast(messages, root=0),
+            self.COMM.igather(rank, root=0),
+            self.COMM.iscatter(list(range(size)), root=0),
+            self.COMM.iallgather(rank),
+            self.COMM.ialltoall([rank] * size),
+            self.COMM.iallreduce(rank),
+        ]
+        results = MPI.Request.waitall(requests)
+        self.assertEqual(results[0], messages)
+        if rank == 0:
+            self.assertEqual(results[1], list(range(size)))
+        else:
+            self.assertIsNone(results[1])
+        self.assertEqual(results[2], rank)
+        self.assertEqual(results[3], list(range(size)))
+        self.assertEqual(results[4], list(range(size)))
+        self.assertEqual(results[5], cumsum(range(size)))
+
+    def startNonblocking(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        requests = [
+            self.COMM.ibcast(messages, root=0),
+            self.COMM.igather(rank, root=0),
+            self.COMM.iscatter(list(range(size)), root=0),
+            self.COMM.iallgather(rank),
+            self.COMM.ialltoall([rank] * size),
+            self.COMM.iallreduce(rank),
+        ]
+        expected = [
+            messages,
+            list(range(size)) if rank == 0 else None,
+            rank,
+            list(range(size)),
+            list(range(size)),
+            cumsum(range(size)),
+        ]
+        return requests, expected
+
+    def testNonblockingCompletionOrder(self):
+        rank = self.COMM.Get_rank()
+        requests, expected = self.startNonblocking()
+        self.COMM.barrier()
+        order = list(range(len(requests)))
+        if rank % 2: order.reverse()
+        for i in order:
+            self.assertEqual(requests[i].wait(), expected[i])
+            self.assertFalse(requests[i])
+
+    def testNonblockingSizeExchange(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        if size < 2: return
+        # the root joins the broadcast only after a message
+        # sent by a process that already started the broadcast
+        if rank == 0:
+            request = self.COMM.ibcast(None, root=1)
+            self.COMM.ssend(None, dest=1)
+        elif rank == 1:
+            self.COMM.recv(source=0)
+            request = self.COMM.ibcast(messages, root=1)
+        else:
+            request = self.COMM.ibcast(None, root=1)
+        self.assertEqual(request.wait(), messages)
+
+    def testNonblockingProgress(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        requests, expected = self.startNonblocking()
+        # communication methods on the communicator post the
+        # data transfers of operations with sizes exchanged
+        for _ in range(3):
+            self.COMM.iprobe()
+            self.assertEqual(self.COMM.bcast(rank), 0)
+            self.assertEqual(self.COMM.allgather(rank), list(range(size)))
+        self.assertEqual(MPI.Request.waitall(requests), expected)
+
+    def testNonblockingWaitany(self):
+        requests, expected = self.startNonblocking()
+        results = {}
+        while len(results) < len(requests):
+            index, obj = MPI.Request.waitany(requests)
+            self.assertNotIn(index, results)
+            results[index] = obj
+        self.assertEqual([results[i] for i in range(len(requests))], expected)
+        index, obj = MPI.Request.waitany(requests)
+        self.assertEqual(index, MPI.UNDEFINED)
+
+    def testNonblockingTestany(self):
+        requests, expected = self.startNonblocking()
+        results = {}
+        while len(results) < len(requests):
+            index, flag, obj = MPI.Request.testany(requests)
+            if flag and index != MPI.UNDEFINED:
+                self.assertNotIn(index, results)
+                results[index] = obj
+        self.assertEqual([results[i] for i in range(len(requests))], expected)
+
+    def testNonblockingWaitsome(self):
+        requests, expected = self.startNonblocking()
+        results = {}
+        while len(results) < len(requests):
+            indices, objs = MPI.Request.waitsome(requests)
+            self.assertTrue(indices)
+            results.update(zip(indices, objs))
+        self.assertEqual([results[i] for i in range(len(requests))], expected)
+
+    def testNonblockingTestsome(self):
+        requests, expected = self.startNonblocking()
+        results = {}
+        while len(results) < len(requests):
+            indices, objs = MPI.Request.testsome(requests)
+            self.assertIsNotNone(indices)
+            results.update(zip(indices, objs))
+        self.assertEqual([results[i] for i in range(len(requests))], expected)
+
+    def testNonblockingTestall(self):
+        requests, expected = self.startNonblocking()
+        flag, results = MPI.Request.testall(requests)
+        while not flag:
+            self.assertIsNone(results)
+            flag, results = MPI.Request.testall(requests)
+        self.assertEqual(results, expected)
+
+    def testNonblockingGetStatus(self):
+        requests, expected = self.startNonblocking()
+        for request in requests:
+            while not request.Get_status():
+                pass
+        self.assertEqual(MPI.Request.waitall(requests), expected)
+
+    def testNonblockingUppercase(self):
+        requests, _ = self.startNonblocking()
+        while not MPI.Request.Testall(requests):
+            pass
+        self.assertFalse(any(requests))
+        requests, _ = self.startNonblocking()
+        MPI.Request.Waitall(requests)
+        self.assertFalse(any(requests))
+        requests, _ = self.startNonblocking()
+        while MPI.Request.Waitany(requests) != MPI.UNDEFINED:
+            pass
+        self.assertFalse(any(requests))
+        requests, _ = self.startNonblocking()
+        while MPI.Request.Waitsome(requests) is not None:
+            pass
+        self.assertFalse(any(requests))
+        requests, _ = self.startNonblocking()
+        for request in requests:
+            while not request.Test():
+                pass
+        self.assertFalse(any(requests))
+
+    def testNonblockingRequestSet(self):
+        requests, expected = self.startNonblocking()
+        reqset = MPI.RequestSet(requests)
+        results = {}
+        while len(results) < len(requests):
+            indices, objs = reqset.testsome()
+            results.update(zip(indices, objs))
+        self.assertEqual([results[i] for i in range(len(requests))], expected)
+        requests, expected = self.startNonblocking()
+        reqset = MPI.RequestSet(requests)
+        results = {}
+        while len(results) < len(requests):
+            indices, objs = reqset.waitsome()
+            self.assertTrue(len(indices))
+            results.update(zip(indices, objs))
+        self.assertEqual([results[i] for i in range(len(requests))], expected)
+        self.assertIsNone(reqset.Waitsome())
+
+    def testNonblockingOutOfBand(self):
+        size = self.COMM.Get_size()
+        rank = self.COMM.Get_rank()
+        def message(i):
+            return [
+                bytearray(b'x' * 8 * i),
+                {'oob': bytearray(bytes(range(256)) * i)},
+            ]
+        threshold = MPI.pickle.THRESHOLD
+        MPI.pickle.THRESHOLD = 256
+        try:
+            for root in range(size):
+                smess = message(root + 1)
+                rmess = self.COMM.ibcast(smess, root=root).wait()
+                self.assertEqual(rmess, smess)
+                self.assertIsNot(rmess[0], smess[0])
+                rmess = self.COMM.igather(message(rank), root=root).wait()
+                if rank == root:
+                    self.assertEqual(rmess, [message(i) for i in range(size)])
+                else:
+                    self.assertIsNone(rmess)
+            rmess = self.COMM.iallgather(message(rank)).wait()
+            self.assertEqual(rmess, [message(i) for i in range(size)])
+            smess = [message(i + rank) for i in range(size)]
+            rmess = self.COMM.ialltoall(smess).wait()
+            self.assertEqual(rmess, [message(i + rank) for i in range(size)])
+        finally:
+            MPI.pickle.THRESHOLD = threshold
+
     def testScan(self):
         size = self.COMM.Get_size()
         rank = self.COMM.Get_rank()
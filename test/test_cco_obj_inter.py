@@ -130,6 +130,22 @@ class BaseTestCCOObjInter:
             rmess = self.INTERCOMM.alltoall([smess] * rsize)
             self.assertEqual(rmess, [smess] * rsize)
 
+    def testOutOfBand(self):
+        global messages
+        saved = messages, MPI.pickle.THRESHOLD
+        messages = [
+            bytearray(b'x' * 1024),
+            {'oob': bytearray(bytes(range(256)) * 3)},
+        ]
+        MPI.pickle.THRESHOLD = 256
+        try:
+            self.testBcast()
+            self.testGather()
+            self.testAllgather()
+            self.testAlltoall()
+        finally:
+            messages, MPI.pickle.THRESHOLD = saved
+
     def testReduce(self):
         rank = self.INTERCOMM.Get_rank()
         size = self.INTERCOMM.Get_size()
@@ -172,6 +188,102 @@ class BaseTestCCOObjInter:
             elif op == MPI.MIN:
                 self.assertEqual(value, 0)
 
+    @unittest.skipMPI('openmpi', MPI.COMM_WORLD.Get_size() > 2)
+    def testIBcast(self):
+        rank = self.INTERCOMM.Get_rank()
+        size = self.INTERCOMM.Get_size()
+        rsize = self.INTERCOMM.Get_remote_size()
+        for smess in messages + [messages]:
+            for color in [0, 1]:
+                if self.COLOR == color:
+                    for root in range(size):
+                        if root == rank:
+                            request = self.INTERCOMM.ibcast(smess, root=MPI.ROOT)
+                        else:
+                            request = self.INTERCOMM.ibcast(None, root=MPI.PROC_NULL)
+                        self.assertIsNone(request.wait())
+                else:
+                    for root in range(rsize):
+                        request = self.INTERCOMM.ibcast(None, root=root)
+                        self.assertEqual(request.wait(), smess)
+
+    @unittest.skipMPI('openmpi', MPI.COMM_WORLD.Get_size() > 2)
+    def testIGather(self):
+        rank = self.INTERCOMM.Get_rank()
+        size = self.INTERCOMM.Get_size()
+        rsize = self.INTERCOMM.Get_remote_size()
+        for smess in messages + [messages]:
+            for color in [0, 1]:
+                if self.COLOR == color:
+                    for root in range(size):
+                        if root == rank:
+                            request = self.INTERCOMM.igather(smess, root=MPI.ROOT)
+                            self.assertEqual(request.wait(), [smess] * rsize)
+                        else:
+                            request = self.INTERCOMM.igather(None, root=MPI.PROC_NULL)
+                            self.assertIsNone(request.wait())
+                else:
+                    for root in range(rsize):
+                        request = self.INTERCOMM.igather(smess, root=root)
+                        self.assertIsNone(request.wait())
+
+    @unittest.skipMPI('openmpi', MPI.COMM_WORLD.Get_size() > 2)
+    @unittest.skipMPI('msmpi(<8.0.0)')
+    def testIScatter(self):
+        rank = self.INTERCOMM.Get_rank()
+        size = self.INTERCOMM.Get_size()
+        rsize = self.INTERCOMM.Get_remote_size()
+        for smess in messages + [messages]:
+            for color in [0, 1]:
+                if self.COLOR == color:
+                    for root in range(size):
+                        if root == rank:
+                            request = self.INTERCOMM.iscatter([smess] * rsize, root=MPI.ROOT)
+                        else:
+                            request = self.INTERCOMM.iscatter(None, root=MPI.PROC_NULL)
+                        self.assertIsNone(request.wait())
+                else:
+                    for root in range(rsize):
+                        request = self.INTERCOMM.iscatter(None, root=root)
+                        self.assertEqual(request.wait(), smess)
+
+    def testIAllgather(self):
+        rsize = self.INTERCOMM.Get_remote_size()
+        for smess in messages + [messages]:
+            request = self.INTERCOMM.iallgather(smess)
+            self.assertEqual(request.wait(), [smess] * rsize)
+
+    def testIAlltoall(self):
+        rsize = self.INTERCOMM.Get_remote_size()
+        for smess in messages + [messages]:
+            request = self.INTERCOMM.ialltoall([smess] * rsize)
+            self.assertEqual(request.wait(), [smess] * rsize)
+
+    def testIAllreduce(self):
+        rank = self.INTERCOMM.Get_rank()
+        rsize = self.INTERCOMM.Get_remote_size()
+        request = self.INTERCOMM.iallreduce(rank, MPI.SUM)
+        self.assertEqual(request.wait(), cumsum(range(rsize)))
+        request = self.INTERCOMM.iallreduce(rank, MPI.MAX)
+        self.assertEqual(request.wait(), rsize-1)
+
+    @unittest.skipMPI('openmpi', MPI.COMM_WORLD.Get_size() > 2)
+    def testNonblockingOutOfBand(self):
+        global messages
+        saved = messages, MPI.pickle.THRESHOLD
+        messages = [
+            bytearray(b'x' * 1024),
+            {'oob': bytearray(bytes(range(256)) * 3)},
+        ]
+        MPI.pickle.THRESHOLD = 256
+        try:
+            self.testIBcast()
+            self.testIGather()
+            self.testIAllgather()
+            self.testIAlltoall()
+        finally:
+            messages, MPI.pickle.THRESHOLD = saved
+
 
 class TestCCOObjInter(BaseTestCCOObjInter, unittest.TestCase):
     BASECOMM = MPI.COMM_WORLD
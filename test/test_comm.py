@@ -1,3 +1,4 @@
+import mpi4py
 from mpi4py import MPI
 import mpiunittest as unittest
 
@@ -308,6 +309,27 @@ class BaseTestComm:
         else:
             self.assertRaises(ValueError, dumps, COMM)
 
+    def testLock(self):
+        comm = self.COMM.Dup()
+        try:
+            lock = MPI._comm_lock(comm, 'key')
+            self.assertIs(MPI._comm_lock(comm, 'key'), lock)
+            self.assertIsNot(MPI._comm_lock(comm, 'other'), lock)
+            self.assertIs(MPI._comm_lock_table(comm)['key'], lock)
+            with lock:
+                self.assertFalse(lock.acquire(False))
+            self.assertTrue(lock.acquire(False))
+            lock.release()
+            stats = MPI._comm_lock_stats(comm)
+            if not mpi4py.rc.lock_stats:
+                self.assertEqual(stats, {})
+            else:
+                self.assertEqual(stats['key']['acquisitions'], 2)
+                self.assertEqual(stats['key']['contentions'], 0)
+                self.assertEqual(stats['other']['acquisitions'], 0)
+        finally:
+            comm.Free()
+
 
 class TestCommSelf(BaseTestComm, unittest.TestCase):
     def setUp(self):
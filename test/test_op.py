@@ -6,6 +6,11 @@ try:
 except ImportError:
     array = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 def asarray(typecode, data):
     tobytes = lambda s: memoryview(s).tobytes()
     frombytes = array.array.frombytes
@@ -83,6 +88,111 @@ class TestOp(unittest.TestCase):
             ops.append(o)
         for o in ops: o.Free() # cleanup
 
+    @unittest.skipIf(array is None, 'array')
+    def testCreateManyDistinct(self):
+        N = 1024 # max user-defined operations
+        def make(k):
+            def op(a, b, dt):
+                b[:] = array.array('i', [k] * (len(b) // 4))
+            return op
+        ops = [MPI.Op.Create(make(k)) for k in range(N)]
+        try:
+            with self.assertRaises(RuntimeError):
+                MPI.Op.Create(make(N))
+            a = array.array('i', [-1] * 3)
+            for k, op in enumerate(ops):
+                b = array.array('i', [0] * 3)
+                op.Reduce_local([a, MPI.INT], [b, MPI.INT])
+                self.assertEqual(list(b), [k] * 3)
+        finally:
+            for op in ops: op.Free()
+
+    @unittest.skipIf(numpy is None, 'numpy')
+    def testCreateFromUfunc(self):
+        for comm in [MPI.COMM_SELF, MPI.COMM_WORLD]:
+            size = comm.Get_size()
+            rank = comm.Get_rank()
+            for ufunc, commute in [
+                (numpy.maximum, True),
+                (numpy.add, True),
+                (numpy.subtract, False),
+            ]:
+                myop = MPI.Op.Create_from_ufunc(ufunc, commute)
+                try:
+                    self.assertFalse(myop.is_predefined)
+                    self.assertEqual(myop.Is_commutative(), commute)
+                    self.assertEqual(myop(5, 3), ufunc(5, 3))
+                    for typecode in 'bihlqfdFD':
+                        for N in range(4):
+                            a = numpy.arange(N, dtype=typecode)
+                            b = numpy.ones(N, dtype=typecode)
+                            myop.Reduce_local(a, b)
+                            self.assertTrue(
+                                numpy.all(b == ufunc(numpy.arange(N), 1)))
+                            if ufunc is numpy.subtract:
+                                continue
+                            a = numpy.full(N, rank, dtype=typecode)
+                            b = numpy.zeros(N, dtype=typecode)
+                            comm.Allreduce(a, b, myop)
+                            expected = ufunc.reduce(range(size))
+                            self.assertTrue(numpy.all(b == expected))
+                finally:
+                    myop.Free()
+
+    @unittest.skipIf(numpy is None, 'numpy')
+    def testCreateFromUfuncErrors(self):
+        self.assertRaises(ValueError, MPI.Op.Create_from_ufunc, numpy.sin)
+        self.assertRaises(TypeError, MPI.Op.Create_from_ufunc, max)
+
+    @unittest.skipIf(numpy is None, 'numpy')
+    def testCreateFromUfuncDatatypes(self):
+        comm = MPI.COMM_WORLD
+        myop = MPI.Op.Create_from_ufunc(numpy.bitwise_and, True)
+        dtype = MPI.INT.Create_contiguous(2).Commit()
+        dupint = MPI.INT.Dup()
+        try:
+            a = numpy.arange(4, dtype='i')
+            b = numpy.full(4, 3, dtype='i')
+            with self.assertRaises(TypeError):
+                myop.Reduce_local([a, 2, dtype], [b, 2, dtype])
+            with self.assertRaises(TypeError):
+                comm.Allreduce([a, 2, dtype], [b, 2, dtype], myop)
+            with self.assertRaises(TypeError):
+                comm.Reduce([a, 2, dtype], [b, 2, dtype], myop)
+            with self.assertRaises(TypeError):
+                comm.Scan([a, 2, dtype], [b, 2, dtype], myop)
+            a = numpy.arange(4, dtype='d')
+            b = numpy.ones(4, dtype='d')
+            with self.assertRaises(TypeError):
+                myop.Reduce_local(a, b)
+            with self.assertRaises(TypeError):
+                comm.Allreduce(a, b, myop)
+            self.assertEqual(b.tolist(), [1.0] * 4)
+            a = numpy.arange(4, dtype='i')
+            b = numpy.full(4, 3, dtype='i')
+            myop.Reduce_local([a, dupint], [b, dupint])
+            self.assertEqual(b.tolist(), [0, 1, 2, 3])
+        finally:
+            dupint.Free()
+            dtype.Free()
+            myop.Free()
+
+    @unittest.skipIf(numpy is None, 'numpy')
+    def testPickleFromUfunc(self):
+        from pickle import dumps, loads
+        for commute in [True, False]:
+            myop1 = MPI.Op.Create_from_ufunc(numpy.add, commute)
+            myop2 = loads(dumps(myop1))
+            self.assertNotEqual(myop1, myop2)
+            myop1.Free()
+            self.assertEqual(myop2(2, 3), 5)
+            self.assertEqual(myop2.Is_commutative(), commute)
+            a = numpy.ones(3)
+            b = numpy.ones(3)
+            myop2.Reduce_local(a, b)
+            self.assertEqual(b.tolist(), [2.0] * 3)
+            myop2.Free()
+
     def _test_call(self, op, args, res):
         self.assertEqual(op(*args), res)
         self.assertEqual(MPI.Op(op)(*args), res)
@@ -1,9 +1,20 @@
 from mpi4py import MPI
 import mpiunittest as unittest
+import functools
 
 def allocate(n):
     return bytearray(n)
 
+def irecv_mprobe(test):
+    @functools.wraps(test)
+    def wrapper(self):
+        irecv_mprobe = MPI._set_rc_option('irecv_mprobe', True)
+        try:
+            test(self)
+        finally:
+            MPI._set_rc_option('irecv_mprobe', irecv_mprobe)
+    return wrapper
+
 _basic = [
     None,
     True, False,
@@ -712,6 +723,276 @@ class BaseTestP2PObj:
         self.assertFalse(any(reqs))
         comm.Free()
 
+    @irecv_mprobe
+    def testIRecvLarge(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        dst = (rank+1)%size
+        src = (rank-1)%size
+        for n in (1<<10, 1<<15, 1<<20):
+            smess = [rank] * n
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            rmess = rreq.wait()
+            sreq.wait()
+            self.assertFalse(rreq)
+            self.assertEqual(rmess, [src] * n)
+            #
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            flag, rmess = rreq.test()
+            while not flag:
+                flag, rmess = rreq.test()
+            sreq.wait()
+            self.assertFalse(rreq)
+            self.assertEqual(rmess, [src] * n)
+            #
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            index, rmess = MPI.Request.waitany([rreq])
+            sreq.wait()
+            self.assertEqual(index, 0)
+            self.assertFalse(rreq)
+            self.assertEqual(rmess, [src] * n)
+            #
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            index, flag, rmess = MPI.Request.testany([rreq])
+            while not flag:
+                index, flag, rmess = MPI.Request.testany([rreq])
+            sreq.wait()
+            self.assertEqual(index, 0)
+            self.assertFalse(rreq)
+            self.assertEqual(rmess, [src] * n)
+            #
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            rmess = None
+            while rreq or sreq:
+                indices, objs = MPI.Request.waitsome([rreq, sreq])
+                if 0 in indices:
+                    rmess = objs[indices.index(0)]
+            self.assertEqual(rmess, [src] * n)
+            #
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            rmess, _ = MPI.Request.waitall([rreq, sreq])
+            self.assertEqual(rmess, [src] * n)
+            #
+            rreq = comm.irecv(None, src, 0)
+            sreq = comm.isend(smess, dst, 0)
+            sreq.Wait()
+            status = MPI.Status()
+            rreq.Wait(status)
+            self.assertFalse(rreq)
+            self.assertEqual(status.source, src)
+            self.assertEqual(status.tag, 0)
+            self.assertGreater(status.Get_count(), n)
+
+    @irecv_mprobe
+    def testIRecvBcastStream(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        dst = (rank+1)%size
+        src = (rank-1)%size
+        bcast_chunk = MPI._set_rc_option('bcast_chunk', 1000)
+        try:
+            for n in (1<<4, 1<<10, 1<<16):
+                smess = [rank] * n
+                rreq = comm.irecv(None, src, 0)
+                sreq = comm.isend(smess, dst, 0)
+                for root in range(size):
+                    bmess = comm.bcast(smess, root=root)
+                    self.assertEqual(bmess, [root] * n)
+                self.assertEqual(rreq.wait(), [src] * n)
+                sreq.wait()
+        finally:
+            MPI._set_rc_option('bcast_chunk', bcast_chunk)
+
+    @irecv_mprobe
+    def testIRecvLargeSSend(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        smess = bytes(1<<20)
+        req1 = comm.irecv(None, rank, 1)
+        req2 = comm.irecv(None, rank, 2)
+        comm.ssend(smess, rank, 2)
+        comm.send(smess, rank, 1)
+        self.assertEqual(req1.wait(), smess)
+        self.assertEqual(req2.wait(), smess)
+
+    @irecv_mprobe
+    def testIRecvOrder(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        reqs = [comm.irecv(None, rank, MPI.ANY_TAG) for _ in range(3)]
+        for i in range(3):
+            comm.send(i, rank, i)
+        status = MPI.Status()
+        self.assertEqual(reqs[2].wait(status), 2)
+        self.assertEqual(status.tag, 2)
+        self.assertEqual(reqs[1].wait(status), 1)
+        self.assertEqual(status.tag, 1)
+        self.assertEqual(reqs[0].wait(status), 0)
+        self.assertEqual(status.tag, 0)
+
+    @irecv_mprobe
+    def testIRecvCancel(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        status = MPI.Status()
+        req = comm.irecv(None, rank, 7)
+        flag, obj = req.test()
+        self.assertFalse(flag)
+        self.assertIsNone(obj)
+        req.Cancel()
+        obj = req.wait(status)
+        self.assertFalse(req)
+        self.assertIsNone(obj)
+        self.assertTrue(status.Is_cancelled())
+        #
+        req = comm.irecv(None, rank, 8)
+        req.Free()
+        self.assertFalse(req)
+        comm.send("abc", rank, 8)
+        self.assertFalse(comm.iprobe(rank, 8))
+
+    def testIRecvBarrier(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        dst = (rank+1)%size
+        src = (rank-1)%size
+        smess = bytes(20 * 1024)
+        rreq = comm.irecv(None, src, 0)
+        comm.send(smess, dst, 0)
+        comm.Barrier()
+        self.assertEqual(rreq.wait(), smess)
+
+    @irecv_mprobe
+    def testIRecvSSendBarrier(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        if size == 1: return
+        smess = bytes(1<<20)
+        for barrier in (comm.Barrier, comm.barrier):
+            if rank == 0:
+                rreq = comm.irecv(None, 1, 0)
+                barrier()
+                self.assertEqual(rreq.wait(), smess)
+            elif rank == 1:
+                comm.ssend(smess, 0, 0)
+                barrier()
+            else:
+                barrier()
+
+    @irecv_mprobe
+    def testIRecvRecvOrder(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        rreq = comm.irecv(None, rank, MPI.ANY_TAG)
+        sreqs = [comm.isend('a', rank, 1), comm.isend('b', rank, 2)]
+        status = MPI.Status()
+        self.assertEqual(comm.recv(None, rank, MPI.ANY_TAG, status), 'b')
+        self.assertEqual(status.tag, 2)
+        self.assertEqual(rreq.wait(status), 'a')
+        self.assertEqual(status.tag, 1)
+        MPI.Request.waitall(sreqs)
+
+    @irecv_mprobe
+    def testIRecvProbeOrder(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        for mprobe in (comm.mprobe, comm.improbe):
+            rreq = comm.irecv(None, rank, 1)
+            sreqs = [comm.isend('a', rank, 1), comm.isend('b', rank, 2)]
+            status = MPI.Status()
+            comm.probe(rank, MPI.ANY_TAG, status)
+            self.assertEqual(status.tag, 2)
+            self.assertTrue(comm.iprobe(rank, MPI.ANY_TAG, status))
+            self.assertEqual(status.tag, 2)
+            message = mprobe(rank, MPI.ANY_TAG, status)
+            self.assertEqual(status.tag, 2)
+            self.assertEqual(message.recv(), 'b')
+            self.assertEqual(rreq.wait(status), 'a')
+            self.assertEqual(status.tag, 1)
+            MPI.Request.waitall(sreqs)
+
+    def testPersistent(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        dst = (rank+1)%size
+        src = (rank-1)%size
+        box = []
+        sreq = comm.send_init(box, dst, 0)
+        rreq = comm.recv_init(None, src, 0)
+        self.assertIsInstance(sreq, MPI.Prequest)
+        self.assertIsInstance(rreq, MPI.Prequest)
+        for smess in messages + messages[::-1]:
+            box[:] = [smess]
+            rreq.start()
+            sreq.start()
+            self.assertIsNone(sreq.wait())
+            rmess = rreq.wait()
+            self.assertEqual(rmess, [smess])
+            self.assertTrue(sreq)
+            self.assertTrue(rreq)
+        for n in (0, 1, 1<<10, 1<<12, 1<<4, 1<<12):
+            box[:] = [bytes(n)]
+            MPI.Prequest.startall([rreq, sreq])
+            rmess, _ = MPI.Prequest.waitall([rreq, sreq])
+            self.assertEqual(rmess, [bytes(n)])
+        sreq.Free()
+        rreq.Free()
+        self.assertFalse(sreq)
+        self.assertFalse(rreq)
+
+    def testPersistentBuffer(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        for buf in (64, allocate(64)):
+            sreq = comm.send_init([1, 2, 3], rank, 5)
+            rreq = comm.recv_init(buf, rank, 5)
+            for _ in range(3):
+                MPI.Prequest.startall([sreq, rreq])
+                rmess = rreq.wait()
+                sreq.wait()
+                self.assertEqual(rmess, [1, 2, 3])
+            sreq.Free()
+            rreq.Free()
+
+    def testPersistentStart(self):
+        comm = self.COMM
+        rank = comm.Get_rank()
+        box = [1]
+        sreq = comm.send_init(box, rank, 6)
+        rreq = comm.recv_init(None, rank, 6)
+        box[0] = 2
+        sreq.Start()
+        rreq.Start()
+        self.assertEqual(rreq.wait(), [1])
+        sreq.Wait()
+        sreq.start()
+        rreq.start()
+        self.assertEqual(rreq.wait(), [2])
+        sreq.wait()
+        sreq.Free()
+        rreq.Free()
+
+    def testPersistentProcNull(self):
+        comm = self.COMM
+        sreq = comm.send_init("abc", MPI.PROC_NULL)
+        rreq = comm.recv_init(None, MPI.PROC_NULL)
+        for _ in range(2):
+            MPI.Prequest.startall([sreq, rreq])
+            self.assertEqual(MPI.Prequest.waitall([sreq, rreq]), [None, None])
+        sreq.Free()
+        rreq.Free()
+
 
 class TestP2PObjSelf(BaseTestP2PObj, unittest.TestCase):
     COMM = MPI.COMM_SELF
@@ -145,5 +145,138 @@ class TestPickle(unittest.TestCase):
         self.do_pickle(OBJS2, pickle)
 
 
+class TestBufferPool(unittest.TestCase):
+
+    def setUp(self):
+        self.COMM = MPI.COMM_WORLD.Dup()
+        self.pool = MPI.BufferPool(capacity=1<<24, threshold=0)
+        self.pool.attach(self.COMM)
+
+    def tearDown(self):
+        self.pool.detach(self.COMM)
+        self.COMM.Free()
+        MPI.pickle.__init__()
+
+    def testDefaults(self):
+        pool = MPI.BufferPool()
+        self.assertEqual(pool.capacity, 1024**2 * 256)
+        self.assertEqual(pool.threshold, 1024**2 // 4)
+        self.assertEqual(pool.nbytes, 0)
+        stats = pool.stats()
+        self.assertEqual(stats['hits'], 0)
+        self.assertEqual(stats['misses'], 0)
+        self.assertEqual(stats['evictions'], 0)
+        self.assertEqual(stats['hit_rate'], 0.0)
+        self.assertEqual(stats['buffers'], 0)
+        self.assertRaises(ValueError, MPI.BufferPool, -1)
+        self.assertRaises(ValueError, MPI.BufferPool, None, -1)
+
+    def testLookup(self):
+        comm = self.COMM
+        pool = self.pool
+        self.assertIs(MPI.BufferPool.lookup(comm), pool)
+        self.assertIsNot(MPI.BufferPool.lookup(MPI.COMM_SELF), pool)
+        default = MPI.BufferPool.lookup()
+        try:
+            pool.attach()
+            self.assertIs(MPI.BufferPool.lookup(), pool)
+            self.assertIs(MPI.BufferPool.lookup(MPI.COMM_SELF), pool)
+            pool.detach()
+            self.assertIsNone(MPI.BufferPool.lookup())
+        finally:
+            if default is not None:
+                default.attach()
+        pool.detach(comm)
+        self.assertIs(MPI.BufferPool.lookup(comm), default)
+        pool.attach(comm)
+
+    def testLookupFree(self):
+        pool = self.pool
+        comm = self.COMM.Dup()
+        try:
+            pool.attach(comm)
+            pool.attach(comm)
+            self.assertIs(MPI.BufferPool.lookup(comm), pool)
+            table = MPI._comm_lock_table(comm)
+            self.assertNotIn(MPI.BufferPool, table)
+            rmsg = comm.sendrecv([1] * 1000, comm.Get_rank())
+            self.assertEqual(rmsg, [1] * 1000)
+        finally:
+            comm.Free()
+        comm = self.COMM.Dup()
+        try:
+            default = MPI.BufferPool.lookup()
+            self.assertIs(MPI.BufferPool.lookup(comm), default)
+        finally:
+            comm.Free()
+
+    def testReuse(self):
+        comm = self.COMM
+        pool = self.pool
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        dst = (rank + 1) % size
+        src = (rank - 1) % size
+        for _ in range(5):
+            obj = [rank] * 1000
+            rmsg = comm.sendrecv(obj, dst, 0, None, src, 0)
+            self.assertEqual(rmsg, [src] * 1000)
+            rmsg = comm.bcast(obj, root=0)
+            self.assertEqual(rmsg, [0] * 1000)
+            rmsg = comm.scatter([obj] * size, root=0)
+            self.assertEqual(rmsg, [0] * 1000)
+            rmsg = comm.gather(obj, root=0)
+            if rank == 0:
+                self.assertEqual(rmsg, [[i] * 1000 for i in range(size)])
+            rmsg = comm.allgather(obj)
+            self.assertEqual(rmsg, [[i] * 1000 for i in range(size)])
+            rmsg = comm.alltoall([obj] * size)
+            self.assertEqual(rmsg, [[i] * 1000 for i in range(size)])
+            rmsg = comm.allreduce([rank], op=MPI.SUM)
+            self.assertEqual(sorted(rmsg), list(range(size)))
+        stats = pool.stats()
+        self.assertGreater(stats['hits'], 0)
+        self.assertGreater(stats['misses'], 0)
+        self.assertGreater(stats['hit_rate'], 0.5)
+        self.assertGreater(stats['buffers'], 0)
+        self.assertEqual(stats['nbytes'], pool.nbytes)
+        self.assertLessEqual(pool.nbytes, pool.capacity)
+        pool.clear()
+        self.assertEqual(pool.nbytes, 0)
+        self.assertEqual(pool.stats()['buffers'], 0)
+
+    def testEviction(self):
+        comm = self.COMM
+        pool = self.pool
+        rank = comm.Get_rank()
+        pool.capacity = 1 << 12
+        for n in (1 << 9, 1 << 10, 1 << 11, 3 << 10):
+            obj = b'x' * n
+            rmsg = comm.sendrecv(obj, rank, 0, None, rank, 0)
+            self.assertEqual(rmsg, obj)
+            self.assertLessEqual(pool.nbytes, pool.capacity)
+        self.assertGreater(pool.stats()['evictions'], 0)
+        pool.capacity = 0
+        self.assertEqual(pool.nbytes, 0)
+
+    def testThreshold(self):
+        comm = self.COMM
+        pool = self.pool
+        rank = comm.Get_rank()
+        pool.threshold = 1 << 20
+        rmsg = comm.sendrecv(b'x' * 64, rank, 0, None, rank, 0)
+        self.assertEqual(rmsg, b'x' * 64)
+        self.assertEqual(pool.stats()['misses'], 0)
+
+    def testCustomPickle(self):
+        comm = self.COMM
+        pool = self.pool
+        rank = comm.Get_rank()
+        MPI.pickle.__init__(pyPickle.dumps, lambda s: pyPickle.loads(s))
+        rmsg = comm.sendrecv(b'x' * 64, rank, 0, None, rank, 0)
+        self.assertEqual(rmsg, b'x' * 64)
+        self.assertEqual(pool.stats()['misses'], 0)
+
+
 if __name__ == '__main__':
     unittest.main()
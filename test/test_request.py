@@ -128,5 +128,172 @@ class TestRequestArray(unittest.TestCase):
             self.assertEqual(len(statuses), slen)
 
 
+class TestRequestSet(unittest.TestCase):
+
+    def setUp(self):
+        self.COMM = MPI.COMM_SELF
+
+    def testAddRemove(self):
+        requests = [MPI.Request() for i in range(5)]
+        rset = MPI.RequestSet(requests)
+        self.assertEqual(len(rset), 5)
+        for i, request in enumerate(requests):
+            self.assertIs(rset[i], request)
+        self.assertIs(rset.remove(1), requests[1])
+        self.assertIs(rset.remove(3), requests[3])
+        self.assertEqual(len(rset), 3)
+        for i in (1, 3, 5, -1):
+            self.assertRaises(IndexError, rset.__getitem__, i)
+            self.assertRaises(IndexError, rset.remove, i)
+        self.assertIn(rset.add(requests[3]), (1, 3))
+        self.assertIn(rset.add(requests[1]), (1, 3))
+        self.assertEqual(rset.add(MPI.Request()), 5)
+        self.assertEqual(len(rset), 6)
+        for i in range(100):
+            rset.add(MPI.Request())
+        self.assertEqual(len(rset), 106)
+
+    def testEmpty(self):
+        rset = MPI.RequestSet()
+        self.assertEqual(len(rset), 0)
+        self.assertIsNone(rset.Waitsome())
+        self.assertIsNone(rset.Testsome())
+        self.assertEqual(rset.waitsome(), (None, None))
+        self.assertEqual(rset.testsome(), (None, None))
+        rset = MPI.RequestSet([MPI.REQUEST_NULL] * 3)
+        statuses = []
+        self.assertIsNone(rset.Waitsome(statuses))
+        self.assertIsNone(rset.Testsome(statuses))
+        self.assertEqual(statuses, [])
+
+    def testWaitsome(self):
+        comm = self.COMM
+        n = 40
+        bufs = [bytearray(1) for i in range(n)]
+        rset = MPI.RequestSet()
+        for i in range(n):
+            index = rset.add(comm.Irecv(bufs[i], 0, i))
+            self.assertEqual(index, i)
+        self.assertIsNotNone(rset.Testsome())
+        self.assertEqual(len(rset.Testsome()), 0)
+        for i in range(n):
+            comm.Send(bytes([i]), 0, i)
+        done = set()
+        statuses = []
+        while True:
+            indices = rset.Waitsome(statuses)
+            if indices is None:
+                break
+            self.assertEqual(memoryview(indices).format, 'i')
+            self.assertEqual(len(statuses), max(len(indices), len(statuses)))
+            for index, status in zip(indices, statuses):
+                self.assertEqual(status.Get_tag(), index)
+                self.assertEqual(bufs[index][0], index)
+                self.assertEqual(rset[index], MPI.REQUEST_NULL)
+                rset.remove(index)
+                done.add(index)
+        self.assertEqual(done, set(range(n)))
+        self.assertEqual(len(rset), 0)
+
+    def testTestsome(self):
+        comm = self.COMM
+        rset = MPI.RequestSet()
+        sreq = comm.Issend(b'abc', 0, 7)
+        rbuf = bytearray(3)
+        rset.add(sreq)
+        indices = rset.Testsome()
+        self.assertEqual(len(indices), 0)
+        comm.Recv(rbuf, 0, 7)
+        statuses = [MPI.Status()]
+        while True:
+            indices = rset.Testsome(statuses)
+            if len(indices) > 0:
+                break
+        self.assertEqual(list(indices), [0])
+        self.assertEqual(sreq, MPI.REQUEST_NULL)
+        self.assertEqual(rbuf, b'abc')
+        self.assertIsNone(rset.Testsome())
+
+    def testCompleteOutside(self):
+        comm = self.COMM
+        rbufs = [bytearray(1) for i in range(3)]
+        requests = [comm.Irecv(rbufs[i], 0, i) for i in range(3)]
+        rset = MPI.RequestSet(requests)
+        comm.Send(b'a', 0, 0)
+        requests[0].Wait()
+        requests[1].Cancel()
+        requests[1].Wait()
+        self.assertEqual(rset[0], MPI.REQUEST_NULL)
+        self.assertEqual(rset[1], MPI.REQUEST_NULL)
+        self.assertEqual(len(rset.Testsome()), 0)
+        comm.Send(b'c', 0, 2)
+        self.assertEqual(list(rset.Waitsome()), [2])
+        self.assertIsNone(rset.Waitsome())
+        self.assertIsNone(rset.Testsome())
+        self.assertEqual(rbufs, [b'a', bytearray(1), b'c'])
+        request = comm.Recv_init(rbufs[0], 0, 3)
+        index = rset.add(request)
+        request.Free()
+        self.assertIsNone(rset.Testsome())
+        self.assertIsNone(rset.Waitsome())
+        self.assertEqual(rset.remove(index), MPI.REQUEST_NULL)
+
+    def testPersistent(self):
+        comm = self.COMM
+        sbuf = bytearray(1)
+        rbuf = bytearray(1)
+        sreq = comm.Send_init(sbuf, 0, 0)
+        rreq = comm.Recv_init(rbuf, 0, 0)
+        rset = MPI.RequestSet([rreq, sreq])
+        for value in range(3):
+            sbuf[0] = value
+            MPI.Prequest.Startall([rreq, sreq])
+            done = []
+            while len(done) < 2:
+                done.extend(rset.Waitsome())
+            self.assertEqual(sorted(done), [0, 1])
+            self.assertEqual(rbuf[0], value)
+            self.assertIsNone(rset.Waitsome())
+        self.assertNotEqual(sreq, MPI.REQUEST_NULL)
+        self.assertNotEqual(rreq, MPI.REQUEST_NULL)
+        sreq.Free()
+        rreq.Free()
+
+    def testObjects(self):
+        comm = self.COMM
+        rset = MPI.RequestSet()
+        for i in range(5):
+            rset.add(comm.isend(i, 0, i))
+        for i in range(5):
+            rset.add(comm.irecv(None, 0, i))
+        results = {}
+        statuses = []
+        while True:
+            indices, objects = rset.waitsome(statuses)
+            if indices is None:
+                break
+            self.assertEqual(len(indices), len(objects))
+            for index, obj in zip(indices, objects):
+                results[index] = obj
+                rset.remove(index)
+        self.assertEqual(len(rset), 0)
+        self.assertEqual(results, {
+            **{i: None for i in range(5)},
+            **{i + 5: i for i in range(5)},
+        })
+        index = rset.add(comm.irecv(None, 0, 0))
+        indices, objects = rset.testsome()
+        self.assertEqual(list(indices), [])
+        self.assertEqual(objects, [])
+        comm.send('abc', 0, 0)
+        while True:
+            indices, objects = rset.testsome()
+            if len(indices) > 0:
+                break
+        self.assertEqual(list(indices), [index])
+        self.assertEqual(objects, ['abc'])
+        self.assertEqual(rset.testsome(), (None, None))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -15,7 +15,13 @@ class TestRC(unittest.TestCase):
         rc(thread_level = rc.thread_level)
         rc(finalize     = rc.finalize)
         rc(fast_reduce  = rc.fast_reduce)
+        rc(allreduce_algorithm = rc.allreduce_algorithm)
         rc(recv_mprobe  = rc.recv_mprobe)
+        rc(irecv_mprobe = rc.irecv_mprobe)
+        rc(recv_pool    = rc.recv_pool)
+        rc(lock_stats   = rc.lock_stats)
+        rc(pickle_threads = rc.pickle_threads)
+        rc(bcast_chunk  = rc.bcast_chunk)
         rc(errors       = rc.errors)
         return rc
 
@@ -523,5 +523,133 @@ class TestUtilDTLib(unittest.TestCase):
         mt.Free()
 
 
+@unittest.skipIf(numpy is None, 'numpy')
+class TestUtilDTLibCache(unittest.TestCase):
+
+    def setUp(self):
+        from mpi4py.util import dtlib
+        self.dtlib = dtlib
+        dtlib.cache_clear()
+
+    def tearDown(self):
+        self.dtlib.cache_resize(128)
+        self.dtlib.cache_clear()
+
+    def testLookup(self):
+        dtlib = self.dtlib
+        for spec in ('i', 'f8', 'i,f', ('d', (2, 3)), [('a', 'i', (2,))]):
+            with self.subTest(spec=spec):
+                dtype = np_dtype(spec)
+                mt1 = dtlib.from_numpy_dtype_cached(dtype)
+                mt2 = dtlib.from_numpy_dtype_cached(spec)
+                self.assertIs(mt1, mt2)
+                self.assertFalse(mt1.is_predefined)
+                self.assertEqual(mt1.extent, dtype.itemsize)
+                self.assertEqual(tonumpy(mt1).itemsize, dtype.itemsize)
+                mt3 = fromnumpy(dtype)
+                self.assertIsNot(mt3, mt1)
+                mt3.Free()
+
+    def testCommunication(self):
+        dtlib = self.dtlib
+        dtype = np_dtype([('a', 'i'), ('b', 'd', (3,))])
+        sbuf = numpy.zeros(5, dtype)
+        sbuf['a'] = numpy.arange(5)
+        sbuf['b'] = 7
+        for _ in range(3):
+            rbuf = numpy.zeros(5, dtype)
+            datatype = dtlib.from_numpy_dtype_cached(dtype)
+            MPI.COMM_SELF.Sendrecv(
+                [sbuf, datatype], 0, 0,
+                [rbuf, datatype], 0, 0,
+            )
+            self.assertEqual(rbuf.tobytes(), sbuf.tobytes())
+
+    def testInfo(self):
+        dtlib = self.dtlib
+        self.assertEqual(dtlib.cache_info(), (0, 0, 128, 0))
+        dtlib.from_numpy_dtype_cached('i,i')
+        dtlib.from_numpy_dtype_cached('i,i')
+        dtlib.from_numpy_dtype_cached('i,f')
+        info = dtlib.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.maxsize, 128)
+        self.assertEqual(info.currsize, 2)
+        dtlib.cache_clear()
+        self.assertEqual(dtlib.cache_info(), (0, 0, 128, 0))
+
+    def testEviction(self):
+        dtlib = self.dtlib
+        dtlib.cache_resize(2)
+        mt1 = dtlib.from_numpy_dtype_cached('i,i')
+        mt2 = dtlib.from_numpy_dtype_cached('i,f')
+        self.assertIs(dtlib.from_numpy_dtype_cached('i,i'), mt1)
+        mt3 = dtlib.from_numpy_dtype_cached('f,f')
+        self.assertEqual(dtlib.cache_info().currsize, 2)
+        self.assertIsNot(dtlib.from_numpy_dtype_cached('i,f'), mt2)
+        self.assertIs(dtlib.from_numpy_dtype_cached('f,f'), mt3)
+        dtlib.cache_resize(1)
+        self.assertEqual(dtlib.cache_info(), (2, 4, 1, 1))
+        dtlib.cache_clear()
+        self.assertEqual(dtlib.cache_info().currsize, 0)
+        self.assertRaises(ValueError, dtlib.cache_resize, 0)
+        for mt, spec in ((mt1, 'i,i'), (mt2, 'i,f'), (mt3, 'f,f')):
+            self.assertTrue(mt)
+            self.assertEqual(mt.size, np_dtype(spec).itemsize)
+
+    def testEvictionInUse(self):
+        dtlib = self.dtlib
+        dtlib.cache_resize(1)
+        dtype = np_dtype([('a', 'i'), ('b', 'd', (3,))])
+        datatype = dtlib.from_numpy_dtype_cached(dtype)
+        dtlib.from_numpy_dtype_cached('f,f')
+        dtlib.cache_clear()
+        sbuf = numpy.ones(5, dtype)
+        rbuf = numpy.zeros(5, dtype)
+        MPI.COMM_SELF.Sendrecv(
+            [sbuf, datatype], 0, 0,
+            [rbuf, datatype], 0, 0,
+        )
+        self.assertEqual(rbuf.tobytes(), sbuf.tobytes())
+
+    def testThreads(self):
+        try:
+            import threading
+        except ImportError:  # pragma: no cover
+            self.skipTest('threading')
+        dtlib = self.dtlib
+        dtlib.cache_resize(4)
+        specs = ['i,i', 'i,f', 'f,f', 'd,d', 'i,d', 'f,d']
+        errors = []
+        def target():
+            try:
+                for _ in range(20):
+                    for spec in specs:
+                        mt = dtlib.from_numpy_dtype_cached(spec)
+                        self.assertEqual(mt.size, np_dtype(spec).itemsize)
+            except Exception as exc:  # pragma: no cover
+                errors.append(exc)
+        threads = [threading.Thread(target=target) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(dtlib.cache_info().currsize, 4)
+
+    def testFailures(self):
+        dtlib = self.dtlib
+        self.assertRaises(ValueError, dtlib.from_numpy_dtype_cached, 'O')
+        self.assertEqual(dtlib.cache_info().currsize, 0)
+        np_dtype_save = dtlib._np_dtype
+        delattr(dtlib, '_np_dtype')
+        try:
+            with self.assertRaises(RuntimeError):
+                dtlib.from_numpy_dtype_cached('i')
+        finally:
+            setattr(dtlib, '_np_dtype', np_dtype_save)
+
+
 if __name__ == '__main__':
     unittest.main()
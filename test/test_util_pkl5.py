@@ -798,6 +798,25 @@ class BaseTest:
         self.assertRaises(ValueError, comm.alltoall, [None]*(size+1))
         comm.Free()
 
+    def testCollectivesOrder(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        for root in range(size):
+            rmess = comm.gather(rank, root)
+            if rank == root:
+                self.assertEqual(rmess, list(range(size)))
+            else:
+                self.assertIsNone(rmess)
+            smess = [(root, i) for i in range(size)]
+            rmess = comm.scatter(smess, root)
+            self.assertEqual(rmess, (root, rank))
+        rmess = comm.allgather(rank)
+        self.assertEqual(rmess, list(range(size)))
+        smess = [(rank, i) for i in range(size)]
+        rmess = comm.alltoall(smess)
+        self.assertEqual(rmess, [(i, rank) for i in range(size)])
+
     @unittest.skipIf(numpy is None, 'numpy')
     def testBigMPI(self):
         comm = self.COMM
@@ -864,6 +883,53 @@ class BaseTestPKL5:
         super().tearDown()
         pkl5.pickle = self.pickle_prev
 
+    @unittest.skipIf(numpy is None, 'numpy')
+    def testChunks(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        chunksize_prev = pkl5._CHUNK_SIZE
+        try:
+            for chunksize in (1, 7, 64, 1<<20):
+                pkl5._CHUNK_SIZE = chunksize
+                sobj = numpy.arange(100, dtype='i') + rank
+                for root in range(size):
+                    robj = comm.gather(sobj, root)
+                    if rank == root:
+                        for i, item in enumerate(robj):
+                            self.assertTrue(numpy.all(item == sobj - rank + i))
+                    robj = comm.scatter([sobj + i for i in range(size)], root)
+                    self.assertTrue(numpy.all(robj == sobj - rank + root + rank))
+                robj = comm.allgather(sobj)
+                for i, item in enumerate(robj):
+                    self.assertTrue(numpy.all(item == sobj - rank + i))
+                robj = comm.alltoall([sobj + i for i in range(size)])
+                for i, item in enumerate(robj):
+                    self.assertTrue(numpy.all(item == sobj - rank + i + rank))
+                robj = comm.allgather(sobj)
+                robj[rank][:] = -1
+                self.assertTrue(numpy.all(sobj == numpy.arange(100) + rank))
+        finally:
+            pkl5._CHUNK_SIZE = chunksize_prev
+
+    def testAllgatherRing(self):
+        comm = self.COMM
+        size = comm.Get_size()
+        rank = comm.Get_rank()
+        ringsize_prev = pkl5._RING_SIZE
+        try:
+            for ringsize in (0, 1<<30):
+                pkl5._RING_SIZE = ringsize
+                for smess in messages:
+                    rmess = comm.allgather(smess)
+                    self.assertEqual(rmess, [smess] * size)
+                sobj = bytearray([rank % 256]) * (rank * 100)
+                robj = comm.allgather(sobj)
+                for i, item in enumerate(robj):
+                    self.assertEqual(item, bytearray([i % 256]) * (i * 100))
+        finally:
+            pkl5._RING_SIZE = ringsize_prev
+
     @unittest.skipIf(numpy is None, 'numpy')
     def testPickle5(self):
         comm = self.COMM
@@ -151,6 +151,35 @@ class BaseTestPool:
         it = self.pool.imap_unordered(sqr, (a for a in args), chunksize=20)
         self.assertEqual(sorted(it), result)
 
+    def test_map_auto_chunksize(self):
+        args = list(range(100))
+        result = list(map(sqr, args))
+        self.assertEqual(self.pool.map(sqr, args, chunksize='auto'), result)
+        it = self.pool.imap(sqr, iter(args), chunksize='auto')
+        self.assertEqual(list(it), result)
+        it = self.pool.imap_unordered(sqr, args, chunksize='auto')
+        self.assertEqual(sorted(it), result)
+        tuples = list(zip(args, args))
+        result = list(itertools.starmap(mul, tuples))
+        self.assertEqual(
+            self.pool.starmap(mul, tuples, chunksize='auto'), result)
+
+    def test_imap_max_pending(self):
+        args = list(range(100))
+        result = list(map(sqr, args))
+        it = self.pool.imap(sqr, iter(args), max_pending=3)
+        self.assertEqual(list(it), result)
+        it = self.pool.imap(sqr, iter(args), chunksize=7, max_pending=2)
+        self.assertEqual(list(it), result)
+        it = self.pool.imap_unordered(sqr, iter(args), max_pending=3)
+        self.assertEqual(sorted(it), result)
+        tuples = list(zip(args, args))
+        result = list(itertools.starmap(mul, tuples))
+        it = self.pool.istarmap(mul, iter(tuples), max_pending=3)
+        self.assertEqual(list(it), result)
+        it = self.pool.istarmap_unordered(mul, iter(tuples), max_pending=3)
+        self.assertEqual(sorted(it), result)
+
     def test_starmap(self):
         tuples = list(zip(range(10), range(9, -1, -1)))
         self.assertEqual(